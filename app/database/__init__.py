@@ -0,0 +1,6 @@
+# Importing the table modules registers every table, and the full-text search index
+# created alongside them (see recipe_search_table.py), with `metadata`, so each
+# `metadata.create_all` builds the whole schema whichever of them was imported.
+from app.database import recipe_table, ingredient_table, recipe_search_table
+
+__all__ = ["recipe_table", "ingredient_table", "recipe_search_table"]
@@ -1,8 +1,94 @@
 from databases import Database
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, Engine, MetaData
 
-DATABASE_URL = "sqlite:///./recipes.db"
+from app import config
+from app.database.sqlite_profile import SQLiteProfile, get_profile
 
-database = Database(DATABASE_URL)
+DATABASE_URL = config.DATABASE_URL
+READ_DATABASE_URL = config.READ_DATABASE_URL
+
+
+class PooledSQLiteDatabase(Database):
+    SUPPORTED_BACKENDS = {
+        **Database.SUPPORTED_BACKENDS,
+        "sqlite": "app.database.sqlite_profile:PooledSQLiteBackend",
+    }
+
+
+"""
+Creates the async database used by the API. SQLite databases go through a pool of
+connections tuned with the given profile (see sqlite_profile.py).
+"""
+
+
+def create_database(
+    url: str,
+    profile: SQLiteProfile = get_profile(config.SQLITE_PROFILE),
+    pool_size: int = config.DATABASE_POOL_SIZE,
+) -> Database:
+    if not url.startswith("sqlite"):
+        return Database(url, min_size=1, max_size=pool_size)
+    return PooledSQLiteDatabase(url, profile=profile, pool_size=pool_size)
+
+
+"""
+Creates the sync engine used for schema management and bulk imports. SQLite
+connections are tuned with the given profile when they are opened.
+"""
+
+
+def create_sync_engine(
+    url: str,
+    profile: SQLiteProfile = get_profile(config.SQLITE_PROFILE),
+    pool_size: int = config.DATABASE_POOL_SIZE,
+) -> Engine:
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_size=pool_size)
+
+    engine = create_engine(
+        url, connect_args={"check_same_thread": False}, pool_size=pool_size
+    )
+
+    @event.listens_for(engine, "connect")
+    def apply_profile(dbapi_connection, connection_record):
+        profile.apply(dbapi_connection)
+
+    return engine
+
+
+# `database` is the primary, used for writes. `read_database` serves the read queries of
+# the services: the replica if READ_DATABASE_URL is set, otherwise the primary itself.
+# Reads that must see a write immediately (replicas lag behind) should use `database`.
+database = create_database(DATABASE_URL)
+read_database = create_database(READ_DATABASE_URL) if READ_DATABASE_URL else database
 metadata = MetaData()
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_sync_engine(DATABASE_URL)
+
+"""
+Connects to (or disconnects from) the primary and, if there is one, the read replica.
+"""
+
+
+async def connect_databases():
+    await database.connect()
+    if read_database is not database:
+        await read_database.connect()
+
+
+async def disconnect_databases():
+    if read_database is not database:
+        await read_database.disconnect()
+    await database.disconnect()
+
+
+"""
+Creates any missing tables (and the search index) on the primary database.
+
+This is blocking, so async code should run it in a thread. The sync engine's
+connections are closed afterwards, as the API doesn't use them while serving.
+"""
+
+
+def create_schema(bind: Engine = engine):
+    metadata.create_all(bind)
+    bind.dispose()
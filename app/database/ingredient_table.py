@@ -0,0 +1,201 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Table,
+    Column,
+    String,
+    Float,
+    Integer,
+    ForeignKey,
+    Index,
+    and_,
+    func,
+    select,
+)
+from app.database.database import metadata
+from app.database.recipe_table import recipe_table
+
+# File containing the schema for an ingredient_table
+#   -> recipe_id: The recipe this ingredient belongs to (string)
+#   -> position: The position of the ingredient within the recipe (integer)
+#   -> name: The name of the ingredient (string)
+#   -> unit: The unit code of the ingredient, e.g. "g", "ml", "cup" (string)
+#   -> quantity: The amount of the ingredient in the given unit (float)
+#   -> name_key: The normalized name of the ingredient (see `normalize_ingredient_name`)
+#
+# (recipe_id, position) is the primary key, so the ingredients of a recipe are
+# read in order straight off the primary key index.
+#
+# (name_key, recipe_id) is the inverted ingredient index: it maps every normalized
+# ingredient name to the recipes using it, and answers "which recipes use X" without
+# reading the ingredients table itself. name_key is set by `flatten_ingredients`, and by
+# the column default for any other insert through SQLAlchemy, so the index is maintained
+# on every write. Ingredients are replaced rather than updated; an update renaming one
+# must set name_key too.
+
+
+"""
+Normalizes an ingredient name for the ingredient index: case-folded, with surrounding
+whitespace removed and inner whitespace collapsed, e.g. " Olive  OIL" -> "olive oil".
+"""
+
+
+def normalize_ingredient_name(name: str) -> str:
+    return " ".join(name.casefold().split())
+
+
+def _name_key_default(context) -> str:
+    return normalize_ingredient_name(context.get_current_parameters()["name"])
+
+
+ingredient_table = Table(
+    "ingredients",
+    metadata,
+    Column(
+        "recipe_id",
+        String,
+        ForeignKey("recipes.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("position", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("unit", String, nullable=False),
+    Column("quantity", Float, nullable=False),
+    Column(
+        "name_key",
+        String,
+        nullable=False,
+        default=_name_key_default,
+    ),
+    Index("ix_ingredients_name", "name"),
+    Index("ix_ingredients_unit", "unit"),
+    Index("ix_ingredients_name_key", "name_key", "recipe_id"),
+)
+
+
+"""
+Splits a comma separated list of ingredient names into normalized names, dropping
+empty and repeated ones.
+"""
+
+
+def split_ingredient_names(names: Optional[str]) -> List[str]:
+    if not names:
+        return []
+    keys = (normalize_ingredient_name(name) for name in names.split(","))
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+# Ingredients used by at most this many rows are "selective": the recipes using them are
+# read from the ingredient index up front. Others are checked recipe by recipe instead.
+SELECTIVE_INGREDIENT_ROWS = 1000
+
+
+"""
+Counts the rows of each of the given normalized ingredient names, stopping at
+`limit` + 1, so counting an ingredient used by most recipes costs no more than a
+selective one.
+
+Returns:
+    Select: A single row, with the count of the i-th name in column `rows_<i>`.
+"""
+
+
+def count_ingredient_rows(name_keys: List[str], limit: int) -> Select:
+    return select(
+        *[
+            select(func.count())
+            .select_from(
+                select(ingredient_table.c.recipe_id)
+                .where(ingredient_table.c.name_key == name_key)
+                .limit(limit + 1)
+                .subquery()
+            )
+            .scalar_subquery()
+            .label(f"rows_{i}")
+            for i, name_key in enumerate(name_keys)
+        ]
+    )
+
+
+"""
+Whether the recipe has an ingredient with any of the given normalized names: a single
+lookup in the ingredient index.
+"""
+
+
+def uses_any(name_keys: List[str]) -> ColumnElement:
+    return (
+        select(ingredient_table.c.recipe_id)
+        .where(
+            ingredient_table.c.name_key.in_(name_keys),
+            ingredient_table.c.recipe_id == recipe_table.c.id,
+        )
+        .exists()
+    )
+
+
+"""
+The IDs of the recipes using any of the given normalized ingredient names, read from
+the ingredient index.
+"""
+
+
+def recipes_using(name_keys: List[str]) -> Select:
+    return select(ingredient_table.c.recipe_id).where(
+        ingredient_table.c.name_key.in_(name_keys)
+    )
+
+
+"""
+Builds the condition on recipe_table keeping recipes that use all (or, with `match_any`,
+at least one) of the `include` ingredients, and none of the `exclude` ingredients.
+Names are normalized (see `split_ingredient_names`).
+
+How the index is used depends on how many rows each included ingredient has
+(`ingredient_rows`, as counted by `count_ingredient_rows`, with unknown names assumed
+common):
+    - If the recipes can be narrowed down to those of selective ingredients (the rarest
+      one, or all of them with `match_any`), those are read from the index first and
+      the other ingredients are checked on each of them.
+    - Otherwise, recipes are read in the requested order and each is checked against
+      the index until the page is full. Reading the recipes of a common ingredient up
+      front would cost more than the page itself.
+
+Returns:
+    Optional[ColumnElement]: The condition, or None if there are no ingredient filters.
+"""
+
+
+def build_ingredient_filter(
+    include: List[str],
+    exclude: List[str],
+    match_any: bool = False,
+    ingredient_rows: Optional[Dict[str, int]] = None,
+) -> Optional[ColumnElement]:
+    ingredient_rows = ingredient_rows or {}
+
+    def selective(name_key: str) -> bool:
+        return ingredient_rows.get(name_key, SELECTIVE_INGREDIENT_ROWS + 1) <= (
+            SELECTIVE_INGREDIENT_ROWS
+        )
+
+    conditions = []
+    if include and match_any:
+        if all(selective(name) for name in include):
+            conditions.append(recipe_table.c.id.in_(recipes_using(include)))
+        else:
+            conditions.append(uses_any(include))
+    elif include:
+        by_rows = sorted(
+            include, key=lambda name: ingredient_rows.get(name, float("inf"))
+        )
+        if selective(by_rows[0]):
+            conditions.append(recipe_table.c.id.in_(recipes_using(by_rows[:1])))
+            by_rows = by_rows[1:]
+        conditions.extend(uses_any([name]) for name in by_rows)
+    if exclude:
+        conditions.append(~uses_any(exclude))
+    return and_(*conditions) if conditions else None
@@ -1,30 +1,240 @@
-import asyncio
+import argparse
 import json
-from app.database.database import database, metadata, engine
+import time
+from itertools import groupby
+from typing import List
+
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.engine import Connection
+
+from app.database.database import metadata, engine
+from app.database.ingredient_table import ingredient_table, normalize_ingredient_name
+from app.database.recipe_import import (
+    DEFAULT_BATCH_SIZE,
+    ImportStats,
+    flatten_ingredients,
+    import_recipes,
+    read_recipes,
+    summarize_ingredients,
+)
 from app.database.recipe_table import recipe_table
+from app.database.recipe_search_table import ensure_search_index
+from app.services.cache_service import invalidate_recipes
+
+MOCK_DATA_PATH = "app/database/mock_data.json"
 
+"""
+Recreates the database from scratch and fills it with the recipes of mock_data.json.
+"""
 
-async def seed_data():
+
+def seed_data(path: str = MOCK_DATA_PATH) -> ImportStats:
     metadata.drop_all(engine)
     metadata.create_all(engine)
+    stats = import_recipes(read_recipes(path), upsert=False)
+    invalidate_recipes()
+    return stats
+
+
+"""
+Imports the recipes of a JSON or NDJSON file into an existing database, updating the
+recipes that are already there (see recipe_import.py).
+"""
+
+
+def import_file(
+    path: str, batch_size: int = DEFAULT_BATCH_SIZE, upsert: bool = True
+) -> ImportStats:
+    metadata.create_all(engine)
+    stats = import_recipes(read_recipes(path), batch_size=batch_size, upsert=upsert)
+    invalidate_recipes()
+    return stats
+
+
+def print_stats(action: str, stats: ImportStats):
+    print(
+        f"{action} {stats.recipes} recipes ({stats.ingredients} ingredients) "
+        f"in {stats.seconds:.2f}s, {stats.rows_per_second:,.0f} rows/s."
+    )
+
+
+"""
+Moves the ingredients of a legacy database, where each recipe stored its ingredients
+as a JSON stringified array in `recipes.ingredients`, into the ingredient_table.
+
+The legacy column is dropped once every recipe has been copied across.
+
+Returns:
+    int: The number of recipes that were migrated (0 if the schema is already up to date).
+"""
+
+
+def migrate_ingredients(conn: Connection) -> int:
+    columns = {column["name"] for column in inspect(conn).get_columns("recipes")}
+    if "ingredients" not in columns:
+        return 0
+
+    ingredient_table.create(conn, checkfirst=True)
+
+    rows = conn.execute(text("SELECT id, ingredients FROM recipes")).fetchall()
+    for recipe_id, ingredients in rows:
+        ingredient_rows = flatten_ingredients(recipe_id, json.loads(ingredients))
+        conn.execute(
+            ingredient_table.delete().where(ingredient_table.c.recipe_id == recipe_id)
+        )
+        if ingredient_rows:
+            conn.execute(ingredient_table.insert(), ingredient_rows)
 
-    with open("app/database/mock_data.json") as f:
-        data = json.load(f)
+    conn.execute(text("ALTER TABLE recipes DROP COLUMN ingredients"))
+    return len(rows)
 
-    await database.connect()
 
-    for recipe in data:
-        flat_recipe = {
-            "id": recipe["id"],
-            "name": recipe["name"],
-            "portions": recipe["portions"],
-            "ingredients": json.dumps(recipe["ingredients"]),
+"""
+Adds the `name_key` column of the ingredient index to a database created before it
+existed, and fills it in from the ingredient names.
+
+Returns:
+    int: The number of distinct ingredient names keyed (0 if the column already exists).
+"""
+
+
+def migrate_ingredient_keys(conn: Connection) -> int:
+    columns = {column["name"] for column in inspect(conn).get_columns("ingredients")}
+    if "name_key" in columns:
+        return 0
+
+    # SQLite can only add a NOT NULL column with a default. The keys are computed in
+    # Python, as SQLite's lower() only folds ASCII
+    conn.execute(
+        text("ALTER TABLE ingredients ADD COLUMN name_key VARCHAR NOT NULL DEFAULT ''")
+    )
+    names = conn.execute(text("SELECT DISTINCT name FROM ingredients")).scalars().all()
+    if names:
+        conn.execute(
+            text("UPDATE ingredients SET name_key = :key WHERE name = :name"),
+            [{"key": normalize_ingredient_name(name), "name": name} for name in names],
+        )
+    return len(names)
+
+
+# The recipe_table columns added since the first schema, with their SQLite definitions
+# (ALTER TABLE can only add a NOT NULL column with a default)
+RECIPE_SUMMARY_COLUMNS = {
+    "ingredient_count": "INTEGER NOT NULL DEFAULT 0",
+    "total_mass_g": "FLOAT NOT NULL DEFAULT 0",
+    "total_volume_ml": "FLOAT NOT NULL DEFAULT 0",
+    "unit_families": "INTEGER NOT NULL DEFAULT 0",
+}
+
+"""
+Adds the creation time and summary columns of the recipe_table (see recipe_table.py) to
+a database created before they existed.
+
+The summaries are computed from the ingredient_table, like the importer does. The
+original creation times are unknown, so existing recipes are dated to the migration.
+
+Returns:
+    List[str]: The names of the columns that were added.
+"""
+
+
+def migrate_recipe_columns(conn: Connection) -> List[str]:
+    columns = {column["name"] for column in inspect(conn).get_columns("recipes")}
+    added = []
+    if "created_at" not in columns:
+        conn.execute(
+            text("ALTER TABLE recipes ADD COLUMN created_at FLOAT NOT NULL DEFAULT 0")
+        )
+        conn.execute(text("UPDATE recipes SET created_at = :now"), {"now": time.time()})
+        added.append("created_at")
+
+    missing = [name for name in RECIPE_SUMMARY_COLUMNS if name not in columns]
+    if not missing:
+        return added
+    for name in missing:
+        conn.execute(
+            text(
+                f"ALTER TABLE recipes ADD COLUMN {name} {RECIPE_SUMMARY_COLUMNS[name]}"
+            )
+        )
+
+    rows = conn.execute(
+        text(
+            "SELECT recipe_id, unit, quantity FROM ingredients "
+            "ORDER BY recipe_id, position"
+        )
+    ).fetchall()
+    summaries = [
+        {
+            "recipe_id": recipe_id,
+            **summarize_ingredients([row._mapping for row in group]),
         }
-        await database.execute(query=recipe_table.insert(), values=flat_recipe)
+        for recipe_id, group in groupby(rows, key=lambda row: row.recipe_id)
+    ]
+    if summaries:
+        conn.execute(
+            recipe_table.update().where(recipe_table.c.id == bindparam("recipe_id")),
+            summaries,
+        )
+    return added + missing
+
 
-    await database.disconnect()
-    print("Seeded database with recipes.")
+"""
+Brings an existing database up to the current schema without dropping any data.
+
+Creates any missing tables, indexes and the full-text search index, then migrates
+legacy data into them. The search index is refilled after a migration, as the legacy
+recipes predate its triggers.
+"""
+
+
+def migrate_schema(bind=engine) -> int:
+    with bind.begin() as conn:
+        metadata.create_all(conn)
+        migrated = migrate_ingredients(conn)
+        migrate_ingredient_keys(conn)
+        migrate_recipe_columns(conn)
+        ensure_search_index(conn, rebuild=migrated > 0)
+        for table in metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+    invalidate_recipes()
+    return migrated
 
 
 if __name__ == "__main__":
-    asyncio.run(seed_data())
+    parser = argparse.ArgumentParser(
+        description="Seed, migrate or import into the recipe database"
+    )
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="Upgrade an existing database in place instead of reseeding it",
+    )
+    parser.add_argument(
+        "--import",
+        dest="import_path",
+        metavar="PATH",
+        help="Import the recipes of a JSON or NDJSON file into the existing database",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Number of recipes written per transaction when importing",
+    )
+    parser.add_argument(
+        "--no-upsert",
+        action="store_true",
+        help="Fail on recipes that already exist instead of updating them",
+    )
+    args = parser.parse_args()
+
+    if args.migrate:
+        count = migrate_schema()
+        print(f"Migrated {count} recipes.")
+    elif args.import_path:
+        stats = import_file(args.import_path, args.batch_size, not args.no_upsert)
+        print_stats("Imported", stats)
+    else:
+        print_stats("Seeded database with", seed_data())
@@ -0,0 +1,295 @@
+import json
+import time
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import Insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+
+from app.database.database import engine
+from app.database.ingredient_table import ingredient_table, normalize_ingredient_name
+from app.database.recipe_search_table import deferred_search_index
+from app.database.recipe_table import UNIT_FAMILY_BITS, recipe_table
+from app.model.recipe.recipe import Recipe
+from app.model.unit.unit import CountUnit, MassUnit, VolumeUnit, parse_unit
+
+# File containing the bulk recipe importer
+#   -> Recipes are read one at a time from JSON (a top-level array, like mock_data.json)
+#      or NDJSON files, so the file is never fully loaded into memory.
+#   -> Rows are written with executemany, one transaction per batch of recipes, so
+#      SQLite syncs to disk once per batch instead of once per row.
+#   -> Recipes that already exist are updated in place (upsert) and their ingredients
+#      replaced, so a catalogue can be re-imported without dropping the tables.
+
+# Number of recipes written per transaction by default
+DEFAULT_BATCH_SIZE = 500
+
+# Size of the chunks the JSON reader pulls from the file
+READ_CHUNK_SIZE = 64 * 1024
+
+# The name of each unit family in UNIT_FAMILY_BITS
+UNIT_FAMILY_NAMES = {MassUnit: "mass", VolumeUnit: "volume", CountUnit: "count"}
+
+"""
+Splits a recipe (as found in mock_data.json) into its recipe row and its ingredient rows.
+"""
+
+
+def flatten_recipe(recipe: dict) -> Tuple[dict, List[dict]]:
+    recipe_row = {
+        "id": recipe["id"],
+        "name": recipe["name"],
+        "portions": recipe["portions"],
+        **summarize_ingredients(recipe["ingredients"]),
+    }
+    return recipe_row, flatten_ingredients(recipe["id"], recipe["ingredients"])
+
+
+def flatten_ingredients(recipe_id: str, ingredients: List[dict]) -> List[dict]:
+    return [
+        {
+            "recipe_id": recipe_id,
+            "position": position,
+            "name": ingredient["name"],
+            "unit": ingredient["unit"],
+            "quantity": ingredient["quantity"],
+            "name_key": normalize_ingredient_name(ingredient["name"]),
+        }
+        for position, ingredient in enumerate(ingredients)
+    ]
+
+
+"""
+Computes the summary columns of a recipe (see recipe_table.py) from its ingredients.
+Masses and volumes are converted to grams and milliliters with the conversion factors
+of their units.
+
+Raises:
+    ValueError: If an ingredient has an unknown unit.
+"""
+
+
+def summarize_ingredients(ingredients: List[dict]) -> dict:
+    totals = {MassUnit: 0.0, VolumeUnit: 0.0}
+    unit_families = 0
+    for ingredient in ingredients:
+        unit = parse_unit(ingredient["unit"])
+        family = type(unit)
+        if family in totals:
+            totals[family] += ingredient["quantity"] * unit.conversion_factor
+        unit_families |= UNIT_FAMILY_BITS[UNIT_FAMILY_NAMES[family]]
+    return {
+        "ingredient_count": len(ingredients),
+        "total_mass_g": round(totals[MassUnit], 2),
+        "total_volume_ml": round(totals[VolumeUnit], 2),
+        "unit_families": unit_families,
+    }
+
+
+"""
+Reads JSON objects one at a time from a file holding either a JSON array of objects or
+NDJSON (one object per line; any whitespace between objects is accepted).
+
+Only the current chunk of the file and the object being decoded are held in memory.
+
+Raises:
+    ValueError: If the file is not valid JSON, or holds something other than objects.
+"""
+
+
+def iter_json_objects(f: IO[str], chunk_size: int = READ_CHUNK_SIZE) -> Iterator[dict]:
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    in_array = None
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = f.read(chunk_size)
+        buffer = buffer[position:] + chunk
+        position = 0
+        eof = not chunk
+        return bool(chunk)
+
+    def skip(separators: str) -> Optional[str]:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in separators:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return None
+
+    while True:
+        if in_array is None:
+            first = skip(" \t\r\n")
+            if first is None:
+                return
+            in_array = first == "["
+            if in_array:
+                position += 1
+
+        next_char = skip(" \t\r\n," if in_array else " \t\r\n")
+        if next_char is None:
+            if in_array:
+                raise ValueError("Unterminated JSON array")
+            return
+        if in_array and next_char == "]":
+            return
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                break
+            except json.JSONDecodeError as e:
+                # The object may continue in the next chunk
+                if eof or not fill():
+                    raise ValueError(f"Invalid JSON: {e}") from e
+        if not isinstance(value, dict):
+            raise ValueError(f"Expected a JSON object, got {type(value).__name__}")
+        position = end
+        yield value
+
+
+"""
+Reads the recipes of a JSON or NDJSON file one at a time (see `iter_json_objects`).
+"""
+
+
+def read_recipes(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        yield from iter_json_objects(f)
+
+
+"""
+Builds the statement inserting recipe rows. With `upsert`, existing recipes are updated
+instead (keeping their creation time), using the dialect's ON CONFLICT support.
+Returns None if the dialect has none, in which case existing recipes are deleted before
+being inserted again.
+"""
+
+
+def recipe_insert(dialect_name: str, upsert: bool = True) -> Optional[Insert]:
+    if not upsert:
+        return recipe_table.insert()
+
+    dialect_insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(
+        dialect_name
+    )
+    if dialect_insert is None:
+        return None
+    statement = dialect_insert(recipe_table)
+    return statement.on_conflict_do_update(
+        index_elements=[recipe_table.c.id],
+        set_={
+            column.name: statement.excluded[column.name]
+            for column in recipe_table.c
+            if column.name not in ("id", "created_at")
+        },
+    )
+
+
+"""
+Writes one batch of recipes in the current transaction of `conn`.
+Recipes repeated within the batch are written once, with their last version.
+
+Returns:
+    Tuple[int, int]: The number of recipe and ingredient rows written.
+"""
+
+
+def write_batch(
+    conn: Connection, recipes: List[dict], upsert: bool = True
+) -> Tuple[int, int]:
+    flattened = {recipe["id"]: flatten_recipe(recipe) for recipe in recipes}
+    recipe_ids = list(flattened)
+    recipe_rows = [recipe_row for recipe_row, _ in flattened.values()]
+    ingredient_rows = [row for _, rows in flattened.values() for row in rows]
+
+    statement = recipe_insert(conn.dialect.name, upsert)
+    if statement is None:
+        conn.execute(recipe_table.delete().where(recipe_table.c.id.in_(recipe_ids)))
+        statement = recipe_table.insert()
+    conn.execute(statement, recipe_rows)
+
+    with deferred_search_index(conn, recipe_ids):
+        if upsert:
+            conn.execute(
+                ingredient_table.delete().where(
+                    ingredient_table.c.recipe_id.in_(recipe_ids)
+                )
+            )
+        if ingredient_rows:
+            conn.execute(ingredient_table.insert(), ingredient_rows)
+    return len(recipe_rows), len(ingredient_rows)
+
+
+"""
+The outcome of an import.
+
+Attributes:
+    recipes (int): The number of recipe rows written.
+    ingredients (int): The number of ingredient rows written.
+    seconds (float): The time the import took.
+"""
+
+
+class ImportStats(BaseModel):
+    recipes: int = 0
+    ingredients: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        rows = self.recipes + self.ingredients
+        return rows / self.seconds if self.seconds else 0.0
+
+
+"""
+Imports recipes in batches of `batch_size`, each written in its own transaction.
+
+Every recipe is validated against the Recipe model before anything of its batch is
+written. Batches written before an error are kept, so a failed import can be fixed and
+run again (with `upsert`, which is the default).
+
+Raises:
+    ValueError: If a recipe is invalid, naming its position in the input.
+    sqlalchemy.exc.IntegrityError: Without `upsert`, if a recipe already exists.
+
+Returns:
+    ImportStats: The number of rows written and the time it took.
+"""
+
+
+def import_recipes(
+    recipes: Iterable[dict],
+    bind: Engine = engine,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    upsert: bool = True,
+) -> ImportStats:
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1.")
+
+    stats = ImportStats()
+    start = time.perf_counter()
+    recipes = iter(recipes)
+    index = 0
+    while batch := list(islice(recipes, batch_size)):
+        for recipe in batch:
+            try:
+                Recipe.model_validate(recipe)
+            except Exception as e:
+                raise ValueError(f"Invalid recipe at position {index}: {e}") from e
+            index += 1
+
+        with bind.begin() as conn:
+            recipe_count, ingredient_count = write_batch(conn, batch, upsert)
+        stats.recipes += recipe_count
+        stats.ingredients += ingredient_count
+
+    stats.seconds = time.perf_counter() - start
+    return stats
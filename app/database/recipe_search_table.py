@@ -0,0 +1,331 @@
+import re
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from sqlalchemy import (
+    DDL,
+    and_,
+    bindparam,
+    column,
+    event,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+from app.database.ingredient_table import ingredient_table
+from app.database.recipe_table import recipe_table
+
+# File containing the full-text search index over recipes (SQLite FTS5)
+#   -> recipe_search: A plain content table holding, per recipe, its name and the
+#      space separated names of its ingredients. Its integer primary key is the
+#      rowid used by the FTS index, which (unlike the implicit rowid of `recipes`)
+#      is never renumbered by VACUUM.
+#   -> recipes_fts: An external content FTS5 index over recipe_search
+#
+# Both are kept in sync by triggers on `recipes` and `ingredients`, so every write
+# path (seeding, migrations, future write APIs) keeps the index up to date for free.
+#
+# The index only exists on SQLite. Other databases (e.g. PostgreSQL in production) fall
+# back to case-insensitive substring matching, see `build_like_filter`.
+
+
+SEARCH_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS recipe_search (
+        id INTEGER PRIMARY KEY,
+        recipe_id VARCHAR NOT NULL UNIQUE,
+        name VARCHAR NOT NULL,
+        ingredients VARCHAR NOT NULL DEFAULT ''
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(
+        name,
+        ingredients,
+        content='recipe_search',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    # recipe_search -> recipes_fts
+    """
+    CREATE TRIGGER IF NOT EXISTS recipe_search_after_insert AFTER INSERT ON recipe_search
+    BEGIN
+        INSERT INTO recipes_fts (rowid, name, ingredients)
+        VALUES (new.id, new.name, new.ingredients);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recipe_search_after_delete AFTER DELETE ON recipe_search
+    BEGIN
+        INSERT INTO recipes_fts (recipes_fts, rowid, name, ingredients)
+        VALUES ('delete', old.id, old.name, old.ingredients);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recipe_search_after_update AFTER UPDATE ON recipe_search
+    BEGIN
+        INSERT INTO recipes_fts (recipes_fts, rowid, name, ingredients)
+        VALUES ('delete', old.id, old.name, old.ingredients);
+        INSERT INTO recipes_fts (rowid, name, ingredients)
+        VALUES (new.id, new.name, new.ingredients);
+    END
+    """,
+    # recipes -> recipe_search
+    """
+    CREATE TRIGGER IF NOT EXISTS recipes_search_after_insert AFTER INSERT ON recipes
+    BEGIN
+        INSERT INTO recipe_search (recipe_id, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recipes_search_after_update AFTER UPDATE OF id, name ON recipes
+    BEGIN
+        UPDATE recipe_search SET recipe_id = new.id, name = new.name
+        WHERE recipe_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recipes_search_after_delete AFTER DELETE ON recipes
+    BEGIN
+        DELETE FROM recipe_search WHERE recipe_id = old.id;
+    END
+    """,
+    # ingredients -> recipe_search
+    """
+    CREATE TRIGGER IF NOT EXISTS ingredients_search_after_insert AFTER INSERT ON ingredients
+    BEGIN
+        UPDATE recipe_search SET ingredients = (
+            SELECT coalesce(group_concat(name, ' '), '') FROM ingredients
+            WHERE recipe_id = new.recipe_id
+        )
+        WHERE recipe_id = new.recipe_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ingredients_search_after_update AFTER UPDATE OF recipe_id, name ON ingredients
+    BEGIN
+        UPDATE recipe_search SET ingredients = (
+            SELECT coalesce(group_concat(name, ' '), '') FROM ingredients
+            WHERE recipe_id = recipe_search.recipe_id
+        )
+        WHERE recipe_id IN (old.recipe_id, new.recipe_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ingredients_search_after_delete AFTER DELETE ON ingredients
+    BEGIN
+        UPDATE recipe_search SET ingredients = (
+            SELECT coalesce(group_concat(name, ' '), '') FROM ingredients
+            WHERE recipe_id = old.recipe_id
+        )
+        WHERE recipe_id = old.recipe_id;
+    END
+    """,
+]
+
+DROP_SEARCH_DDL = [
+    "DROP TABLE IF EXISTS recipes_fts",
+    "DROP TABLE IF EXISTS recipe_search",
+]
+
+# Fills the search index from the current contents of recipes and ingredients
+REBUILD_SEARCH_SQL = [
+    "DELETE FROM recipe_search",
+    """
+    INSERT INTO recipe_search (recipe_id, name, ingredients)
+    SELECT recipes.id, recipes.name, coalesce((
+        SELECT group_concat(ingredients.name, ' ') FROM ingredients
+        WHERE ingredients.recipe_id = recipes.id
+    ), '')
+    FROM recipes
+    """,
+    "INSERT INTO recipes_fts (recipes_fts) VALUES ('rebuild')",
+]
+
+# Fills the search rows of the given recipes, from their current contents
+REFILL_SEARCH_SQL = text("""
+    INSERT INTO recipe_search (recipe_id, name, ingredients)
+    SELECT recipes.id, recipes.name, coalesce((
+        SELECT group_concat(ingredients.name, ' ') FROM ingredients
+        WHERE ingredients.recipe_id = recipes.id
+    ), '')
+    FROM recipes
+    WHERE recipes.id IN :recipe_ids
+    """).bindparams(bindparam("recipe_ids", expanding=True))
+
+# Whether the search index holds a row for every recipe
+SEARCH_IN_SYNC_SQL = """
+    SELECT (SELECT count(*) FROM recipe_search) = (SELECT count(*) FROM recipes)
+"""
+
+# The search index is created alongside the ingredients table, which is created after
+# (and dropped before) the recipes table it references.
+for statement in SEARCH_DDL:
+    event.listen(
+        ingredient_table, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+for statement in DROP_SEARCH_DDL:
+    event.listen(
+        recipe_table, "before_drop", DDL(statement).execute_if(dialect="sqlite")
+    )
+
+
+# Lightweight table constructs used to query the search index
+recipe_search_table = table("recipe_search", column("id"), column("recipe_id"))
+recipes_fts_table = table("recipes_fts", column("rowid"), column("rank"))
+
+
+"""
+Whether the database has the search index: SQLite databases created (or migrated) since
+it was added.
+"""
+
+
+def has_search_index(conn: Connection) -> bool:
+    if conn.dialect.name != "sqlite":
+        return False
+    return (
+        conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'recipes_fts'"
+        ).first()
+        is not None
+    )
+
+
+"""
+Creates the search index on an existing SQLite database and fills it, if it is missing.
+
+An existing index is refilled if `rebuild` is set (e.g. after data was migrated outside
+of the triggers) or if it doesn't hold one row per recipe, as when it was created empty
+next to recipes that already existed.
+
+Returns:
+    bool: True if the index was created or refilled.
+"""
+
+
+def ensure_search_index(conn: Connection, rebuild: bool = False) -> bool:
+    if conn.dialect.name != "sqlite":
+        return False
+
+    exists = has_search_index(conn)
+    if not exists:
+        statements = SEARCH_DDL + REBUILD_SEARCH_SQL
+    elif rebuild or not conn.exec_driver_sql(SEARCH_IN_SYNC_SQL).scalar():
+        statements = REBUILD_SEARCH_SQL
+    else:
+        return False
+
+    for statement in statements:
+        conn.exec_driver_sql(statement)
+    return True
+
+
+"""
+Keeps the search index of the given recipes up to date across a bulk write of their
+ingredients with one refill per recipe, instead of letting the ingredient triggers
+rewrite a recipe's document for every ingredient row written (about 4x slower).
+
+Their search rows are deleted on entry, which leaves the triggers nothing to update,
+and written again from the recipes and ingredients on exit. Recipes must already exist
+on entry. Does nothing on databases without the index.
+"""
+
+
+@contextmanager
+def deferred_search_index(conn: Connection, recipe_ids: List[str]) -> Iterator[None]:
+    if not has_search_index(conn):
+        yield
+        return
+
+    conn.execute(
+        recipe_search_table.delete().where(
+            recipe_search_table.c.recipe_id.in_(recipe_ids)
+        )
+    )
+    yield
+    conn.execute(REFILL_SEARCH_SQL, {"recipe_ids": recipe_ids})
+
+
+"""
+Splits a free-text search string into its lowercase words.
+"""
+
+
+def search_tokens(query_string: str) -> List[str]:
+    return re.findall(r"\w+", query_string.lower())
+
+
+"""
+Converts a free-text search string into an FTS5 query.
+
+Every word becomes a prefix match and all words must match, e.g. "grill chick" matches
+"Grilled Chicken". Only recipe names are searched unless `include_ingredients` is set.
+Words are quoted, so FTS5 operators typed by users are treated as plain text.
+
+Returns:
+    Optional[str]: The FTS5 query, or None if the search string contains no words.
+"""
+
+
+def build_match_query(
+    query_string: str, include_ingredients: bool = False
+) -> Optional[str]:
+    tokens = search_tokens(query_string)
+    if not tokens:
+        return None
+
+    terms = " ".join(f'"{token}"*' for token in tokens)
+    columns = "{name ingredients}" if include_ingredients else "name"
+    return f"{columns} : ({terms})"
+
+
+"""
+The `MATCH` clause selecting the rows of recipes_fts that match the given FTS5 query.
+"""
+
+
+def match(fts_query):
+    return literal_column("recipes_fts").op("MATCH")(fts_query)
+
+
+"""
+The search filter used where the full-text index is not available: every word of the
+search string must appear in the recipe name (or, with `include_ingredients`, in the
+name of one of its ingredients), ignoring case. Matches are not ranked.
+
+Returns:
+    The filter, or None if the search string contains no words.
+"""
+
+
+def build_like_filter(query_string: str, include_ingredients: bool = False):
+    tokens = search_tokens(query_string)
+    if not tokens:
+        return None
+
+    conditions = []
+    for token in tokens:
+        # Words only contain \w characters, of which only "_" is a LIKE wildcard. The
+        # pattern is built here rather than with `icontains`, whose '%' literals the
+        # `databases` SQLite backend can't render.
+        pattern = "%" + token.replace("_", "/_") + "%"
+        condition = recipe_table.c.name.ilike(pattern, escape="/")
+        if include_ingredients:
+            condition = or_(
+                condition,
+                select(ingredient_table.c.recipe_id)
+                .where(
+                    ingredient_table.c.recipe_id == recipe_table.c.id,
+                    ingredient_table.c.name.ilike(pattern, escape="/"),
+                )
+                .exists(),
+            )
+        conditions.append(condition)
+    return and_(*conditions)
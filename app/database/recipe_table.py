@@ -1,11 +1,29 @@
-from sqlalchemy import Table, Column, String, Float
+import time
+
+from sqlalchemy import Table, Column, String, Float, Integer, Index
 from app.database.database import metadata
 
 # File containing the schema for a recipe_table
 #   -> id: Unique identifier for the recipe (string)
 #   -> name: The name of the recipe (string)
 #   -> portions: The name of the recipe (string). Can be a float (see assumptions.txt)
-#   -> ingredients: A JSON stringified array consisting of type Ingredient
+#   -> created_at: When the recipe was first written, in seconds since the epoch (float).
+#      Updating a recipe keeps it.
+#
+# Summary of the recipe's ingredients, derived from them whenever the recipe is written
+# (see `summarize_ingredients` in recipe_import.py), so they can be filtered and sorted
+# on without reading the ingredients:
+#   -> ingredient_count: The number of ingredients (integer)
+#   -> total_mass_g: The total of the ingredients measured by mass, in grams (float)
+#   -> total_volume_ml: The total of the ingredients measured by volume, in ml (float)
+#   -> unit_families: The unit families used by the ingredients (integer), as a bit set
+#      of UNIT_FAMILY_BITS
+#
+# The ingredients of a recipe live in the ingredient_table (see ingredient_table.py)
+#
+# Every sortable field has a (field, id) index, the same columns `get_recipes` orders
+# by, so a sorted page is read straight off the index in either direction and a cursor
+# seeks into it, instead of sorting the whole table.
 
 
 recipe_table = Table(
@@ -14,5 +32,18 @@ recipe_table = Table(
     Column("id", String, primary_key=True),
     Column("name", String, nullable=False),
     Column("portions", Float, nullable=False),
-    Column("ingredients", String, nullable=False),
+    Column("created_at", Float, nullable=False, default=time.time, server_default="0"),
+    Column("ingredient_count", Integer, nullable=False, default=0, server_default="0"),
+    Column("total_mass_g", Float, nullable=False, default=0, server_default="0"),
+    Column("total_volume_ml", Float, nullable=False, default=0, server_default="0"),
+    Column("unit_families", Integer, nullable=False, default=0, server_default="0"),
+    Index("ix_recipes_name", "name", "id"),
+    Index("ix_recipes_portions", "portions", "id"),
+    Index("ix_recipes_ingredient_count", "ingredient_count", "id"),
+    Index("ix_recipes_created_at", "created_at", "id"),
+    Index("ix_recipes_total_mass_g", "total_mass_g", "id"),
+    Index("ix_recipes_total_volume_ml", "total_volume_ml", "id"),
 )
+
+# The bit of each unit family in unit_families
+UNIT_FAMILY_BITS = {"mass": 1, "volume": 2, "count": 4}
@@ -0,0 +1,192 @@
+import asyncio
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+import aiosqlite
+from databases.backends.sqlite import SQLiteBackend, SQLitePool
+from databases.core import DatabaseURL
+from pydantic import BaseModel
+
+# File containing the SQLite connection profiles and the connection pool used by the API
+#   -> SQLiteProfile: The pragmas applied to every new SQLite connection, async or sync.
+#   -> PooledSQLiteBackend: A `databases` backend that keeps up to `pool_size` open
+#      connections and reuses them, instead of opening (and re-tuning) a new connection
+#      and thread for every query as the stock SQLite backend does.
+
+"""
+The pragmas applied to each SQLite connection. Unset pragmas keep SQLite's defaults.
+
+Attributes:
+    journal_mode (Optional[str]): WAL lets readers run alongside a writer, instead of
+        being locked out for the duration of each write transaction.
+    synchronous (Optional[str]): NORMAL only syncs WAL checkpoints, not every commit.
+        Committed transactions survive a process crash, but may be lost on power loss.
+    mmap_size (Optional[int]): Bytes of the database file read through memory mapping.
+    cache_size (Optional[int]): Page cache size; negative values are in KiB.
+    temp_store (Optional[str]): Where temporary tables and indexes (e.g. for sorting)
+        are kept: DEFAULT, FILE or MEMORY.
+    busy_timeout (Optional[int]): Milliseconds to wait for a lock before failing with
+        "database is locked".
+
+Methods:
+    statements():
+        The PRAGMA statements of the profile, in the order they should run.
+
+    apply(conn):
+        Runs the statements on a DB-API (sqlite3) connection.
+"""
+
+
+class SQLiteProfile(BaseModel):
+    journal_mode: Optional[str] = None
+    synchronous: Optional[str] = None
+    mmap_size: Optional[int] = None
+    cache_size: Optional[int] = None
+    temp_store: Optional[str] = None
+    busy_timeout: Optional[int] = None
+
+    def statements(self) -> List[str]:
+        # busy_timeout goes first, so changing the journal mode waits for other writers
+        names = [
+            "busy_timeout",
+            "journal_mode",
+            "synchronous",
+            "mmap_size",
+            "cache_size",
+            "temp_store",
+        ]
+        return [
+            f"PRAGMA {name} = {getattr(self, name)}"
+            for name in names
+            if getattr(self, name) is not None
+        ]
+
+    def apply(self, conn: sqlite3.Connection):
+        for statement in self.statements():
+            conn.execute(statement).close()
+
+
+PROFILES: Dict[str, SQLiteProfile] = {
+    "default": SQLiteProfile(),
+    "performance": SQLiteProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-64 * 1024,
+        temp_store="MEMORY",
+        busy_timeout=5000,
+    ),
+}
+
+"""
+Looks up a profile by name, with any pragma overridden by an environment variable named
+after it, e.g. SQLITE_MMAP_SIZE=0 or SQLITE_SYNCHRONOUS=FULL.
+
+Raises:
+    ValueError: If there is no profile with the given name.
+"""
+
+
+def get_profile(name: str) -> SQLiteProfile:
+    if name not in PROFILES:
+        raise ValueError(
+            f"Unknown SQLite profile {name!r}, expected one of: {', '.join(PROFILES)}"
+        )
+    overrides = {
+        field: os.environ[f"SQLITE_{field.upper()}"]
+        for field in SQLiteProfile.model_fields
+        if f"SQLITE_{field.upper()}" in os.environ
+    }
+    return PROFILES[name].model_copy(
+        update=SQLiteProfile.model_validate(overrides).model_dump(exclude_unset=True)
+    )
+
+
+"""
+A pool of reusable aiosqlite connections, each tuned with the profile when opened.
+
+At most `pool_size` connections are checked out at once; further acquires wait for one
+to be released. Released connections go back to the pool unless they were left inside
+a transaction, or the pool was closed in the meantime, in which case they are closed.
+Pooled connections must be closed (see `close`), as aiosqlite runs each of them in a
+non-daemon thread that would otherwise keep the process alive.
+"""
+
+
+class PooledSQLitePool(SQLitePool):
+    def __init__(
+        self,
+        url: DatabaseURL,
+        profile: SQLiteProfile,
+        pool_size: int,
+        **options,
+    ):
+        super().__init__(url, **options)
+        if pool_size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.profile = profile
+        self.pool_size = pool_size
+        self._idle: List[aiosqlite.Connection] = []
+        self._slots = asyncio.Semaphore(pool_size)
+        self._open = True
+
+    def open(self):
+        self._open = True
+
+    async def acquire(self) -> aiosqlite.Connection:
+        await self._slots.acquire()
+        try:
+            if self._idle:
+                return self._idle.pop()
+            connection = await super().acquire()
+            for statement in self.profile.statements():
+                async with connection.execute(statement):
+                    pass
+            return connection
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def release(self, connection: aiosqlite.Connection) -> None:
+        try:
+            if self._open and not connection.in_transaction:
+                self._idle.append(connection)
+            else:
+                await super().release(connection)
+        finally:
+            self._slots.release()
+
+    async def close(self) -> None:
+        self._open = False
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await super().release(connection)
+
+
+"""
+The stock `databases` SQLite backend, with its per-query connections replaced by a
+PooledSQLitePool. Takes `profile` and `pool_size` as extra options.
+"""
+
+
+class PooledSQLiteBackend(SQLiteBackend):
+    def __init__(
+        self,
+        database_url,
+        profile: SQLiteProfile = SQLiteProfile(),
+        pool_size: int = 8,
+        **options,
+    ):
+        super().__init__(database_url, **options)
+        self._pool = PooledSQLitePool(
+            self._database_url, profile, pool_size, **self._options
+        )
+
+    async def connect(self) -> None:
+        self._pool.open()
+        await super().connect()
+
+    async def disconnect(self) -> None:
+        await self._pool.close()
+        await super().disconnect()
@@ -1,26 +1,64 @@
-from fastapi import Depends, FastAPI
+import asyncio
+from typing import List
+from fastapi import Depends, FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
-from app.database.database import database, metadata, engine
+from app import config
+from app.database.database import (
+    connect_databases,
+    create_schema,
+    disconnect_databases,
+)
+from app.model.ingredient.ingredient import Ingredient, IngredientsResult
 from app.model.params import (
     FilterOptions,
+    IngredientsBatchRequest,
     IngredientsRequest,
     PaginationParams,
+    RecipesBatchRequest,
     RecipesRequest,
+    ShoppingListRequest,
     SortOptions,
 )
-from app.services.ingredient_service import fetch_ingredients
-from app.services.recipe_service import fetch_recipes
+from app.model.recipe.recipe import Recipe, RecipesWriteResult
+from app.model.shopping_list.shopping_list import ShoppingList
+from app.services.cache_service import (
+    cache_stats,
+    ingredients_response_key,
+    recipes_response_key,
+    response_cache,
+)
+from app.services.export_service import export_recipes
+from app.services.ingredient_service import fetch_ingredients, fetch_ingredients_batch
+from app.services.recipe_service import fetch_recipes, offloader
+from app.services.recipe_write_service import close_writer, save_recipes
+from app.services.shopping_list_service import fetch_shopping_list
+from app.utils.metrics import (
+    MetricsMiddleware,
+    registry,
+    request_seconds,
+    stage_seconds,
+)
+from app.utils.pagination import PaginatedResponse
+from app.utils.response import FastJSONResponse, cached_json_response
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await database.connect()
-    metadata.create_all(engine)
+    if config.SKIP_SCHEMA_CHECK:
+        await connect_databases()
+    else:
+        # The schema check blocks on the database, so it runs in a thread while the
+        # event loop connects
+        await asyncio.gather(connect_databases(), asyncio.to_thread(create_schema))
     yield
-    await database.disconnect()
+    await close_writer()
+    await disconnect_databases()
+    offloader.shutdown()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+app.add_middleware(MetricsMiddleware, histogram=request_seconds)
 
 
 @app.get("/")
@@ -28,18 +66,103 @@ async def root():
     return {"message": "Hello World"}
 
 
-@app.get("/recipes")
+# Both endpoints are served from the response cache, with ETag / If-None-Match support
+# (see app/utils/response.py). Responses are serialized by pydantic-core, and endpoints
+# returning models built by the services return them as a FastJSONResponse directly,
+# skipping FastAPI's response_model re-validation (the models document the schema).
+
+
+@app.get("/recipes", response_model=PaginatedResponse[Recipe])
 async def get_recipes(
+    request: Request,
     req: RecipesRequest = Depends(),
     sort_opts: SortOptions = Depends(),
     pagination: PaginationParams = Depends(),
     filter_opts: FilterOptions = Depends(),
 ):
-    return await fetch_recipes(pagination, filter_opts, sort_opts, req)
+    return await cached_json_response(
+        request,
+        response_cache,
+        recipes_response_key(pagination, filter_opts, sort_opts, req),
+        lambda: fetch_recipes(pagination, filter_opts, sort_opts, req),
+        stage_seconds.labels("fetch_recipes", "serialize"),
+    )
+
+
+# Streams every recipe as one JSON object per line, for bulk consumers.
+# With gzip=true the body is gzip compressed (Content-Encoding: gzip).
+@app.get("/recipes/export")
+async def get_recipes_export(req: RecipesRequest = Depends(), gzip: bool = False):
+    return StreamingResponse(
+        export_recipes(req, compress=gzip),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": "gzip"} if gzip else None,
+    )
+
+
+# Writes are validated against the Recipe model, then queued and committed in batches
+# together with those of concurrent requests (see recipe_write_service.py). POST only
+# creates recipes, PUT creates or replaces them. A full queue answers 503 (Retry-After).
+
+
+@app.post("/recipes", response_model=Recipe, status_code=201)
+async def create_recipe(recipe: Recipe):
+    await save_recipes([recipe], upsert=False)
+    return FastJSONResponse(recipe, status_code=201)
+
+
+@app.put("/recipes", response_model=Recipe)
+async def put_recipe(recipe: Recipe):
+    await save_recipes([recipe])
+    return FastJSONResponse(recipe)
 
 
-@app.get("/ingredients")
+@app.post("/recipes/batch", response_model=RecipesWriteResult, status_code=201)
+async def create_recipes_batch(batch: RecipesBatchRequest):
+    written = await save_recipes(batch.items, upsert=False)
+    return FastJSONResponse(RecipesWriteResult(written=written), status_code=201)
+
+
+@app.put("/recipes/batch", response_model=RecipesWriteResult)
+async def put_recipes_batch(batch: RecipesBatchRequest):
+    written = await save_recipes(batch.items)
+    return FastJSONResponse(RecipesWriteResult(written=written))
+
+
+@app.get("/ingredients", response_model=List[Ingredient])
 async def get_ingredients(
+    request: Request,
     req: IngredientsRequest = Depends(),
 ):
-    return await fetch_ingredients(req)
+    return await cached_json_response(
+        request,
+        response_cache,
+        ingredients_response_key(req),
+        lambda: fetch_ingredients(req),
+        stage_seconds.labels("fetch_ingredients", "serialize"),
+    )
+
+
+@app.post("/ingredients/batch", response_model=List[IngredientsResult])
+async def get_ingredients_batch(batch: IngredientsBatchRequest):
+    return FastJSONResponse(await fetch_ingredients_batch(batch.items))
+
+
+@app.post("/shopping-list", response_model=ShoppingList)
+async def get_shopping_list(req: ShoppingListRequest):
+    return FastJSONResponse(await fetch_shopping_list(req))
+
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    return cache_stats()
+
+
+# Request latencies, service stage timings, rows read and cache counters, in the
+# Prometheus text format (see app/utils/metrics.py)
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(
+        content=registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
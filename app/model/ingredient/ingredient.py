@@ -1,4 +1,4 @@
-from typing import Union
+from typing import List, Optional, Union
 from pydantic import BaseModel
 from app.model.unit.unit import CountUnit, MassUnit, Unit, VolumeUnit
 
@@ -52,3 +52,21 @@ class Ingredient(BaseModel):
             VolumeUnit: lambda u: str(u),
             CountUnit: lambda u: str(u),
         }
+
+
+"""
+The outcome of one item of a batch ingredients request.
+
+Attributes:
+    recipe_id (str): The recipe ID that was requested.
+    status_code (int): The HTTP status the item would have had as a single request.
+    ingredients (Optional[List[Ingredient]]): The processed ingredients, if successful.
+    error (Optional[str]): The error message, if unsuccessful.
+"""
+
+
+class IngredientsResult(BaseModel):
+    recipe_id: str
+    status_code: int
+    ingredients: Optional[List[Ingredient]] = None
+    error: Optional[str] = None
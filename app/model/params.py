@@ -1,7 +1,8 @@
-from typing import TypeVar, Optional
-from pydantic import BaseModel
+from typing import List, TypeVar, Optional
+from pydantic import BaseModel, Field
 from enum import Enum
 
+from app.model.recipe.recipe import Recipe
 from app.model.unit.unit import MassUnit, VolumeUnit
 
 """
@@ -11,9 +12,21 @@ Request and parameter models for recipe and ingredient API endpoints.
 T = TypeVar("T")
 
 
+class CountMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
 class PaginationParams(BaseModel):
     page: int = 1
     size: int = 5
+    # Opaque cursor from a previous page's `next_cursor`. When set, `page` is ignored
+    # and the next page is found by seeking instead of OFFSET.
+    cursor: Optional[str] = None
+    # How the `total` of the response is computed: "exact", "estimated" (cheaper for
+    # filters matching many recipes) or "none" to leave it out
+    count: CountMode = CountMode.EXACT
 
     @property
     def offset(self) -> int:
@@ -26,12 +39,45 @@ class SortOrder(str, Enum):
 
 
 class SortOptions(BaseModel):
+    # "name", "portions", "ingredient_count", "total_mass_g", "total_volume_ml",
+    # "created_at", or "relevance" when searching (the default for searches). Ties are
+    # broken by recipe ID.
     field: Optional[str] = None
     order: Optional[SortOrder] = SortOrder.ASC
 
 
+class IngredientMatch(str, Enum):
+    ALL = "all"
+    ANY = "any"
+
+
+class UnitFamily(str, Enum):
+    MASS = "mass"
+    VOLUME = "volume"
+    COUNT = "count"
+
+
 class FilterOptions(BaseModel):
     queryString: Optional[str] = None
+    # Also match queryString against the names of each recipe's ingredients
+    search_ingredients: bool = False
+    # Comma separated ingredient names, matched exactly but ignoring case and spacing.
+    # Recipes must use all of include_ingredients (or at least one, with
+    # ingredient_match=any) and none of exclude_ingredients.
+    include_ingredients: Optional[str] = None
+    exclude_ingredients: Optional[str] = None
+    ingredient_match: IngredientMatch = IngredientMatch.ALL
+    # Inclusive bounds on the number of ingredients, and on the totals of the ingredients
+    # measured by mass (in grams) and by volume (in ml). Recipes without any ingredient
+    # of a family have a total of 0 for it.
+    min_ingredients: Optional[int] = None
+    max_ingredients: Optional[int] = None
+    min_total_mass_g: Optional[float] = None
+    max_total_mass_g: Optional[float] = None
+    min_total_volume_ml: Optional[float] = None
+    max_total_volume_ml: Optional[float] = None
+    # Only recipes with at least one ingredient measured in this unit family
+    unit_family: Optional[UnitFamily] = None
 
 
 class RecipesRequest(BaseModel):
@@ -45,3 +91,36 @@ class IngredientsRequest(BaseModel):
     desired_portions: Optional[float] = None
     mass_unit: Optional[MassUnit] = None
     volume_unit: Optional[VolumeUnit] = None
+
+
+# Upper bound on the number of items in a single batch request
+MAX_BATCH_SIZE = 100
+
+
+class IngredientsBatchRequest(BaseModel):
+    items: List[IngredientsRequest] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+# Upper bound on the number of recipes in a single shopping list
+MAX_SHOPPING_LIST_SIZE = 1000
+
+
+class ShoppingListItem(BaseModel):
+    recipe_id: str
+    desired_portions: Optional[float] = None
+
+
+class ShoppingListRequest(BaseModel):
+    items: List[ShoppingListItem] = Field(
+        min_length=1, max_length=MAX_SHOPPING_LIST_SIZE
+    )
+    mass_unit: Optional[MassUnit] = None
+    volume_unit: Optional[VolumeUnit] = None
+
+
+# Upper bound on the number of recipes in a single batch write
+MAX_WRITE_BATCH_SIZE = 1000
+
+
+class RecipesBatchRequest(BaseModel):
+    items: List[Recipe] = Field(min_length=1, max_length=MAX_WRITE_BATCH_SIZE)
@@ -1,7 +1,7 @@
 from typing import List
 from pydantic import BaseModel
 from app.model.ingredient.ingredient import Ingredient, Unit
-
+from app.model.record.record import RecipeRecord
 
 """
 Represents a cooking recipe, including its ingredients and portion size.
@@ -11,7 +11,7 @@ Attributes:
     name (str): Name of the recipe.
     portions (float): Number of portions the recipe yields.
     ingredients (List[Ingredient]): List of ingredients required for the recipe.
-        Stored in the DB as a JSON stringified array
+        Stored in the DB in the ingredients table, one row per ingredient
 
 Methods:
     reunit(target_unit: Unit):
@@ -21,6 +21,10 @@ Methods:
     reportion(target_portions: float):
         Adjusts ingredient quantities proportionally to match the target number of portions.
         Raises ValueError if the target portions is zero or negative.
+
+    from_record(record: RecipeRecord):
+        Converts the internal record used by the services (see record.py) to the public
+        model. Skips validation, as records hold trusted data.
 """
 
 
@@ -48,3 +52,25 @@ class Recipe(BaseModel):
             ingredient.reportion(multiplier)
 
         self.portions = target_portions
+
+    @classmethod
+    def from_record(cls, record: RecipeRecord) -> "Recipe":
+        return cls.model_construct(
+            id=record.id,
+            name=record.name,
+            portions=record.portions,
+            ingredients=[ingredient.to_model() for ingredient in record.ingredients],
+        )
+
+
+"""
+The outcome of a batch recipe write.
+
+Attributes:
+    written (int): The number of recipes created or replaced. A recipe repeated in the
+        batch is written once, with its last version.
+"""
+
+
+class RecipesWriteResult(BaseModel):
+    written: int
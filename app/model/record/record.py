@@ -0,0 +1,219 @@
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app.model.ingredient.ingredient import Ingredient
+from app.model.unit.unit import MassUnit, Unit, VolumeUnit, parse_unit
+
+# Internal representation of recipes used by the services.
+#
+# Rows read from our own database are already known to be well formed, so running
+# them through pydantic validation on every request (and copying the models before
+# each reportion/reunit) is wasted work. These records are plain `__slots__` objects
+# that are never modified once built: transformations return new records, so cached
+# records can be shared between requests without copying. They are converted to the
+# public `Recipe`/`Ingredient` models only when building the response.
+
+"""
+An ingredient as stored in the database.
+
+Attributes:
+    name (str): The name of the ingredient.
+    unit (Unit): The unit of measurement for the quantity.
+    quantity (float): The amount of the ingredient in the specified unit.
+
+Methods:
+    from_row(row):
+        Builds the record from an ingredient row, parsing its unit code.
+        Raises ValueError (or KeyError/TypeError) if the row is malformed.
+
+    to_model():
+        Returns the public Ingredient model, without validating it again.
+"""
+
+
+class IngredientRecord:
+    __slots__ = ("name", "unit", "quantity")
+
+    def __init__(self, name: str, unit: Unit, quantity: float):
+        self.name = name
+        self.unit = unit
+        self.quantity = quantity
+
+    def __repr__(self):
+        return f"IngredientRecord({self.name!r}, {self.unit}, {self.quantity})"
+
+    def __eq__(self, other):
+        if not isinstance(other, IngredientRecord):
+            return NotImplemented
+        return (self.name, self.unit, self.quantity) == (
+            other.name,
+            other.unit,
+            other.quantity,
+        )
+
+    @classmethod
+    def from_row(cls, row) -> "IngredientRecord":
+        name = row["name"]
+        if not isinstance(name, str):
+            raise ValueError(f"Invalid ingredient name: {name!r}")
+        return cls(name, parse_unit(row["unit"]), float(row["quantity"]))
+
+    def to_model(self) -> Ingredient:
+        return Ingredient.model_construct(
+            name=self.name, unit=self.unit, quantity=self.quantity
+        )
+
+
+"""
+A recipe and its ingredients, as stored in the database.
+
+Attributes:
+    id (str): Unique identifier for the recipe.
+    name (str): Name of the recipe.
+    portions (float): Number of portions the recipe yields.
+    ingredients (Tuple[IngredientRecord, ...]): The ingredients, in position order.
+
+Methods:
+    from_row(row, ingredients):
+        Builds the record from a recipe row and its ingredient records.
+        Raises ValueError (or KeyError/TypeError) if the row is malformed.
+"""
+
+
+class RecipeRecord:
+    __slots__ = ("id", "name", "portions", "ingredients")
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        portions: float,
+        ingredients: Tuple[IngredientRecord, ...] = (),
+    ):
+        self.id = id
+        self.name = name
+        self.portions = portions
+        self.ingredients = ingredients
+
+    def __repr__(self):
+        return f"RecipeRecord({self.id!r}, {self.name!r}, {self.portions})"
+
+    def __eq__(self, other):
+        if not isinstance(other, RecipeRecord):
+            return NotImplemented
+        return (self.id, self.name, self.portions, self.ingredients) == (
+            other.id,
+            other.name,
+            other.portions,
+            other.ingredients,
+        )
+
+    @classmethod
+    def from_row(
+        cls, row, ingredients: Iterable[IngredientRecord] = ()
+    ) -> "RecipeRecord":
+        recipe_id, name = row["id"], row["name"]
+        if not isinstance(recipe_id, str) or not isinstance(name, str):
+            raise ValueError(f"Invalid recipe: {recipe_id!r}")
+        return cls(recipe_id, name, float(row["portions"]), tuple(ingredients))
+
+
+"""
+Groups ingredient rows into ingredient records keyed by their recipe ID.
+Rows are expected in position order, as returned by `get_ingredient_rows`.
+
+Raises:
+    ValueError (or KeyError/TypeError): If any row is malformed.
+"""
+
+
+def group_ingredient_records(rows: Iterable) -> dict:
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row["recipe_id"], []).append(IngredientRecord.from_row(row))
+    return grouped
+
+
+"""
+Returns new records reportioned and reunited like calling `Recipe.reportion`, then
+`Recipe.reunit(mass_unit)`, then `Recipe.reunit(volume_unit)` on each recipe, skipping
+whichever is None. The records passed in are left untouched.
+
+The quantities of every ingredient of every recipe are scaled and converted as flat
+NumPy arrays in one pass, instead of per ingredient. Rounding to 2 decimal places uses
+NumPy's rounding, which can differ from `round` in the last digit for values within
+float error of a tie.
+
+Raises:
+    ValueError: If the target portions is zero or negative.
+"""
+
+
+def transform_records(
+    recipes: Sequence[RecipeRecord],
+    target_portions: Optional[float] = None,
+    mass_unit: Optional[MassUnit] = None,
+    volume_unit: Optional[VolumeUnit] = None,
+) -> List[RecipeRecord]:
+    if target_portions is not None and target_portions <= 0:
+        raise ValueError("Target portions must be greater than zero.")
+    if target_portions is None and mass_unit is None and volume_unit is None:
+        # Records are immutable, so there is nothing to copy
+        return list(recipes)
+
+    # Imported here, so starting the API doesn't wait for NumPy
+    import numpy as np
+
+    ingredients = [
+        ingredient for recipe in recipes for ingredient in recipe.ingredients
+    ]
+    units = [ingredient.unit for ingredient in ingredients]
+    quantities = np.fromiter(
+        (ingredient.quantity for ingredient in ingredients),
+        dtype=np.float64,
+        count=len(ingredients),
+    )
+
+    if target_portions is not None:
+        multipliers = np.repeat(
+            [target_portions / recipe.portions for recipe in recipes],
+            [len(recipe.ingredients) for recipe in recipes],
+        )
+        quantities = np.round(quantities * multipliers, 2)
+
+    for target_unit in (mass_unit, volume_unit):
+        if target_unit is None:
+            continue
+        family = type(target_unit)
+        convert = [index for index, unit in enumerate(units) if type(unit) is family]
+        if not convert:
+            continue
+        quantities[convert] = Unit.convert_many(
+            quantities[convert], [units[index] for index in convert], target_unit
+        )
+        for index in convert:
+            units[index] = target_unit
+
+    quantities = quantities.tolist()
+    transformed = []
+    start = 0
+    for recipe in recipes:
+        end = start + len(recipe.ingredients)
+        transformed.append(
+            RecipeRecord(
+                recipe.id,
+                recipe.name,
+                (
+                    recipe.portions
+                    if target_portions is None
+                    else float(target_portions)
+                ),
+                tuple(
+                    IngredientRecord(ingredient.name, unit, quantity)
+                    for ingredient, unit, quantity in zip(
+                        recipe.ingredients, units[start:end], quantities[start:end]
+                    )
+                ),
+            )
+        )
+        start = end
+    return transformed
@@ -0,0 +1,150 @@
+import pytest
+
+from app.model.ingredient.ingredient import Ingredient
+from app.model.recipe.recipe import Recipe
+from app.model.record.record import (
+    IngredientRecord,
+    RecipeRecord,
+    group_ingredient_records,
+    transform_records,
+)
+from app.model.unit.unit import CountUnit, MassUnit, VolumeUnit
+
+
+def make_record() -> RecipeRecord:
+    return RecipeRecord(
+        "rcp-1",
+        "Cake",
+        4.0,
+        (
+            IngredientRecord("Flour", MassUnit.GRAM, 500.0),
+            IngredientRecord("Milk", VolumeUnit.LITER, 0.5),
+            IngredientRecord("Eggs", CountUnit.UNIT, 2.0),
+        ),
+    )
+
+
+def test_records_use_slots():
+    record = make_record()
+    with pytest.raises(AttributeError):
+        record.extra = 1
+    with pytest.raises(AttributeError):
+        record.ingredients[0].extra = 1
+
+
+def test_from_rows():
+    rows = [
+        {"recipe_id": "rcp-1", "name": "Flour", "unit": "g", "quantity": 500},
+        {"recipe_id": "rcp-1", "name": "Milk", "unit": "l", "quantity": 0.5},
+        {"recipe_id": "rcp-1", "name": "Eggs", "unit": "unit", "quantity": 2},
+        {"recipe_id": "rcp-2", "name": "Salt", "unit": "mg", "quantity": 3},
+    ]
+    grouped = group_ingredient_records(rows)
+    record = RecipeRecord.from_row(
+        {"id": "rcp-1", "name": "Cake", "portions": 4}, grouped["rcp-1"]
+    )
+
+    assert record == make_record()
+    assert isinstance(record.portions, float)
+    assert grouped["rcp-2"] == [IngredientRecord("Salt", MassUnit.MILLIGRAM, 3.0)]
+
+
+@pytest.mark.parametrize(
+    "row",
+    [
+        {"recipe_id": "r", "name": "Flour", "unit": "grams", "quantity": 1},
+        {"recipe_id": "r", "name": None, "unit": "g", "quantity": 1},
+        {"recipe_id": "r", "name": "Flour", "unit": "g", "quantity": "lots"},
+        {"recipe_id": "r", "name": "Flour", "unit": "g"},
+    ],
+)
+def test_invalid_ingredient_rows(row):
+    with pytest.raises((ValueError, KeyError, TypeError)):
+        group_ingredient_records([row])
+
+
+def test_invalid_recipe_row():
+    with pytest.raises((ValueError, KeyError, TypeError)):
+        RecipeRecord.from_row({"id": "rcp-1"})
+    with pytest.raises(ValueError):
+        RecipeRecord.from_row({"id": "rcp-1", "name": None, "portions": 1})
+
+
+def test_recipe_from_record():
+    record = make_record()
+    recipe = Recipe.from_record(record)
+
+    assert recipe == Recipe(
+        id="rcp-1",
+        name="Cake",
+        portions=4,
+        ingredients=[
+            Ingredient(name="Flour", unit="g", quantity=500),
+            Ingredient(name="Milk", unit="l", quantity=0.5),
+            Ingredient(name="Eggs", unit="unit", quantity=2),
+        ],
+    )
+
+
+def test_transform_records_returns_new_records():
+    record = make_record()
+
+    [result] = transform_records([record], 8, MassUnit.KILOGRAM, VolumeUnit.MILLILITER)
+
+    assert result.portions == 8.0
+    assert result.ingredients == (
+        IngredientRecord("Flour", MassUnit.KILOGRAM, 1.0),
+        IngredientRecord("Milk", VolumeUnit.MILLILITER, 1000.0),
+        IngredientRecord("Eggs", CountUnit.UNIT, 4.0),
+    )
+    assert record == make_record()
+
+
+def test_transform_records_matches_reportion_and_reunit():
+    ingredients = [
+        ("Flour", MassUnit.GRAM, 125.0),
+        ("Milk", VolumeUnit.LITER, 0.3),
+        ("Eggs", CountUnit.UNIT, 2.0),
+        ("Butter", MassUnit.OUNCE, 4.0),
+    ]
+    records = [
+        RecipeRecord(
+            f"rcp-{i}",
+            "Cake",
+            portions,
+            tuple(
+                IngredientRecord(name, unit, quantity * (i + 1))
+                for name, unit, quantity in ingredients
+            ),
+        )
+        for i, portions in enumerate([1.0, 2.0, 3.0, 4.0, 6.0, 2.5])
+    ]
+    records.append(RecipeRecord("empty", "Water", 1.0, ()))
+
+    transformed = transform_records(
+        records, 7, MassUnit.KILOGRAM, VolumeUnit.FLUID_OUNCE
+    )
+
+    assert len(transformed) == len(records)
+    for record, result in zip(records, transformed):
+        expected = Recipe.from_record(record).model_copy(deep=True)
+        expected.reportion(7)
+        expected.reunit(MassUnit.KILOGRAM)
+        expected.reunit(VolumeUnit.FLUID_OUNCE)
+
+        assert result.id == expected.id
+        assert result.portions == expected.portions
+        assert [i.unit for i in result.ingredients] == [
+            i.unit for i in expected.ingredients
+        ]
+        assert [i.quantity for i in result.ingredients] == pytest.approx(
+            [i.quantity for i in expected.ingredients], abs=0.01
+        )
+
+
+def test_transform_records_without_adjustments():
+    record = make_record()
+    assert transform_records([record])[0] is record
+
+    with pytest.raises(ValueError):
+        transform_records([record], 0)
@@ -0,0 +1,94 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from pydantic import BaseModel
+
+from app.model.ingredient.ingredient import Ingredient
+from app.model.recipe.recipe import Recipe
+from app.model.record.record import RecipeRecord
+from app.model.unit.unit import MassUnit, Unit, VolumeUnit
+
+"""
+A consolidated list of the ingredients needed to cook a set of recipes.
+
+Attributes:
+    items (List[Ingredient]): One entry per ingredient name and unit family, in the
+        order ingredients were first seen.
+
+Methods:
+    from_recipes(recipes, mass_unit, volume_unit):
+        Builds the shopping list for (recipe, portions) pairs. Each recipe is scaled to
+        the requested portions (or left as is if None). Mass and volume quantities are
+        converted to `mass_unit`/`volume_unit` (grams and millilitres by default) and
+        summed by ingredient name, ignoring case. Countable units are not convertible
+        (see assumptions.txt), so they are only summed with the same unit.
+
+        The scaling, conversion and summing is done on flat arrays of every ingredient
+        at once, so large meal plans are not limited by per-ingredient Python overhead.
+        Totals are rounded to 2 decimal places once, after summing.
+
+        Raises ValueError if any requested portions are zero or negative.
+"""
+
+
+class ShoppingList(BaseModel):
+    items: List[Ingredient]
+
+    @classmethod
+    def from_recipes(
+        cls,
+        recipes: Sequence[Tuple[Union[Recipe, RecipeRecord], Optional[float]]],
+        mass_unit: Optional[MassUnit] = None,
+        volume_unit: Optional[VolumeUnit] = None,
+    ) -> "ShoppingList":
+        targets: Dict[type, Unit] = {
+            MassUnit: mass_unit or MassUnit.GRAM,
+            VolumeUnit: volume_unit or VolumeUnit.MILLILITER,
+        }
+
+        groups: Dict[Tuple[str, object], int] = {}
+        names: List[str] = []
+        units: List[Unit] = []
+        group_ids: List[int] = []
+        quantities: List[float] = []
+        factors: List[float] = []
+        multipliers: List[float] = []
+
+        for recipe, portions in recipes:
+            if portions is not None and portions <= 0:
+                raise ValueError("Target portions must be greater than zero.")
+            multiplier = 1.0 if portions is None else portions / recipe.portions
+
+            for ingredient in recipe.ingredients:
+                unit = ingredient.unit
+                target = targets.get(type(unit))
+                family = type(unit) if target is not None else unit
+                key = (ingredient.name.strip().lower(), family)
+
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = len(names)
+                    names.append(ingredient.name.strip())
+                    units.append(target or unit)
+
+                group_ids.append(group)
+                quantities.append(ingredient.quantity)
+                factors.append(1.0 if target is None else unit.ratio_to(target))
+                multipliers.append(multiplier)
+
+        import numpy as np
+
+        totals = np.bincount(
+            np.asarray(group_ids, dtype=np.intp),
+            weights=np.asarray(quantities, dtype=np.float64)
+            * np.asarray(factors, dtype=np.float64)
+            * np.asarray(multipliers, dtype=np.float64),
+            minlength=len(names),
+        )
+        totals = np.round(totals, 2)
+
+        return cls(
+            items=[
+                Ingredient.model_construct(name=name, unit=unit, quantity=quantity)
+                for name, unit, quantity in zip(names, units, totals.tolist())
+            ]
+        )
@@ -0,0 +1,86 @@
+import pytest
+from app.model.ingredient.ingredient import Ingredient, MassUnit, VolumeUnit, CountUnit
+from app.model.recipe.recipe import Recipe
+from app.model.shopping_list.shopping_list import ShoppingList
+
+
+def make_recipe(recipe_id, portions, ingredients):
+    return Recipe(
+        id=recipe_id,
+        name=recipe_id,
+        portions=portions,
+        ingredients=[
+            Ingredient(name=name, unit=unit, quantity=quantity)
+            for name, unit, quantity in ingredients
+        ],
+    )
+
+
+pancakes = make_recipe(
+    "pancakes",
+    4,
+    [
+        ("Flour", MassUnit.GRAM, 200),
+        ("Milk", VolumeUnit.MILLILITER, 300),
+        ("Eggs", CountUnit.UNIT, 2),
+    ],
+)
+cake = make_recipe(
+    "cake",
+    8,
+    [
+        ("flour ", MassUnit.KILOGRAM, 0.5),
+        ("Milk", VolumeUnit.LITER, 0.2),
+        ("Eggs", CountUnit.UNIT, 4),
+        ("Sugar", CountUnit.CUP, 1),
+    ],
+)
+
+
+def test_from_recipes_sums_by_name_in_base_units():
+    shopping_list = ShoppingList.from_recipes([(pancakes, None), (cake, None)])
+
+    items = {(item.name, str(item.unit)): item.quantity for item in shopping_list.items}
+    assert items == {
+        ("Flour", "g"): 700,
+        ("Milk", "ml"): 500,
+        ("Eggs", "unit"): 6,
+        ("Sugar", "cup"): 1,
+    }
+
+
+def test_from_recipes_scales_portions_and_converts_units():
+    shopping_list = ShoppingList.from_recipes(
+        [(pancakes, 8), (cake, 4), (pancakes, None)],
+        mass_unit=MassUnit.KILOGRAM,
+        volume_unit=VolumeUnit.LITER,
+    )
+
+    flour, milk, eggs, sugar = shopping_list.items
+    # 400g + 250g + 200g
+    assert (flour.quantity, flour.unit) == (pytest.approx(0.85), MassUnit.KILOGRAM)
+    # 600ml + 100ml + 300ml
+    assert (milk.quantity, milk.unit) == (pytest.approx(1.0), VolumeUnit.LITER)
+    assert (eggs.quantity, eggs.unit) == (pytest.approx(8), CountUnit.UNIT)
+    assert (sugar.quantity, sugar.unit) == (pytest.approx(0.5), CountUnit.CUP)
+
+
+def test_from_recipes_does_not_sum_different_count_units():
+    tea = make_recipe("tea", 1, [("Sugar", CountUnit.TEASPOON, 2)])
+
+    shopping_list = ShoppingList.from_recipes([(cake, None), (tea, None)])
+
+    sugar = [item for item in shopping_list.items if item.name == "Sugar"]
+    assert [(item.unit, item.quantity) for item in sugar] == [
+        (CountUnit.CUP, 1),
+        (CountUnit.TEASPOON, 2),
+    ]
+
+
+def test_from_recipes_empty():
+    assert ShoppingList.from_recipes([]).items == []
+
+
+def test_from_recipes_invalid_portions():
+    with pytest.raises(ValueError):
+        ShoppingList.from_recipes([(pancakes, 0)])
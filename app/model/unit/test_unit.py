@@ -23,6 +23,15 @@ def test_volumeunit_conversion() -> None:
     )
 
 
+def test_ratio_to() -> None:
+    assert MassUnit.KILOGRAM.ratio_to(MassUnit.GRAM) == 1000
+    assert VolumeUnit.MILLILITER.ratio_to(VolumeUnit.LITER) == pytest.approx(0.001)
+    with pytest.raises(ValueError, match="Cannot convert between"):
+        MassUnit.GRAM.ratio_to(VolumeUnit.LITER)
+    with pytest.raises(ValueError, match="Conversion not supported"):
+        CountUnit.CUP.ratio_to(CountUnit.UNIT)
+
+
 def test_zero_quantity_conversion() -> None:
     assert MassUnit.GRAM.convert(0, MassUnit.KILOGRAM) == 0
     assert VolumeUnit.LITER.convert(0, VolumeUnit.MILLILITER) == 0
@@ -57,3 +66,57 @@ def test_unit_missing_method() -> None:
     assert VolumeUnit._missing_("ml") == VolumeUnit.MILLILITER
     assert CountUnit._missing_("cup") == CountUnit.CUP
     assert CountUnit._missing_("nonexistent") is None
+
+
+def test_unit_lookup_by_code() -> None:
+    assert MassUnit("kg") is MassUnit.KILOGRAM
+    assert MassUnit(("kg", 1000)) is MassUnit.KILOGRAM
+    assert VolumeUnit("floz") is VolumeUnit.FLUID_OUNCE
+    assert CountUnit("tablespoon") is CountUnit.TABLESPOON
+    assert MassUnit._missing_(["g"]) is None
+    with pytest.raises(ValueError):
+        MassUnit("ml")
+
+
+def test_conversion_table() -> None:
+    table = MassUnit.conversion_table()
+    assert table.shape == (len(MassUnit), len(MassUnit))
+    assert table[
+        MassUnit._indices[MassUnit.KILOGRAM], MassUnit._indices[MassUnit.GRAM]
+    ] == pytest.approx(1000.0)
+    assert MassUnit.conversion_table() is table
+    assert CountUnit.conversion_table() is None
+
+
+def test_convert_many() -> None:
+    converted = MassUnit.convert_many(
+        [1000, 1, 1, 0],
+        [MassUnit.MILLIGRAM, MassUnit.KILOGRAM, MassUnit.POUND, MassUnit.GRAM],
+        MassUnit.GRAM,
+    )
+    assert converted.tolist() == pytest.approx([1.0, 1000.0, 453.59, 0.0])
+    assert VolumeUnit.convert_many([], [], VolumeUnit.LITER).tolist() == []
+
+
+def test_convert_many_matches_convert() -> None:
+    units = list(MassUnit)
+    quantities = [1.5, 250, 3, 12.25, 0.5]
+    expected = [
+        unit.convert(quantity, MassUnit.OUNCE)
+        for unit, quantity in zip(units, quantities)
+    ]
+    assert MassUnit.convert_many(quantities, units, MassUnit.OUNCE).tolist() == expected
+
+
+def test_convert_many_errors() -> None:
+    with pytest.raises(
+        ValueError, match="Cannot convert between VolumeUnit and MassUnit"
+    ):
+        MassUnit.convert_many(
+            [1, 1], [MassUnit.GRAM, VolumeUnit.LITER], MassUnit.KILOGRAM
+        )
+
+    with pytest.raises(
+        ValueError, match="Conversion not supported for this unit type."
+    ):
+        CountUnit.convert_many([1], [CountUnit.CUP], CountUnit.TEASPOON)
@@ -1,4 +1,8 @@
 from enum import Enum
+from typing import TYPE_CHECKING, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Unit(Enum):
@@ -11,27 +15,118 @@ class Unit(Enum):
 
     @classmethod
     def _missing_(cls, value: str):
-        for member in cls:
-            if getattr(member, "code", None) == value or member.value == value:
-                return member
-        return None
+        try:
+            return cls._by_code.get(value)
+        except TypeError:
+            # Unhashable values can't be a unit code
+            return None
+
+    """
+    The factor converting a quantity in this unit to `to_unit`.
+
+    Raises:
+        ValueError: If `to_unit` is of another family or the family is not convertible.
+    """
+
+    def ratio_to(self, to_unit: "Unit") -> float:
+        ratio = self._ratios.get(to_unit)
+        if ratio is None:
+            self._check_convertible(to_unit)
+        return ratio
 
     def convert(self, quantity: float, to_unit: "Unit") -> float:
+        return round(quantity * self.ratio_to(to_unit), 2)
 
+    def _check_convertible(self, to_unit: "Unit"):
         if type(self) != type(to_unit):
             raise ValueError(
                 f"Cannot convert between {type(self).__name__} and {type(to_unit).__name__}"
             )
-        if not hasattr(self, "conversion_factor") or not hasattr(
-            to_unit, "conversion_factor"
-        ):
-            raise ValueError("Conversion not supported for this unit type.")
-
-        base = quantity * self.conversion_factor
-        result = base / to_unit.conversion_factor
-        return round(result, 2)
+        raise ValueError("Conversion not supported for this unit type.")
 
+    """
+    A dense matrix where [i, j] is the factor converting a quantity in the family's
+    i-th unit to its j-th unit (see `_indices`), or None if the family is not
+    convertible. Built on first use, so importing the units doesn't load NumPy.
+    """
 
+    @classmethod
+    def conversion_table(cls) -> Optional["np.ndarray"]:
+        if cls._conversion_table is None and cls._factors is not None:
+            import numpy as np
+
+            factors = np.asarray(cls._factors, dtype=np.float64)
+            cls._conversion_table = factors[:, np.newaxis] / factors[np.newaxis, :]
+        return cls._conversion_table
+
+    """
+    Converts many quantities to `to_unit` at once, like calling `convert` on each.
+
+    The conversion factors are gathered from the family's conversion table and
+    applied as a single NumPy operation.
+
+    Returns:
+        np.ndarray: The converted quantities, rounded to 2 decimal places.
+
+    Raises:
+        ValueError: If any unit is of another family or the family is not convertible.
+    """
+
+    @staticmethod
+    def convert_many(
+        quantities: Sequence[float], from_units: Sequence["Unit"], to_unit: "Unit"
+    ) -> "np.ndarray":
+        import numpy as np
+
+        family = type(to_unit)
+        try:
+            indices = [family._indices[unit] for unit in from_units]
+        except KeyError as e:
+            e.args[0]._check_convertible(to_unit)
+        table = family.conversion_table()
+        if table is None:
+            to_unit._check_convertible(to_unit)
+
+        ratios = table[np.asarray(indices, dtype=np.intp), family._indices[to_unit]]
+        return np.round(np.asarray(quantities, dtype=np.float64) * ratios, 2)
+
+
+"""
+Builds the lookup tables of a Unit family once, when the class is defined:
+    _by_code: Maps each code (and value) to its member, for O(1) `Unit(code)` lookups.
+    _indices: Maps each member to its row/column in the conversion table.
+    _factors: The conversion factor of each member, or None if the family is not
+        convertible. The conversion table is built from them on first use.
+    _ratios (per member): The factors converting the member to each unit of its family,
+        i.e. its row of the conversion table, keyed by target unit.
+"""
+
+
+def _build_lookup_tables(cls):
+    members = list(cls)
+    cls._by_code = {}
+    for member in members:
+        cls._by_code[member.value] = member
+        cls._by_code[str(member)] = member
+    cls._indices = {member: index for index, member in enumerate(members)}
+
+    factors = [getattr(member, "conversion_factor", None) for member in members]
+    cls._conversion_table = None
+    if None in factors:
+        cls._factors = None
+        for member in members:
+            member._ratios = {}
+    else:
+        cls._factors = [float(factor) for factor in factors]
+        for member, factor in zip(members, cls._factors):
+            member._ratios = {
+                target: factor / target_factor
+                for target, target_factor in zip(members, cls._factors)
+            }
+    return cls
+
+
+@_build_lookup_tables
 class MassUnit(Unit):
     """Mass units (base: gram)"""
 
@@ -46,6 +141,7 @@ class MassUnit(Unit):
         self.conversion_factor = factor
 
 
+@_build_lookup_tables
 class VolumeUnit(Unit):
     """Volume units (base: milliliter)"""
 
@@ -58,6 +154,7 @@ class VolumeUnit(Unit):
         self.conversion_factor = factor
 
 
+@_build_lookup_tables
 class CountUnit(Unit):
     """Countable units (not convertible)"""
 
@@ -65,3 +162,25 @@ class CountUnit(Unit):
     CUP = "cup"
     TEASPOON = "teaspoon"
     TABLESPOON = "tablespoon"
+
+
+# Every unit of every family by its code, e.g. "g" -> MassUnit.GRAM
+UNITS_BY_CODE = {
+    str(member): member
+    for family in (MassUnit, VolumeUnit, CountUnit)
+    for member in family
+}
+
+"""
+Looks up a unit of any family by its code, as stored in the database.
+
+Raises:
+    ValueError: If the code is not a known unit.
+"""
+
+
+def parse_unit(code: str) -> Unit:
+    unit = UNITS_BY_CODE.get(code) if isinstance(code, str) else None
+    if unit is None:
+        raise ValueError(f"Unknown unit: {code!r}")
+    return unit
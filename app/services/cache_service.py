@@ -0,0 +1,245 @@
+from typing import Iterable, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.model.params import (
+    FilterOptions,
+    IngredientsRequest,
+    PaginationParams,
+    RecipesRequest,
+    SortOptions,
+)
+from app.model.record.record import RecipeRecord
+from app.utils.cache import LRUCache
+from app.utils.metrics import CallbackMetric, registry
+from app.utils.single_flight import SingleFlight
+
+"""
+In-process caches shared by the services, and the hooks that keep them consistent.
+
+recipe_cache holds parsed RecipeRecords keyed by recipe ID. Records are never modified
+in place (reportioning or reuniting returns new records), so they are shared freely.
+
+response_cache holds the serialized JSON responses of `/ingredients` and `/recipes`,
+with their ETag, keyed by the normalized request parameters (see the *_response_key
+functions below).
+
+ingredient_rows_cache holds the (bounded) number of rows of each normalized ingredient
+name, which decides how ingredient filters use the ingredient index (see
+ingredient_table.py). Any write can change them, so it is cleared on every invalidation.
+
+count_cache holds the number of recipes matching the filters of `/recipes` requests,
+keyed by the normalized filter options (see `recipes_count_key`), with whether it was
+estimated. Any write can change them, so it is cleared on every invalidation.
+
+recipe_flight, page_flight and count_flight coalesce concurrent loads of the same
+recipe, of the same `/recipes` page, or of the same count, into one database read (see
+single_flight.py). Their keys start with the generation of their cache, so a load
+started before an invalidation is never joined by callers arriving after it.
+
+The TTLs bound how stale a cached entry can be when the database is written to by
+another process (e.g. `init_db`), which cannot call the invalidation hooks below.
+"""
+
+RECIPE_CACHE_SIZE = 4096
+RECIPE_CACHE_TTL = 300
+RESPONSE_CACHE_SIZE = 4096
+RESPONSE_CACHE_TTL = 300
+INGREDIENT_ROWS_CACHE_SIZE = 4096
+INGREDIENT_ROWS_CACHE_TTL = 300
+COUNT_CACHE_SIZE = 1024
+COUNT_CACHE_TTL = 300
+
+recipe_cache: LRUCache[str, RecipeRecord] = LRUCache(
+    maxsize=RECIPE_CACHE_SIZE, ttl=RECIPE_CACHE_TTL
+)
+response_cache: LRUCache[tuple, Tuple[str, bytes]] = LRUCache(
+    maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL
+)
+ingredient_rows_cache: LRUCache[str, int] = LRUCache(
+    maxsize=INGREDIENT_ROWS_CACHE_SIZE, ttl=INGREDIENT_ROWS_CACHE_TTL
+)
+count_cache: LRUCache[tuple, Tuple[int, bool]] = LRUCache(
+    maxsize=COUNT_CACHE_SIZE, ttl=COUNT_CACHE_TTL
+)
+recipe_flight: SingleFlight[tuple, RecipeRecord] = SingleFlight()
+page_flight: SingleFlight[tuple, tuple] = SingleFlight()
+count_flight: SingleFlight[tuple, Tuple[int, bool]] = SingleFlight()
+
+
+"""
+Invalidation hook for the write path: must be called after recipes are inserted,
+updated or deleted. Invalidates everything when no recipe IDs are given.
+
+Any write can change any page of `/recipes`, so those responses are always dropped.
+"""
+
+
+def invalidate_recipes(recipe_ids: Optional[Iterable[str]] = None) -> None:
+    ingredient_rows_cache.clear()
+    count_cache.clear()
+    if recipe_ids is None:
+        recipe_cache.clear()
+        response_cache.clear()
+        return
+
+    recipe_ids = set(recipe_ids)
+    recipe_cache.invalidate(recipe_ids)
+    response_cache.invalidate_where(
+        lambda key: key[0] == "recipes"
+        or (key[0] == "ingredients" and key[1] in recipe_ids)
+    )
+
+
+def _normalize(params: Optional[BaseModel]) -> Optional[tuple]:
+    if params is None:
+        return None
+    return tuple(sorted(params.model_dump().items()))
+
+
+"""
+The response cache key of an `/ingredients` request. The recipe ID comes first so the
+responses of a recipe can be invalidated.
+"""
+
+
+def ingredients_response_key(req: IngredientsRequest) -> tuple:
+    return ("ingredients", req.recipe_id, _normalize(req))
+
+
+"""
+The response cache key of a `/recipes` request.
+"""
+
+
+def recipes_response_key(
+    pagination: PaginationParams,
+    filter_opts: Optional[FilterOptions] = None,
+    sort_opts: Optional[SortOptions] = None,
+    req: Optional[RecipesRequest] = None,
+) -> tuple:
+    return (
+        "recipes",
+        _normalize(pagination),
+        _normalize(filter_opts),
+        _normalize(sort_opts),
+        _normalize(req),
+    )
+
+
+"""
+The page_flight key of a `/recipes` request. Portion and unit adjustments are left out,
+as they are applied by each caller to the shared page.
+"""
+
+
+def recipes_page_key(
+    pagination: PaginationParams,
+    filter_opts: Optional[FilterOptions] = None,
+    sort_opts: Optional[SortOptions] = None,
+) -> tuple:
+    return (
+        recipe_cache.generation,
+        _normalize(pagination),
+        _normalize(filter_opts),
+        _normalize(sort_opts),
+    )
+
+
+"""
+The count_cache key of the filters of a `/recipes` request. No filter options and
+the default ones match the same recipes, so they share a key.
+"""
+
+
+def recipes_count_key(filter_opts: Optional[FilterOptions] = None) -> tuple:
+    return ("count", _normalize(filter_opts or FilterOptions()))
+
+
+"""
+Returns the hit/miss counters of every cache, and the counters of the single-flights.
+"""
+
+
+def cache_stats() -> dict:
+    return {
+        "recipes": recipe_cache.stats(),
+        "responses": response_cache.stats(),
+        "ingredient_rows": ingredient_rows_cache.stats(),
+        "counts": count_cache.stats(),
+        "recipe_loads": recipe_flight.stats(),
+        "page_loads": page_flight.stats(),
+        "count_loads": count_flight.stats(),
+    }
+
+
+# The cache counters, exported on `/metrics` (read from the caches when scraped)
+_caches = {
+    "recipes": recipe_cache,
+    "responses": response_cache,
+    "ingredient_rows": ingredient_rows_cache,
+    "counts": count_cache,
+}
+
+
+def _cache_samples(stat: str):
+    return lambda: [((name,), cache.stats()[stat]) for name, cache in _caches.items()]
+
+
+registry.register(
+    CallbackMetric(
+        "recipe_api_cache_hits_total",
+        "Cache lookups that found a valid entry.",
+        ("cache",),
+        _cache_samples("hits"),
+        "counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "recipe_api_cache_misses_total",
+        "Cache lookups that found no valid entry.",
+        ("cache",),
+        _cache_samples("misses"),
+        "counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "recipe_api_cache_hit_ratio",
+        "Share of cache lookups that were hits.",
+        ("cache",),
+        _cache_samples("hit_ratio"),
+    )
+)
+registry.register(
+    CallbackMetric(
+        "recipe_api_cache_entries",
+        "Number of entries held by each cache.",
+        ("cache",),
+        _cache_samples("size"),
+    )
+)
+
+_flights = {
+    "recipe_loads": recipe_flight,
+    "page_loads": page_flight,
+    "count_loads": count_flight,
+}
+
+registry.register(
+    CallbackMetric(
+        "recipe_api_coalesced_calls_total",
+        "Loads started, and loads joined while already in flight, by single-flight.",
+        ("flight", "result"),
+        lambda: [
+            sample
+            for name, flight in _flights.items()
+            for sample in (
+                ((name, "started"), flight.calls),
+                ((name, "joined"), flight.shared),
+            )
+        ],
+        "counter",
+    )
+)
@@ -0,0 +1,133 @@
+import logging
+import zlib
+from typing import AsyncIterator, Iterable, List
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.database.database import read_database
+from app.database.ingredient_table import ingredient_table
+from app.database.recipe_table import recipe_table
+from app.model.params import RecipesRequest
+from app.model.recipe.recipe import Recipe
+from app.model.record.record import IngredientRecord, RecipeRecord, transform_records
+from app.model.unit.unit import parse_unit
+from app.utils.response import render_json
+
+# Number of recipes transformed, serialized and (if compressing) flushed together.
+# Bounds the memory used by an export regardless of the size of the catalogue.
+EXPORT_CHUNK_SIZE = 100
+
+# Every recipe joined with its ingredients, one row per ingredient (or a single row
+# with NULL ingredient columns for a recipe without any), grouped by recipe
+export_query = (
+    select(
+        recipe_table.c.id,
+        recipe_table.c.name,
+        recipe_table.c.portions,
+        ingredient_table.c.name.label("ingredient_name"),
+        ingredient_table.c.unit,
+        ingredient_table.c.quantity,
+    )
+    .select_from(
+        recipe_table.outerjoin(
+            ingredient_table, ingredient_table.c.recipe_id == recipe_table.c.id
+        )
+    )
+    .order_by(recipe_table.c.id, ingredient_table.c.position)
+)
+
+"""
+Reads every recipe from the database as records, one at a time, iterating over a single
+query instead of loading the catalogue (or paging through it).
+"""
+
+
+async def iterate_recipe_records() -> AsyncIterator[RecipeRecord]:
+    row = None
+    ingredients: List[IngredientRecord] = []
+    async for next_row in read_database.iterate(export_query):
+        if row is not None and next_row["id"] != row["id"]:
+            yield RecipeRecord.from_row(row, ingredients)
+            ingredients = []
+        row = next_row
+        if row["ingredient_name"] is not None:
+            ingredients.append(
+                IngredientRecord(
+                    row["ingredient_name"],
+                    parse_unit(row["unit"]),
+                    float(row["quantity"]),
+                )
+            )
+    if row is not None:
+        yield RecipeRecord.from_row(row, ingredients)
+
+
+"""
+Serializes records as NDJSON, one Recipe per line.
+"""
+
+
+def render_ndjson(records: Iterable[RecipeRecord]) -> bytes:
+    return b"".join(
+        render_json(Recipe.from_record(record)) + b"\n" for record in records
+    )
+
+
+"""
+Export the full recipe catalogue as NDJSON, optionally gzip compressed.
+
+Recipes are streamed from a single query in ID order, and reportioned and reunited
+(see `transform_records`) in chunks of EXPORT_CHUNK_SIZE, so memory stays constant no
+matter how many recipes there are. The recipe cache is bypassed, so exports don't evict
+the recipes serving regular requests.
+
+The request is validated before anything is streamed. Errors that occur once streaming
+has started (e.g. a corrupt recipe) can no longer change the response status; they are
+logged and end the stream early.
+
+Raises:
+    HTTPException 400: If the desired portions are zero or negative.
+
+Returns:
+    AsyncIterator[bytes]: The chunks of the export, to be sent as a StreamingResponse.
+"""
+
+
+def export_recipes(
+    req: RecipesRequest = RecipesRequest(), compress: bool = False
+) -> AsyncIterator[bytes]:
+    if req.desired_portions is not None and req.desired_portions <= 0:
+        raise HTTPException(
+            status_code=400, detail="Target portions must be greater than zero."
+        )
+    return _export_chunks(req, compress)
+
+
+async def _export_chunks(req: RecipesRequest, compress: bool) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    chunk: List[RecipeRecord] = []
+
+    def render(records: List[RecipeRecord]) -> bytes:
+        records = transform_records(
+            records, req.desired_portions, req.mass_unit, req.volume_unit
+        )
+        body = render_ndjson(records)
+        if compressor is None:
+            return body
+        return compressor.compress(body) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    try:
+        async for record in iterate_recipe_records():
+            chunk.append(record)
+            if len(chunk) >= EXPORT_CHUNK_SIZE:
+                yield render(chunk)
+                chunk = []
+        if chunk:
+            yield render(chunk)
+    except Exception as e:
+        logging.error(f"Recipe export failed: {e}")
+        raise
+
+    if compressor is not None:
+        yield compressor.flush()
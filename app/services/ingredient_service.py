@@ -1,16 +1,32 @@
-import json
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
 from fastapi import HTTPException
 from sqlalchemy import select
-from app.database.database import database
+from app.database.database import read_database
+from app.database.ingredient_table import ingredient_table
 from app.database.recipe_table import recipe_table
-from app.model.ingredient.ingredient import Ingredient
+from app.model.ingredient.ingredient import Ingredient, IngredientsResult
 from app.model.params import IngredientsRequest
-from app.model.recipe.recipe import Recipe
+from app.model.record.record import (
+    RecipeRecord,
+    group_ingredient_records,
+    transform_records,
+)
+from app.services.cache_service import recipe_cache, recipe_flight
+from app.utils.metrics import rows_read, stage_seconds
 
 import logging
 
+# Stage timers and row counters of `fetch_ingredients`, exported on `/metrics`. The
+# query and parse stages only run on recipe cache misses, and the serialize stage is
+# timed by the endpoint, which renders the response.
+_query_seconds = stage_seconds.labels("fetch_ingredients", "query")
+_parse_seconds = stage_seconds.labels("fetch_ingredients", "parse")
+_transform_seconds = stage_seconds.labels("fetch_ingredients", "transform")
+_build_seconds = stage_seconds.labels("fetch_ingredients", "build")
+_recipe_rows_read = rows_read.labels("fetch_ingredients", "recipes")
+_ingredient_rows_read = rows_read.labels("fetch_ingredients", "ingredients")
+
 """
 Fetches the recipe row from the database by its ID.
 """
@@ -18,7 +34,111 @@ Fetches the recipe row from the database by its ID.
 
 async def get_recipe_row_by_id(recipe_id: str) -> Optional[dict]:
     query = select(recipe_table).where(recipe_table.c.id == recipe_id)
-    return await database.fetch_one(query)
+    return await read_database.fetch_one(query)
+
+
+"""
+Fetches the recipe rows with the given IDs in a single query.
+"""
+
+
+async def get_recipe_rows_by_ids(recipe_ids: List[str]) -> List[dict]:
+    query = select(recipe_table).where(recipe_table.c.id.in_(recipe_ids))
+    return await read_database.fetch_all(query)
+
+
+"""
+Fetches the ingredient rows of the given recipes, ordered by recipe and position.
+Only the columns needed to build ingredient records are selected.
+"""
+
+
+async def get_ingredient_rows(recipe_ids: List[str]) -> List[dict]:
+    query = (
+        select(
+            ingredient_table.c.recipe_id,
+            ingredient_table.c.name,
+            ingredient_table.c.unit,
+            ingredient_table.c.quantity,
+        )
+        .where(ingredient_table.c.recipe_id.in_(recipe_ids))
+        .order_by(ingredient_table.c.recipe_id, ingredient_table.c.position)
+    )
+    return await read_database.fetch_all(query)
+
+
+"""
+Loads a recipe and its ingredients, serving it from the recipe cache when possible.
+
+On a cache miss, concurrent calls for the same recipe share a single read from the
+database (see `recipe_flight`), so a burst of requests for a recipe that isn't cached
+yet costs one query and one parse.
+
+The returned record is shared with the cache and the other callers. Records are never
+modified in place (see record.py), so it can be transformed without copying it first.
+
+Raises:
+    HTTPException 404: If no recipe is found with the given ID.
+    HTTPException 500: For database errors or if the stored recipe data is invalid.
+"""
+
+
+async def load_recipe(recipe_id: str) -> RecipeRecord:
+    recipe = recipe_cache.get(recipe_id)
+    if recipe is not None:
+        return recipe
+    generation = recipe_cache.generation
+    return await recipe_flight.do(
+        (generation, recipe_id), lambda: read_recipe(recipe_id, generation)
+    )
+
+
+"""
+Reads a recipe and its ingredients from the database, and caches it unless the recipe
+cache was invalidated since `generation`.
+
+Raises:
+    HTTPException 404: If no recipe is found with the given ID.
+    HTTPException 500: For database errors or if the stored recipe data is invalid.
+"""
+
+
+async def read_recipe(recipe_id: str, generation: int) -> RecipeRecord:
+    with _query_seconds.time():
+        try:
+            row = await get_recipe_row_by_id(recipe_id)
+        except Exception as e:
+            logging.error(f"Database query failed: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+        if not row:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+
+        try:
+            ingredient_rows = await get_ingredient_rows([recipe_id])
+        except Exception as e:
+            logging.error(f"Database query failed: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+    _recipe_rows_read.inc()
+    _ingredient_rows_read.inc(len(ingredient_rows))
+
+    with _parse_seconds.time():
+        try:
+            ingredients = group_ingredient_records(ingredient_rows).get(recipe_id, [])
+        except Exception:
+            raise HTTPException(
+                status_code=500, detail="Failed to parse ingredient data"
+            )
+
+        try:
+            recipe = RecipeRecord.from_row(row, ingredients)
+        except Exception:
+            raise HTTPException(status_code=500, detail="Failed to parse recipe data")
+
+    # Don't cache a recipe read before it was invalidated by a write
+    if recipe_cache.generation == generation:
+        recipe_cache.set(recipe_id, recipe)
+    return recipe
 
 
 """
@@ -26,17 +146,16 @@ Retrieve and process the list of ingredients for a given recipe based on the req
 
 This function performs the following steps:
 - Validates that a recipe ID is provided.
-- Queries the database to fetch the recipe row matching the given recipe ID.
-- Parses the stored JSON-encoded ingredients data.
-- Constructs a Recipe model including its ingredients.
+- Loads the recipe and its ingredients from the recipe cache, or from the database on a cache miss.
 - Optionally adjusts the recipe's portions if `desired_portions` is specified.
 - Optionally converts ingredient units for mass and volume as specified by `mass_unit` and `volume_unit`.
 - Returns the list of processed Ingredient objects.
+- Records the time spent in each stage and the number of rows read (see app/utils/metrics.py).
 
 Raises:
     HTTPException 400: If the recipe ID is missing or if invalid unit conversion is attempted.
     HTTPException 404: If no recipe is found with the given ID.
-    HTTPException 500: For database errors, JSON parsing errors, or any unexpected errors during processing.
+    HTTPException 500: For database errors, ingredient parsing errors, or any unexpected errors during processing.
 
 Returns:
     List[Ingredient]: A list of Ingredient models representing the processed ingredients for the recipe.
@@ -47,44 +166,155 @@ async def fetch_ingredients(req: IngredientsRequest) -> List[Ingredient]:
     if not req.recipe_id:
         raise HTTPException(status_code=400, detail="Recipe ID must be provided")
 
-    try:
-        row = await get_recipe_row_by_id(req.recipe_id)
-    except Exception as e:
-        logging.error(f"Database query failed: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
-
-    if not row:
-        raise HTTPException(status_code=404, detail="Recipe not found")
+    recipe = await load_recipe(req.recipe_id)
+    with _transform_seconds.time():
+        recipe = transform_recipe(recipe, req)
+    with _build_seconds.time():
+        return [ingredient.to_model() for ingredient in recipe.ingredients]
 
-    try:
-        ingredients_data = json.loads(row["ingredients"])
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=500, detail="Failed to parse ingredient data")
 
-    try:
-        recipe = Recipe(
-            id=row["id"],
-            name=row["name"],
-            portions=row["portions"],
-            ingredients=[Ingredient(**ingredient) for ingredient in ingredients_data],
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail="Failed to parse recipe data")
+"""
+Applies the portion and unit adjustments of an ingredients request to a (possibly
+cached) recipe record, returning a new record.
 
-    try:
-        if req.desired_portions is not None:
-            recipe.reportion(req.desired_portions)
-        if req.mass_unit is not None:
-            recipe.reunit(req.mass_unit)
+Raises:
+    HTTPException 400: If invalid unit conversions or portion adjustments are requested.
+    HTTPException 500: For any unexpected errors during processing.
+"""
 
-        if req.volume_unit is not None:
-            recipe.reunit(req.volume_unit)
 
+def transform_recipe(recipe: RecipeRecord, req: IngredientsRequest) -> RecipeRecord:
+    try:
+        [recipe] = transform_records(
+            [recipe], req.desired_portions, req.mass_unit, req.volume_unit
+        )
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail="Error processing recipe:, " + str(e)
         )
+    return recipe
+
+
+"""
+Like `transform_recipe`, returning the adjusted ingredients as public models.
+"""
+
+
+def transform_ingredients(
+    recipe: RecipeRecord, req: IngredientsRequest
+) -> List[Ingredient]:
+    recipe = transform_recipe(recipe, req)
+    return [ingredient.to_model() for ingredient in recipe.ingredients]
+
+
+"""
+Loads many recipes at once, serving what it can from the recipe cache and fetching the
+rest with one query for the recipe rows and one for their ingredients.
+
+Returns:
+    Dict[str, Union[RecipeRecord, HTTPException]]: The recipe for every ID that was found, or
+        the error that occurred building it. Missing IDs are left out.
+
+Raises:
+    HTTPException 500: For database errors.
+"""
+
+
+async def load_recipes(
+    recipe_ids: List[str],
+) -> Dict[str, Union[RecipeRecord, HTTPException]]:
+    recipes: Dict[str, Union[RecipeRecord, HTTPException]] = {}
+    missing = []
+    for recipe_id in dict.fromkeys(recipe_ids):
+        recipe = recipe_cache.get(recipe_id)
+        if recipe is None:
+            missing.append(recipe_id)
+        else:
+            recipes[recipe_id] = recipe
+    if not missing:
+        return recipes
+    generation = recipe_cache.generation
+
+    try:
+        rows = await get_recipe_rows_by_ids(missing)
+        found = [row["id"] for row in rows]
+        ingredient_rows = await get_ingredient_rows(found) if found else []
+    except Exception as e:
+        logging.error(f"Database query failed: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    rows_by_recipe: Dict[str, List[dict]] = {}
+    for ingredient_row in ingredient_rows:
+        rows_by_recipe.setdefault(ingredient_row["recipe_id"], []).append(
+            ingredient_row
+        )
+
+    for row in rows:
+        try:
+            ingredients = group_ingredient_records(rows_by_recipe.get(row["id"], []))
+        except Exception:
+            recipes[row["id"]] = HTTPException(
+                status_code=500, detail="Failed to parse ingredient data"
+            )
+            continue
+
+        try:
+            recipe = RecipeRecord.from_row(row, ingredients.get(row["id"], []))
+        except Exception:
+            recipes[row["id"]] = HTTPException(
+                status_code=500, detail="Failed to parse recipe data"
+            )
+            continue
+
+        if recipe_cache.generation == generation:
+            recipe_cache.set(row["id"], recipe)
+        recipes[row["id"]] = recipe
+
+    return recipes
+
+
+"""
+Retrieve and process the ingredients of many recipes in one round trip.
+
+Each item is handled like a request to `fetch_ingredients`, but all recipes are loaded
+together (see `load_recipes`) and a failing item does not fail the whole batch: its
+result carries the status code and error message instead of ingredients.
+
+Raises:
+    HTTPException 500: For database errors.
+
+Returns:
+    List[IngredientsResult]: One result per request item, in the same order.
+"""
+
+
+async def fetch_ingredients_batch(
+    reqs: List[IngredientsRequest],
+) -> List[IngredientsResult]:
+    recipes = await load_recipes([req.recipe_id for req in reqs])
+
+    results = []
+    for req in reqs:
+        try:
+            recipe = recipes.get(req.recipe_id)
+            if recipe is None:
+                raise HTTPException(status_code=404, detail="Recipe not found")
+            if isinstance(recipe, HTTPException):
+                raise recipe
+            results.append(
+                IngredientsResult(
+                    recipe_id=req.recipe_id,
+                    status_code=200,
+                    ingredients=transform_ingredients(recipe, req),
+                )
+            )
+        except HTTPException as e:
+            results.append(
+                IngredientsResult(
+                    recipe_id=req.recipe_id, status_code=e.status_code, error=e.detail
+                )
+            )
 
-    return recipe.ingredients
+    return results
@@ -1,22 +1,325 @@
-import json
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from fastapi import HTTPException
-from sqlalchemy import Select, select, desc, asc
-from app.database.database import database
-from app.database.recipe_table import recipe_table
-from app.model.ingredient.ingredient import Ingredient
+from sqlalchemy import (
+    Column,
+    Select,
+    String,
+    bindparam,
+    false,
+    func,
+    select,
+    desc,
+    asc,
+    tuple_,
+)
+from app import config
+from app.database.database import read_database
+from app.database.ingredient_table import (
+    SELECTIVE_INGREDIENT_ROWS,
+    build_ingredient_filter,
+    count_ingredient_rows,
+    split_ingredient_names,
+)
+from app.database.recipe_search_table import (
+    build_like_filter,
+    build_match_query,
+    match,
+    recipe_search_table,
+    recipes_fts_table,
+)
+from app.database.recipe_table import UNIT_FAMILY_BITS, recipe_table
 from app.model.params import (
+    CountMode,
     FilterOptions,
+    IngredientMatch,
     PaginationParams,
     RecipesRequest,
     SortOptions,
     SortOrder,
 )
 from app.model.recipe.recipe import Recipe
-from app.utils.pagination import PaginatedResponse
+from app.model.record.record import (
+    RecipeRecord,
+    group_ingredient_records,
+    transform_records,
+)
+from app.services.cache_service import (
+    count_cache,
+    count_flight,
+    ingredient_rows_cache,
+    page_flight,
+    recipe_cache,
+    recipes_count_key,
+    recipes_page_key,
+)
+from app.services.ingredient_service import get_ingredient_rows
+from app.utils.metrics import rows_read, stage_seconds
+from app.utils.offload import Offloader
+from app.utils.pagination import PaginatedResponse, decode_cursor, encode_cursor
+
+# The recipes matching a full-text search, with their relevance (lower is better).
+# The FTS5 query is bound through the `fts_query` parameter.
+search_matches = (
+    select(recipe_search_table.c.recipe_id, recipes_fts_table.c.rank)
+    .select_from(recipes_fts_table)
+    .join(recipe_search_table, recipe_search_table.c.id == recipes_fts_table.c.rowid)
+    .where(match(bindparam("fts_query", type_=String)))
+    .subquery("matches")
+)
+
+# Stage timers and row counters of `fetch_recipes`, exported on `/metrics`. The
+# serialize stage is timed by the endpoint, which renders the response.
+_query_seconds = stage_seconds.labels("fetch_recipes", "query")
+_parse_seconds = stage_seconds.labels("fetch_recipes", "parse")
+_transform_seconds = stage_seconds.labels("fetch_recipes", "transform")
+_build_seconds = stage_seconds.labels("fetch_recipes", "build")
+_count_seconds = stage_seconds.labels("fetch_recipes", "count")
+_recipe_rows_read = rows_read.labels("fetch_recipes", "recipes")
+_ingredient_rows_read = rows_read.labels("fetch_recipes", "ingredients")
+
+# Parses, transforms and builds pages with at least TRANSFORM_OFFLOAD_THRESHOLD
+# ingredients off the event loop, so large pages don't stall other requests
+offloader = Offloader(
+    config.TRANSFORM_EXECUTOR,
+    config.TRANSFORM_WORKERS,
+    config.TRANSFORM_OFFLOAD_THRESHOLD,
+)
+
+"""
+Whether searches can use the full-text index, which only exists on SQLite.
+"""
+
+
+def full_text_search_enabled() -> bool:
+    return read_database.url.dialect == "sqlite"
+
+
+"""
+Converts the filter options into an FTS5 query, or None if no search was requested or
+the full-text index is not available.
+"""
+
+
+def get_search_query(filter_opts: Optional[FilterOptions] = None) -> Optional[str]:
+    if not (filter_opts and filter_opts.queryString and full_text_search_enabled()):
+        return None
+    return build_match_query(filter_opts.queryString, filter_opts.search_ingredients)
+
+
+# The fields recipes can be sorted by. Each has a (field, id) index (see recipe_table.py)
+SORT_FIELDS = (
+    "name",
+    "portions",
+    "ingredient_count",
+    "total_mass_g",
+    "total_volume_ml",
+    "created_at",
+)
+
+"""
+Resolves the sort options into the columns the recipes are ordered by.
+Searches are ordered by relevance unless another field is requested.
+The recipe ID is always the last column, so the ordering is deterministic and
+every row has a unique position that a cursor can seek from.
+"""
+
+
+def get_sort_columns(
+    sort_opts: Optional[SortOptions] = None,
+    filter_opts: Optional[FilterOptions] = None,
+) -> Tuple[List[Column], bool]:
+    field = sort_opts.field if sort_opts else None
+    columns = []
+    if field in SORT_FIELDS:
+        columns.append(getattr(recipe_table.c, field))
+    elif field in (None, "relevance") and get_search_query(filter_opts):
+        columns.append(search_matches.c.rank)
+    descending = (
+        bool(columns) and sort_opts is not None and sort_opts.order == SortOrder.DESC
+    )
+    columns.append(recipe_table.c.id)
+    return columns, descending
+
+
+"""
+Identifies the ordering a cursor was issued for, e.g. "portions,id:desc".
+"""
+
+
+def get_sort_key(
+    sort_opts: Optional[SortOptions] = None,
+    filter_opts: Optional[FilterOptions] = None,
+) -> str:
+    columns, descending = get_sort_columns(sort_opts, filter_opts)
+    order = SortOrder.DESC if descending else SortOrder.ASC
+    return ",".join(column.name for column in columns) + ":" + order.value
+
+
+"""
+Builds the cursor pointing just past the given row for the given sort options.
+"""
+
+
+def make_cursor(
+    row: dict,
+    sort_opts: Optional[SortOptions] = None,
+    filter_opts: Optional[FilterOptions] = None,
+) -> str:
+    columns, _ = get_sort_columns(sort_opts, filter_opts)
+    return encode_cursor(
+        {
+            "sort": get_sort_key(sort_opts, filter_opts),
+            "after": [row[column.name] for column in columns],
+        }
+    )
+
+
+"""
+Decodes a cursor into the keyset values of the row it points past.
+
+Raises:
+    ValueError: If the cursor is malformed or was issued for a different sort.
+"""
+
+
+def read_cursor(
+    cursor: str,
+    sort_opts: Optional[SortOptions] = None,
+    filter_opts: Optional[FilterOptions] = None,
+) -> list:
+    columns, _ = get_sort_columns(sort_opts, filter_opts)
+    payload = decode_cursor(cursor)
+    after = payload.get("after")
+    if (
+        payload.get("sort") != get_sort_key(sort_opts, filter_opts)
+        or not isinstance(after, list)
+        or len(after) != len(columns)
+    ):
+        raise ValueError("Cursor does not match the requested sort")
+    return after
+
+
+"""
+Returns the number of rows of each of the given normalized ingredient names, bounded
+by SELECTIVE_INGREDIENT_ROWS + 1. Counts come from ingredient_rows_cache, and the
+missing ones are read from the ingredient index in a single query.
+"""
+
+
+async def get_ingredient_rows_counts(name_keys: List[str]) -> Dict[str, int]:
+    counts = {name_key: ingredient_rows_cache.get(name_key) for name_key in name_keys}
+    missing = [name_key for name_key, count in counts.items() if count is None]
+    if missing:
+        row = await read_database.fetch_one(
+            count_ingredient_rows(missing, SELECTIVE_INGREDIENT_ROWS)
+        )
+        for i, name_key in enumerate(missing):
+            counts[name_key] = row[f"rows_{i}"]
+            ingredient_rows_cache.set(name_key, counts[name_key])
+    return counts
+
+
+"""
+Converts the ingredient filters of the filter options into a condition on recipe_table,
+or None if no ingredient filter was requested.
+"""
+
+
+async def get_ingredient_filter(filter_opts: Optional[FilterOptions] = None):
+    if not filter_opts:
+        return None
+    include = split_ingredient_names(filter_opts.include_ingredients)
+    exclude = split_ingredient_names(filter_opts.exclude_ingredients)
+    return build_ingredient_filter(
+        include,
+        exclude,
+        match_any=filter_opts.ingredient_match == IngredientMatch.ANY,
+        ingredient_rows=await get_ingredient_rows_counts(include),
+    )
+
+
+# The summary columns bounded by the min_<name> and max_<name> filter options
+SUMMARY_RANGES = {
+    "ingredients": recipe_table.c.ingredient_count,
+    "total_mass_g": recipe_table.c.total_mass_g,
+    "total_volume_ml": recipe_table.c.total_volume_ml,
+}
+
+"""
+Converts the filters on the summary columns (see recipe_table.py) of the filter options
+into conditions on recipe_table. They never read the ingredients.
+"""
+
+
+def get_summary_filters(filter_opts: Optional[FilterOptions] = None) -> list:
+    if not filter_opts:
+        return []
+    conditions = []
+    for name, column in SUMMARY_RANGES.items():
+        low = getattr(filter_opts, f"min_{name}")
+        high = getattr(filter_opts, f"max_{name}")
+        if low is not None:
+            conditions.append(column >= low)
+        if high is not None:
+            conditions.append(column <= high)
+    if filter_opts.unit_family:
+        bit = UNIT_FAMILY_BITS[filter_opts.unit_family.value]
+        conditions.append(recipe_table.c.unit_families.op("&")(bit) != 0)
+    return conditions
+
+
+"""
+Applies the filter options to a query on recipe_table.
+
+Searches go through the full-text index (see recipe_search_table.py) rather than
+scanning recipe names, and the relevance of each match is added as `rank`. On
+databases without the index, searches fall back to unranked substring matching.
+Ingredient filters go through the ingredient index (see ingredient_table.py), and
+filters on ingredient totals use the summary columns of recipe_table.
+"""
+
+
+async def filter_recipes(
+    query: Select, filter_opts: Optional[FilterOptions] = None
+) -> Select:
+    fts_query = get_search_query(filter_opts)
+    if fts_query:
+        query = (
+            query.add_columns(search_matches.c.rank)
+            .join(search_matches, search_matches.c.recipe_id == recipe_table.c.id)
+            .params(fts_query=fts_query)
+        )
+    elif filter_opts and filter_opts.queryString:
+        like_filter = (
+            None
+            if full_text_search_enabled()
+            else build_like_filter(
+                filter_opts.queryString, filter_opts.search_ingredients
+            )
+        )
+        # A search without any words (e.g. "!!!") cannot match any recipe
+        query = query.where(false() if like_filter is None else like_filter)
+
+    ingredient_filter = await get_ingredient_filter(filter_opts)
+    if ingredient_filter is not None:
+        query = query.where(ingredient_filter)
+    for condition in get_summary_filters(filter_opts):
+        query = query.where(condition)
+    return query
+
 
 """
-Fetches the recipes from the database. Has filtering, sorting and pagination.
+Fetches the recipes from the database. Has filtering (see `filter_recipes`), sorting
+and pagination.
+
+Reads go to the read replica, if one is configured.
+
+When `after` (the keyset values decoded from a cursor) is given, the query seeks
+past that row on the sort columns instead of using OFFSET, so every page costs the
+same regardless of how deep it is.
+
+One row more than the page size is fetched, so the caller can tell whether there is a
+next page without counting.
 """
 
 
@@ -24,49 +327,241 @@ async def get_recipes(
     pagination: PaginationParams,
     filter_opts: Optional[FilterOptions] = None,
     sort_opts: Optional[SortOptions] = None,
+    after: Optional[list] = None,
 ) -> Select:
-    query = select(recipe_table)
-
-    # Handle filtering
-    if filter_opts and filter_opts.queryString:
-        query = query.where(recipe_table.c.name.ilike(f"%{filter_opts.queryString}%"))
+    query = await filter_recipes(select(recipe_table), filter_opts)
 
     # Handle sorting
-    if sort_opts:
-        allowed_fields = {"portions"}
-        if sort_opts.field in allowed_fields:
-            sort_column = getattr(recipe_table.c, sort_opts.field)
-            order_method = desc if sort_opts.order == SortOrder.DESC else asc
-            query = query.order_by(order_method(sort_column))
+    sort_columns, descending = get_sort_columns(sort_opts, filter_opts)
+    order_method = desc if descending else asc
+    query = query.order_by(*[order_method(column) for column in sort_columns])
 
     # Apply pagination
-    query = query.offset(pagination.offset).limit(pagination.size)
-    return await database.fetch_all(query)
+    if after is not None:
+        keyset = tuple_(*sort_columns)
+        query = query.where(
+            keyset < tuple(after) if descending else keyset > tuple(after)
+        )
+    else:
+        query = query.offset(pagination.offset)
+    return await read_database.fetch_all(query.limit(pagination.size + 1))
+
+
+# The number of matches an estimated count reads before extrapolating
+COUNT_ESTIMATE_SAMPLE = 1000
+
+"""
+Counts the recipes matching the filter options.
+
+With `estimate`, at most COUNT_ESTIMATE_SAMPLE matches are read, in ID order. If there
+are more, the total is extrapolated from the share of the recipes (in ID order) it took
+to find them, assuming matches are spread evenly across IDs. Rather than every match,
+this reads the sample and counts the recipes up to its last ID, so it saves the most
+on filters matching many recipes; selective ones still read as far as their sample
+goes. The number of recipes extrapolated to is an exact count of the whole table
+(about 1ms per 100k recipes on SQLite), cached in count_cache like any other total.
+
+Returns:
+    Tuple[int, bool]: The total, and whether it was estimated.
+"""
+
+
+async def count_recipes(
+    filter_opts: Optional[FilterOptions] = None, estimate: bool = False
+) -> Tuple[int, bool]:
+    query = await filter_recipes(select(recipe_table.c.id), filter_opts)
+    if not estimate:
+        row = await read_database.fetch_one(
+            select(func.count().label("total")).select_from(query.subquery())
+        )
+        return row["total"], False
+
+    sample = query.order_by(recipe_table.c.id).limit(COUNT_ESTIMATE_SAMPLE).subquery()
+    row = await read_database.fetch_one(
+        select(func.count().label("matches"), func.max(sample.c.id).label("last"))
+    )
+    if row["matches"] < COUNT_ESTIMATE_SAMPLE:
+        return row["matches"], False
+
+    scanned = await read_database.fetch_one(
+        select(func.count().label("recipes")).where(recipe_table.c.id <= row["last"])
+    )
+    recipes, _ = await get_total(None, CountMode.EXACT)
+    return round(row["matches"] * recipes / scanned["recipes"]), True
+
+
+"""
+Returns the total of the `/recipes` pages matching the filter options, as counted by
+`count_recipes`, or (None, False) with CountMode.NONE.
+
+Totals are served from count_cache. An estimated request also takes an exact total,
+but an exact one doesn't take an estimate. Unfiltered totals are always exact.
+Concurrent requests for the same count share one read (see `count_flight`).
+
+Raises:
+    HTTPException 500: For database errors.
+"""
+
+
+async def get_total(
+    filter_opts: Optional[FilterOptions], mode: CountMode
+) -> Tuple[Optional[int], bool]:
+    if mode == CountMode.NONE:
+        return None, False
+
+    key = recipes_count_key(filter_opts)
+    cached = count_cache.get(key)
+    if cached is not None and (mode == CountMode.ESTIMATED or not cached[1]):
+        return cached
+
+    generation = count_cache.generation
+    # Counting every recipe is cheaper than sampling them
+    estimate = mode == CountMode.ESTIMATED and key != recipes_count_key(None)
+    try:
+        with _count_seconds.time():
+            result = await count_flight.do(
+                (generation, key, estimate),
+                lambda: count_recipes(filter_opts, estimate),
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
+    if count_cache.generation == generation:
+        count_cache.set(key, result)
+    return result
+
+
+"""
+Builds the records of a page of recipe rows, taking those found in the recipe cache
+(`cached`, keyed by recipe ID, with None for the missing ones) as they are.
+
+Doesn't touch the cache itself, so it can be run off the event loop.
+
+Raises:
+    HTTPException 500: If the stored recipe data is invalid.
+"""
+
+
+def parse_recipes(
+    rows: List[dict],
+    cached: Dict[str, Optional[RecipeRecord]],
+    ingredient_rows: List[dict],
+) -> List[RecipeRecord]:
+    try:
+        ingredients_by_recipe = group_ingredient_records(ingredient_rows)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to parse recipe data: {e}")
+
+    recipes = []
+    for row in rows:
+        recipe = cached[row["id"]]
+        if recipe is None:
+            try:
+                recipe = RecipeRecord.from_row(
+                    row, ingredients_by_recipe.get(row["id"], [])
+                )
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500, detail=f"Failed to parse recipe data: {e}"
+                )
+        recipes.append(recipe)
+    return recipes
+
+
+"""
+Converts records to the public Recipe model.
+"""
+
+
+def build_recipes(records: List[RecipeRecord]) -> List[Recipe]:
+    return [Recipe.from_record(record) for record in records]
+
+
+"""
+Reads a page of recipes: its rows, their records, taken from the recipe cache or
+parsed from the database (see `parse_recipes`), and whether there is a next page.
+Parsing a large page is offloaded (see `offloader`), and the records it builds are then
+added to the cache, unless it was invalidated since `generation`.
+
+Raises:
+    HTTPException 500: For database errors or if the stored recipe data is invalid.
+"""
+
+
+async def load_page(
+    pagination: PaginationParams,
+    filter_opts: Optional[FilterOptions],
+    sort_opts: Optional[SortOptions],
+    after: Optional[list],
+    generation: int,
+) -> Tuple[List[dict], List[RecipeRecord], bool]:
+    try:
+        with _query_seconds.time():
+            rows = await get_recipes(pagination, filter_opts, sort_opts, after)
+            # The extra row only tells whether there is a next page
+            has_next = len(rows) > pagination.size
+            rows = rows[: pagination.size]
+            cached = {row["id"]: recipe_cache.get(row["id"]) for row in rows}
+            missing = [
+                recipe_id for recipe_id, recipe in cached.items() if recipe is None
+            ]
+            ingredient_rows = await get_ingredient_rows(missing) if missing else []
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
+    _recipe_rows_read.inc(len(rows))
+    _ingredient_rows_read.inc(len(ingredient_rows))
+
+    with _parse_seconds.time():
+        recipes = await offloader.run(
+            len(ingredient_rows), parse_recipes, rows, cached, ingredient_rows
+        )
+
+    if recipe_cache.generation == generation:
+        for row, recipe in zip(rows, recipes):
+            if cached[row["id"]] is None:
+                recipe_cache.set(row["id"], recipe)
+    return rows, recipes, has_next
 
 
 """
 Fetch a paginated list of recipes from the database with optional filtering, sorting, and portion/unit adjustments.
 
 This function:
-- Applies an optional filter on recipe names using a case-insensitive search query.
-- Applies optional sorting on allowed fields (currently only 'portions').
-- Applies pagination to limit the number of results returned.
-- Parses each recipe's ingredient JSON data into Ingredient objects.
-- Optionally adjusts each recipe's ingredient quantities for desired portions and unit conversions.
+- Applies an optional full-text search on recipe names (and optionally ingredient names),
+  matching every word of the query as a prefix.
+- Applies optional sorting on the fields of SORT_FIELDS, ties being broken by recipe ID.
+  Searches are sorted by relevance by default.
+- Applies pagination to limit the number of results returned, either by page number or
+  by seeking from `pagination.cursor`, and tells whether there is a next page by reading
+  one more row than the page holds.
+- Adds the total number of matching recipes, exact or estimated, from the count cache
+  (see `get_total`). The last page of an offset query gives it without counting.
+- Takes already parsed recipe records from the recipe cache, and fetches the ingredients of
+  the remaining recipes on the page in a single query.
+- Shares that read between concurrent requests for the same page (see `page_flight`), each
+  applying its own adjustments to the shared records.
+- Optionally adjusts the ingredient quantities of the whole page for desired portions and unit
+  conversions in one vectorized pass (see `transform_records`).
+- Converts the records to Recipe models only once the page is complete.
+- Parses, adjusts and converts large pages in a thread pool (see `offloader`), so they don't
+  stall the event loop.
+- Records the time spent in each stage and the number of rows read (see app/utils/metrics.py).
 - Returns a paginated response containing the processed recipes.
 
 Args:
-    pagination (PaginationParams, optional): Pagination parameters (page number and page size). Defaults to first page with size 5.
-    filter_opts (Optional[FilterOptions], optional): Filter options including query string for searching recipe names.
+    pagination (PaginationParams, optional): Pagination parameters (page number and page size, or a cursor). Defaults to first page with size 5.
+    filter_opts (Optional[FilterOptions], optional): Filter options including query string for searching recipe (and ingredient) names.
     sort_opts (Optional[SortOptions], optional): Sorting options specifying field and order (ascending/descending).
     req (Optional[RecipesRequest], optional): Optional recipe-related parameters for desired portions and unit conversions.
 
 Raises:
-    HTTPException 400: If invalid unit conversions or portion adjustments are requested.
+    HTTPException 400: If the cursor is invalid, or invalid unit conversions or portion adjustments are requested.
     HTTPException 500: For unexpected errors during recipe processing.
 
 Returns:
     PaginatedResponse[Recipe]: A paginated list of Recipe models matching the query with applied adjustments.
+        `next_cursor` is set when there is a next page, and can be passed back to fetch it.
 """
 
 
@@ -77,44 +572,62 @@ async def fetch_recipes(
     req: Optional[RecipesRequest] = None,
 ) -> PaginatedResponse[Recipe]:
 
-    try:
-        rows = await get_recipes(pagination, filter_opts, sort_opts)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
-
-    recipes = []
-    for row in rows:
+    after = None
+    if pagination.cursor:
         try:
-            recipe = Recipe(
-                id=row["id"],
-                name=row["name"],
-                portions=row["portions"],
-                ingredients=[
-                    Ingredient(**ingredient)
-                    for ingredient in json.loads(row["ingredients"])
-                ],
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=500, detail=f"Failed to parse recipe data: {e}"
-            )
-
-        try:
-            if req and req.desired_portions is not None:
-                recipe.reportion(req.desired_portions)
-            if req and req.mass_unit is not None:
-                recipe.reunit(req.mass_unit)
-
-            if req and req.volume_unit is not None:
-                recipe.reunit(req.volume_unit)
-            recipes.append(recipe)
+            after = read_cursor(pagination.cursor, sort_opts, filter_opts)
         except ValueError as ve:
             raise HTTPException(status_code=400, detail=str(ve))
-        except Exception:
-            raise HTTPException(status_code=500, detail="Error processing recipe")
 
+    # Concurrent requests for the same page share one read, and each transforms it
+    generation = recipe_cache.generation
+    count_generation = count_cache.generation
+    rows, recipes, has_next = await page_flight.do(
+        recipes_page_key(pagination, filter_opts, sort_opts),
+        lambda: load_page(pagination, filter_opts, sort_opts, after, generation),
+    )
+
+    # Reportion and reunit the whole page at once, into new records. Large pages are
+    # transformed and built off the event loop.
+    weight = sum(len(recipe.ingredients) for recipe in recipes)
+    try:
+        with _transform_seconds.time():
+            recipes = await offloader.run(
+                weight,
+                transform_records,
+                recipes,
+                req.desired_portions if req else None,
+                req.mass_unit if req else None,
+                req.volume_unit if req else None,
+            )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception:
+        raise HTTPException(status_code=500, detail="Error processing recipe")
+
+    next_cursor = None
+    if has_next:
+        next_cursor = make_cursor(rows[-1], sort_opts, filter_opts)
+
+    total, total_estimated = None, False
+    if pagination.count == CountMode.NONE:
+        pass
+    elif after is None and not has_next and (rows or pagination.page == 1):
+        # The last page of an offset query gives the total away, without counting
+        total = pagination.offset + len(rows)
+        if count_cache.generation == count_generation:
+            count_cache.set(recipes_count_key(filter_opts), (total, False))
+    else:
+        total, total_estimated = await get_total(filter_opts, pagination.count)
+
+    with _build_seconds.time():
+        items = await offloader.run(weight, build_recipes, recipes)
     return PaginatedResponse[Recipe](
         page=pagination.page,
         size=pagination.size,
-        items=recipes,
+        items=items,
+        next_cursor=next_cursor,
+        has_next=has_next,
+        total=total,
+        total_estimated=total_estimated,
     )
@@ -0,0 +1,181 @@
+from typing import List, NamedTuple, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from app import config
+from app.database.database import engine
+from app.database.recipe_import import write_batch
+from app.model.recipe.recipe import Recipe
+from app.services.cache_service import invalidate_recipes
+from app.utils.group_commit import GroupCommitter, WriteQueueFull
+from app.utils.metrics import CallbackMetric, registry
+
+"""
+One write request: its recipes (as found in mock_data.json), and whether recipes that
+already exist are replaced (PUT) or rejected (POST).
+"""
+
+
+class RecipeWrite(NamedTuple):
+    recipes: List[dict]
+    upsert: bool
+
+
+"""
+Converts a validated recipe to the form `write_batch` takes, with units as their codes.
+"""
+
+
+def recipe_dict(recipe: Recipe) -> dict:
+    return {
+        "id": recipe.id,
+        "name": recipe.name,
+        "portions": recipe.portions,
+        "ingredients": [
+            {
+                "name": ingredient.name,
+                "unit": str(ingredient.unit),
+                "quantity": ingredient.quantity,
+            }
+            for ingredient in recipe.ingredients
+        ],
+    }
+
+
+"""
+Merges consecutive writes into as few `write_batch` calls as possible, keeping their
+order. Writes that replace recipes merge freely, as the last version of a recipe wins
+either way. Writes that create recipes only merge while their IDs don't overlap, so a
+recipe created twice still fails.
+
+Returns:
+    List[Tuple[List[dict], bool]]: The recipes of each call, and whether they upsert.
+"""
+
+
+def merge_writes(writes: List[RecipeWrite]) -> List[Tuple[List[dict], bool]]:
+    merged = []
+    merged_ids = set()
+    for write in writes:
+        ids = {recipe["id"] for recipe in write.recipes}
+        if (
+            merged
+            and merged[-1][1] == write.upsert
+            and (write.upsert or merged_ids.isdisjoint(ids))
+        ):
+            merged[-1][0].extend(write.recipes)
+            merged_ids |= ids
+        else:
+            merged.append((list(write.recipes), write.upsert))
+            merged_ids = ids
+    return merged
+
+
+"""
+Writes a batch of write requests to the primary database in a single transaction.
+Runs in the writer's thread (see `recipe_writer`).
+
+Returns:
+    List[int]: The number of recipes written by each request.
+"""
+
+
+def write_recipes(writes: List[RecipeWrite]) -> List[int]:
+    with engine.begin() as conn:
+        for recipes, upsert in merge_writes(writes):
+            write_batch(conn, recipes, upsert)
+    return [len({recipe["id"] for recipe in write.recipes}) for write in writes]
+
+
+"""
+Drops the cached recipes, pages and counts a batch of writes may have changed. The
+search and ingredient indexes and the summary columns are kept up to date by the writes
+themselves (see recipe_import.py).
+"""
+
+
+def invalidate_written(writes: List[RecipeWrite]) -> None:
+    invalidate_recipes([recipe["id"] for write in writes for recipe in write.recipes])
+
+
+# Queues the writes of every request and commits them in batches (see group_commit.py)
+recipe_writer: GroupCommitter[RecipeWrite, int] = GroupCommitter(
+    write_recipes,
+    capacity=config.WRITE_QUEUE_SIZE,
+    max_batch=config.WRITE_BATCH_SIZE,
+    timeout=config.WRITE_QUEUE_TIMEOUT,
+    on_flush=invalidate_written,
+)
+
+"""
+Creates the given recipes, or with `upsert` creates or replaces them (ingredients
+included), and returns the number written.
+
+Each call is written atomically, in a transaction shared with the writes of other
+requests queued at the same time. It returns once that transaction is committed, and
+the caches are invalidated.
+
+Raises:
+    HTTPException 409: Without `upsert`, if any of the recipes already exists.
+    HTTPException 503: If the write queue stays full for WRITE_QUEUE_TIMEOUT.
+    HTTPException 500: For database errors.
+"""
+
+
+async def save_recipes(recipes: List[Recipe], upsert: bool = True) -> int:
+    write = RecipeWrite([recipe_dict(recipe) for recipe in recipes], upsert)
+    try:
+        return await recipe_writer.submit(write, len(write.recipes))
+    except WriteQueueFull as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"}
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409,
+            detail="A recipe with this ID already exists, use PUT to replace it.",
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
+
+
+"""
+Commits the writes still queued and closes the writer's database connections.
+"""
+
+
+async def close_writer():
+    await recipe_writer.close()
+    engine.dispose()
+
+
+registry.register(
+    CallbackMetric(
+        "recipe_api_recipe_writes_total",
+        "Recipe write requests committed, and turned away because the queue was full.",
+        ("result",),
+        lambda: [
+            (("committed",), recipe_writer.writes),
+            (("rejected",), recipe_writer.rejected),
+        ],
+        "counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "recipe_api_recipe_write_flushes_total",
+        "Transactions the queued recipe writes were committed in.",
+        (),
+        lambda: [((), recipe_writer.flushes)],
+        "counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "recipe_api_recipe_write_queue_recipes",
+        "Recipes waiting to be written.",
+        (),
+        lambda: [((), recipe_writer.stats()["pending"])],
+    )
+)
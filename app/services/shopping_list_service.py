@@ -0,0 +1,45 @@
+from fastapi import HTTPException
+
+from app.model.params import ShoppingListRequest
+from app.model.shopping_list.shopping_list import ShoppingList
+from app.services.ingredient_service import load_recipes
+
+"""
+Build a consolidated shopping list for a set of recipes and portion counts.
+
+This function:
+- Loads every requested recipe at once (see `load_recipes`), using the recipe cache.
+- Scales each recipe to its desired portions, converts mass and volume quantities to the
+  requested (or base) units and sums them by ingredient name (see `ShoppingList.from_recipes`).
+
+Raises:
+    HTTPException 400: If any desired portions are zero or negative.
+    HTTPException 404: If any of the recipes do not exist.
+    HTTPException 500: For database errors or if a recipe's stored data is invalid.
+
+Returns:
+    ShoppingList: The consolidated ingredients.
+"""
+
+
+async def fetch_shopping_list(req: ShoppingListRequest) -> ShoppingList:
+    recipes = await load_recipes([item.recipe_id for item in req.items])
+
+    missing = [item.recipe_id for item in req.items if item.recipe_id not in recipes]
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail="Recipe not found: " + ", ".join(dict.fromkeys(missing)),
+        )
+    for recipe in recipes.values():
+        if isinstance(recipe, HTTPException):
+            raise recipe
+
+    try:
+        return ShoppingList.from_recipes(
+            [(recipes[item.recipe_id], item.desired_portions) for item in req.items],
+            mass_unit=req.mass_unit,
+            volume_unit=req.volume_unit,
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
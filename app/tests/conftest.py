@@ -0,0 +1,22 @@
+import pytest
+from sqlalchemy import create_engine
+from app.database.database import metadata
+from app.services.cache_service import invalidate_recipes
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Cached recipes would otherwise leak between tests that mock the database
+    invalidate_recipes()
+    yield
+    invalidate_recipes()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # An empty SQLite database with the full schema. Test modules seed it by overriding
+    # this fixture with one that takes it as an argument.
+    engine = create_engine(f"sqlite:///{tmp_path / 'recipes.db'}")
+    metadata.create_all(engine)
+    yield engine
+    engine.dispose()
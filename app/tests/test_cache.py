@@ -0,0 +1,70 @@
+import pytest
+from app.utils.cache import LRUCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_expires_entries_after_ttl():
+    timer = FakeTimer()
+    cache = LRUCache(maxsize=10, ttl=5, timer=timer)
+    cache.set("a", 1)
+
+    timer.now = 4.9
+    assert cache.get("a") == 1
+    timer.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_invalidate_and_clear():
+    cache = LRUCache(maxsize=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    cache.invalidate(["a", "missing"])
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_cache_stats_counts_hits_and_misses():
+    cache = LRUCache(maxsize=10)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+    assert stats["size"] == 1
+    assert stats["maxsize"] == 10
+
+
+def test_lru_cache_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
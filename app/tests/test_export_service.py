@@ -0,0 +1,143 @@
+import gzip
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.model.params import RecipesRequest
+from app.model.unit.unit import MassUnit
+from app.services import export_service
+from app.services.export_service import export_recipes
+
+client = TestClient(app)
+
+export_rows = [
+    {
+        "id": "r1",
+        "name": "Pancakes",
+        "portions": 2,
+        "ingredient_name": "Flour",
+        "unit": "g",
+        "quantity": 200,
+    },
+    {
+        "id": "r1",
+        "name": "Pancakes",
+        "portions": 2,
+        "ingredient_name": "Milk",
+        "unit": "ml",
+        "quantity": 300,
+    },
+    {
+        "id": "r2",
+        "name": "Water",
+        "portions": 1,
+        "ingredient_name": None,
+        "unit": None,
+        "quantity": None,
+    },
+    {
+        "id": "r3",
+        "name": "Toast",
+        "portions": 1,
+        "ingredient_name": "Bread",
+        "unit": "unit",
+        "quantity": 2,
+    },
+]
+
+
+def iterate_rows(rows):
+    async def iterate(query):
+        for row in rows:
+            yield row
+
+    return iterate
+
+
+async def collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.export_service.read_database.iterate", new=iterate_rows(export_rows)
+)
+async def test_export_recipes_groups_rows_into_lines():
+    body = await collect(export_recipes())
+
+    lines = [json.loads(line) for line in body.decode().splitlines()]
+    assert [line["id"] for line in lines] == ["r1", "r2", "r3"]
+    assert lines[0]["ingredients"] == [
+        {"name": "Flour", "unit": "g", "quantity": 200.0},
+        {"name": "Milk", "unit": "ml", "quantity": 300.0},
+    ]
+    assert lines[1]["ingredients"] == []
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.export_service.read_database.iterate", new=iterate_rows(export_rows)
+)
+async def test_export_recipes_transforms_in_chunks(monkeypatch):
+    monkeypatch.setattr(export_service, "EXPORT_CHUNK_SIZE", 2)
+    chunks = [
+        chunk
+        async for chunk in export_recipes(
+            RecipesRequest(desired_portions=4, mass_unit=MassUnit.KILOGRAM)
+        )
+    ]
+
+    assert len(chunks) == 2
+    lines = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+    assert lines[0]["portions"] == 4
+    assert lines[0]["ingredients"][0] == {
+        "name": "Flour",
+        "unit": "kg",
+        "quantity": 0.4,
+    }
+    assert lines[2]["ingredients"][0]["quantity"] == 8
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.export_service.read_database.iterate", new=iterate_rows(export_rows)
+)
+async def test_export_recipes_gzip():
+    plain = await collect(export_recipes())
+    compressed = await collect(export_recipes(compress=True))
+    assert gzip.decompress(compressed) == plain
+
+
+@pytest.mark.asyncio
+async def test_export_recipes_invalid_portions():
+    with pytest.raises(HTTPException) as exc:
+        export_recipes(RecipesRequest(desired_portions=0))
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.export_service.read_database.iterate",
+    new=iterate_rows([dict(export_rows[0], unit="grams")]),
+)
+async def test_export_recipes_corrupt_row_ends_stream():
+    with pytest.raises(ValueError):
+        await collect(export_recipes())
+
+
+@patch(
+    "app.services.export_service.read_database.iterate", new=iterate_rows(export_rows)
+)
+def test_export_endpoint_gzip():
+    plain = client.get("/recipes/export")
+    assert plain.status_code == 200
+    assert plain.headers["content-type"] == "application/x-ndjson"
+
+    # The client decompresses the body as instructed by Content-Encoding
+    compressed = client.get("/recipes/export?gzip=true")
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.content == plain.content
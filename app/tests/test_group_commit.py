@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import pytest
+from app.utils.group_commit import GroupCommitter, WriteQueueFull
+
+
+class Store:
+    def __init__(self):
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    # Fails the whole batch if any write in it is "bad"
+    def flush(self, writes):
+        self.release.wait(5)
+        if "bad" in writes:
+            raise ValueError("bad write")
+        self.batches.append(list(writes))
+        return [write.upper() for write in writes]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_a_flush():
+    store = Store()
+    committer = GroupCommitter(store.flush)
+
+    results = await asyncio.gather(*(committer.submit(w) for w in ["a", "b", "c"]))
+
+    assert results == ["A", "B", "C"]
+    assert store.batches == [["a", "b", "c"]]
+    assert committer.stats() == {
+        "flushes": 1,
+        "writes": 3,
+        "rejected": 0,
+        "pending": 0,
+    }
+    await committer.close()
+
+
+@pytest.mark.asyncio
+async def test_writes_queued_during_a_flush_share_the_next_one():
+    store = Store()
+    store.release.clear()
+    committer = GroupCommitter(store.flush, max_batch=2)
+
+    first = asyncio.ensure_future(committer.submit("a"))
+    await asyncio.sleep(0.01)
+    rest = [asyncio.ensure_future(committer.submit(w)) for w in ["b", "c", "d"]]
+    await asyncio.sleep(0.01)
+    store.release.set()
+    await asyncio.gather(first, *rest)
+
+    # Batches hold at most `max_batch` of weight
+    assert store.batches == [["a"], ["b", "c"], ["d"]]
+    await committer.close()
+
+
+@pytest.mark.asyncio
+async def test_a_failing_write_only_fails_its_caller():
+    store = Store()
+    flushed = []
+    committer = GroupCommitter(store.flush, on_flush=flushed.extend)
+
+    results = await asyncio.gather(
+        committer.submit("a"),
+        committer.submit("bad"),
+        committer.submit("c"),
+        return_exceptions=True,
+    )
+
+    assert results[0] == "A" and results[2] == "C"
+    assert isinstance(results[1], ValueError)
+    assert store.batches == [["a"], ["c"]]
+    assert flushed == ["a", "c"]
+    assert committer.writes == 2
+    await committer.close()
+
+
+@pytest.mark.asyncio
+async def test_a_full_queue_pushes_back():
+    store = Store()
+    store.release.clear()
+    committer = GroupCommitter(store.flush, capacity=2, timeout=0.05)
+
+    pending = [asyncio.ensure_future(committer.submit(w)) for w in ["a", "b"]]
+    await asyncio.sleep(0.01)
+    with pytest.raises(WriteQueueFull):
+        await committer.submit("c")
+    assert committer.rejected == 1
+
+    # Room is made as soon as the queued writes are flushed
+    waiting = asyncio.ensure_future(committer.submit("d"))
+    await asyncio.sleep(0.01)
+    store.release.set()
+    assert await asyncio.gather(*pending, waiting) == ["A", "B", "D"]
+    await committer.close()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_writes():
+    store = Store()
+    store.release.clear()
+    committer = GroupCommitter(store.flush)
+
+    write = asyncio.ensure_future(committer.submit("a", weight=3))
+    await asyncio.sleep(0.01)
+    assert committer.stats()["pending"] == 3
+
+    closing = asyncio.ensure_future(committer.close())
+    await asyncio.sleep(0.01)
+    assert not closing.done()
+    store.release.set()
+    await closing
+
+    assert await write == "A"
+    assert store.batches == [["a"]]
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        GroupCommitter(lambda writes: writes, capacity=0)
+    with pytest.raises(ValueError):
+        GroupCommitter(lambda writes: writes, max_batch=0)
@@ -0,0 +1,168 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from sqlalchemy import select, text
+from app.database.ingredient_table import (
+    build_ingredient_filter,
+    count_ingredient_rows,
+    ingredient_table,
+    normalize_ingredient_name,
+    split_ingredient_names,
+)
+from app.database.recipe_import import flatten_recipe
+from app.database.recipe_table import recipe_table
+from app.model.params import FilterOptions, PaginationParams, SortOptions
+from app.services.recipe_service import fetch_recipes
+
+RECIPES = {
+    "r1": ["Flour", "Milk", "Egg"],
+    "r2": ["Flour", "Water", "Salt"],
+    "r3": ["Chicken Breast", "salt "],
+}
+
+
+@pytest.fixture
+def engine(engine):
+    with engine.begin() as conn:
+        for recipe_id, names in RECIPES.items():
+            recipe_row, ingredient_rows = flatten_recipe(
+                {
+                    "id": recipe_id,
+                    "name": recipe_id,
+                    "portions": 2,
+                    "ingredients": [
+                        {"name": name, "unit": "g", "quantity": 1} for name in names
+                    ],
+                }
+            )
+            conn.execute(recipe_table.insert(), recipe_row)
+            conn.execute(ingredient_table.insert(), ingredient_rows)
+    return engine
+
+
+def matching(engine, include="", exclude="", match_any=False, counted=True):
+    include, exclude = split_ingredient_names(include), split_ingredient_names(exclude)
+    ingredient_rows = {}
+    if counted and include:
+        with engine.connect() as conn:
+            counts = conn.execute(count_ingredient_rows(include, limit=1)).one()
+            ingredient_rows = dict(zip(include, counts))
+    condition = build_ingredient_filter(include, exclude, match_any, ingredient_rows)
+    query = select(recipe_table.c.id).where(condition).order_by(recipe_table.c.id)
+    with engine.connect() as conn:
+        return [row.id for row in conn.execute(query)]
+
+
+def test_normalize_ingredient_names():
+    assert normalize_ingredient_name("  Chicken   BREAST ") == "chicken breast"
+    assert normalize_ingredient_name("Crème Fraîche") == "crème fraîche"
+    assert split_ingredient_names("Salt, flour,,SALT , ") == ["salt", "flour"]
+    assert split_ingredient_names(None) == []
+    assert build_ingredient_filter([], []) is None
+
+
+# Whether the included ingredients were counted first (so the selective ones are read
+# from the index up front) or not (so every recipe is checked against the index)
+@pytest.mark.parametrize("counted", [True, False])
+def test_include_all_any_and_exclude(engine, counted):
+    assert matching(engine, "flour", counted=counted) == ["r1", "r2"]
+    assert matching(engine, "Flour, SALT", counted=counted) == ["r2"]
+    assert matching(engine, "milk,egg,flour", counted=counted) == ["r1"]
+    assert matching(engine, "milk,chicken breast", match_any=True, counted=counted) == [
+        "r1",
+        "r3",
+    ]
+    assert matching(engine, exclude="salt", counted=counted) == ["r1"]
+    assert matching(engine, "flour", exclude="egg", counted=counted) == ["r2"]
+    assert matching(engine, "butter", counted=counted) == []
+
+
+def test_count_ingredient_rows_stops_at_the_limit(engine):
+    with engine.connect() as conn:
+        counts = conn.execute(
+            count_ingredient_rows(["flour", "salt", "milk", "butter"], limit=1)
+        ).one()
+    assert tuple(counts) == (2, 2, 1, 0)
+
+
+def test_index_follows_writes(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            ingredient_table.update()
+            .where(ingredient_table.c.recipe_id == "r1")
+            .where(ingredient_table.c.position == 1)
+            .values(name="Oat  Milk", name_key=normalize_ingredient_name("Oat  Milk"))
+        )
+        conn.execute(
+            ingredient_table.insert(),
+            {
+                "recipe_id": "r3",
+                "position": 2,
+                "name": "FLOUR",
+                "unit": "g",
+                "quantity": 10,
+            },
+        )
+
+    assert matching(engine, include="milk") == []
+    assert matching(engine, include="oat milk") == ["r1"]
+    assert matching(engine, include="flour") == ["r1", "r2", "r3"]
+
+
+def query_plan(engine, condition) -> str:
+    query = select(recipe_table.c.id).where(condition).order_by(recipe_table.c.id)
+    sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return " ".join(
+            row.detail for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        )
+
+
+def test_filters_read_only_the_index(engine):
+    # Common ingredients are looked up for each recipe, in id order
+    plan = query_plan(engine, build_ingredient_filter(["flour", "salt"], ["egg"]))
+    assert "SCAN recipes USING COVERING INDEX" in plan
+    assert (
+        "SEARCH ingredients USING COVERING INDEX ix_ingredients_name_key "
+        "(name_key=? AND recipe_id=?)"
+    ) in plan
+    assert "SCAN ingredients" not in plan
+
+    # The recipes of a selective ingredient are read from the index first
+    plan = query_plan(
+        engine,
+        build_ingredient_filter(["flour", "salt"], [], ingredient_rows={"salt": 2}),
+    )
+    assert "SEARCH recipes USING COVERING INDEX" in plan
+    assert (
+        "SEARCH ingredients USING COVERING INDEX ix_ingredients_name_key (name_key=?)"
+        in plan
+    )
+    assert "SCAN" not in plan
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+@patch("app.services.recipe_service.read_database.fetch_one", new_callable=AsyncMock)
+async def test_fetch_recipes_applies_ingredient_filters(mock_fetch_one, mock_fetch_all):
+    mock_fetch_one.return_value = {"rows_0": 3, "rows_1": 0}
+    mock_fetch_all.return_value = []
+    filter_opts = FilterOptions(
+        include_ingredients="Flour,Milk",
+        exclude_ingredients="egg",
+        ingredient_match="any",
+    )
+
+    await fetch_recipes(
+        PaginationParams(), filter_opts, SortOptions(field="portions"), None
+    )
+    # The counts are cached
+    await fetch_recipes(PaginationParams(size=10), filter_opts, None, None)
+
+    mock_fetch_one.assert_awaited_once()
+    query = mock_fetch_all.await_args_list[0].args[0]
+    sql = str(query.compile(compile_kwargs={"literal_binds": True}))
+    # Both ingredients are selective (milk has no rows at all)
+    assert "recipes.id IN (SELECT ingredients.recipe_id" in sql
+    assert "ingredients.name_key IN ('flour', 'milk')" in sql
+    assert "NOT (EXISTS (SELECT ingredients.recipe_id" in sql
+    assert "ORDER BY recipes.portions ASC, recipes.id ASC" in sql
@@ -2,20 +2,32 @@ from pydantic import ValidationError
 import pytest
 from unittest.mock import patch, AsyncMock
 from fastapi import HTTPException
-from app.model.params import IngredientsRequest
+from app.model.params import (
+    MAX_BATCH_SIZE,
+    IngredientsBatchRequest,
+    IngredientsRequest,
+)
 from app.model.unit.unit import CountUnit, MassUnit, VolumeUnit
-from app.services.ingredient_service import fetch_ingredients
+from app.services.cache_service import invalidate_recipes
+from app.services.ingredient_service import fetch_ingredients, fetch_ingredients_batch
 
 
 @pytest.mark.asyncio
-@patch("app.services.ingredient_service.database.fetch_one", new_callable=AsyncMock)
-async def test_fetch_ingredients_returns_ingredients(mock_fetch_one):
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_returns_ingredients(mock_fetch_one, mock_fetch_all):
     mock_fetch_one.return_value = {
         "id": "r1",
         "name": "Test Recipe",
         "portions": 4,
-        "ingredients": '[{"name":"Sugar","quantity":100,"unit":"g"}]',
     }
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+    ]
 
     req = IngredientsRequest(recipe_id="r1")
     ingredients = await fetch_ingredients(req)
@@ -29,14 +41,23 @@ async def test_fetch_ingredients_returns_ingredients(mock_fetch_one):
 
 
 @pytest.mark.asyncio
-@patch("app.services.ingredient_service.database.fetch_one", new_callable=AsyncMock)
-async def test_fetch_ingredients_returns_ingredients_double_portions(mock_fetch_one):
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_returns_ingredients_double_portions(
+    mock_fetch_one, mock_fetch_all
+):
     mock_fetch_one.return_value = {
         "id": "r1",
         "name": "Test Recipe",
         "portions": 4,
-        "ingredients": '[{"name":"Sugar","quantity":100,"unit":"g"}]',
     }
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+    ]
 
     req = IngredientsRequest(recipe_id="r1", desired_portions=8)
     ingredients = await fetch_ingredients(req)
@@ -51,14 +72,23 @@ async def test_fetch_ingredients_returns_ingredients_double_portions(mock_fetch_
 
 
 @pytest.mark.asyncio
-@patch("app.services.ingredient_service.database.fetch_one", new_callable=AsyncMock)
-async def test_fetch_ingredients_returns_ingredients_kg_preferred(mock_fetch_one):
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_returns_ingredients_kg_preferred(
+    mock_fetch_one, mock_fetch_all
+):
     mock_fetch_one.return_value = {
         "id": "r1",
         "name": "Test Recipe",
         "portions": 4,
-        "ingredients": '[{"name":"Sugar","quantity":100,"unit":"g"}]',
     }
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+    ]
 
     req = IngredientsRequest(recipe_id="r1", mass_unit="kg")
     ingredients = await fetch_ingredients(req)
@@ -72,14 +102,23 @@ async def test_fetch_ingredients_returns_ingredients_kg_preferred(mock_fetch_one
 
 
 @pytest.mark.asyncio
-@patch("app.services.ingredient_service.database.fetch_one", new_callable=AsyncMock)
-async def test_fetch_ingredients_returns_ingredients_oz_preferred(mock_fetch_one):
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_returns_ingredients_oz_preferred(
+    mock_fetch_one, mock_fetch_all
+):
     mock_fetch_one.return_value = {
         "id": "r1",
         "name": "Test Recipe",
         "portions": 4,
-        "ingredients": '[{"name":"Lemon Juice","quantity":100,"unit":"ml"}]',
     }
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Lemon Juice", "unit": "ml", "quantity": 100},
+    ]
 
     req = IngredientsRequest(recipe_id="r1", volume_unit="floz")
     ingredients = await fetch_ingredients(req)
@@ -93,14 +132,24 @@ async def test_fetch_ingredients_returns_ingredients_oz_preferred(mock_fetch_one
 
 
 @pytest.mark.asyncio
-@patch("app.services.ingredient_service.database.fetch_one", new_callable=AsyncMock)
-async def test_fetch_ingredients_returns_ingredients_kg_oz_preferred(mock_fetch_one):
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_returns_ingredients_kg_oz_preferred(
+    mock_fetch_one, mock_fetch_all
+):
     mock_fetch_one.return_value = {
         "id": "r1",
         "name": "Test Recipe",
         "portions": 4,
-        "ingredients": '[{"name":"Lemon Juice","quantity":100,"unit":"ml"}, {"name":"Sugar","quantity":100,"unit":"g"}]',
     }
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Lemon Juice", "unit": "ml", "quantity": 100},
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+    ]
 
     req = IngredientsRequest(recipe_id="r1", mass_unit="kg", volume_unit="floz")
     ingredients = await fetch_ingredients(req)
@@ -118,16 +167,23 @@ async def test_fetch_ingredients_returns_ingredients_kg_oz_preferred(mock_fetch_
 
 
 @pytest.mark.asyncio
-@patch("app.services.ingredient_service.database.fetch_one", new_callable=AsyncMock)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
 async def test_fetch_ingredients_returns_ingredients_countable_unaffected(
-    mock_fetch_one,
+    mock_fetch_one, mock_fetch_all
 ):
     mock_fetch_one.return_value = {
         "id": "r1",
         "name": "Test Recipe",
         "portions": 4,
-        "ingredients": '[{"name":"Lemon Juice","quantity":1,"unit":"cup"}]',
     }
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Lemon Juice", "unit": "cup", "quantity": 1},
+    ]
 
     req = IngredientsRequest(recipe_id="r1", volume_unit="floz")
     ingredients = await fetch_ingredients(req)
@@ -141,8 +197,13 @@ async def test_fetch_ingredients_returns_ingredients_countable_unaffected(
 
 
 @pytest.mark.asyncio
-@patch("app.services.ingredient_service.database.fetch_one", new_callable=AsyncMock)
-async def test_fetch_ingredients_recipe_not_exist(mock_fetch_one):
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_recipe_not_exist(mock_fetch_one, mock_fetch_all):
 
     mock_fetch_one.return_value = None
 
@@ -155,15 +216,25 @@ async def test_fetch_ingredients_recipe_not_exist(mock_fetch_one):
 
 
 @pytest.mark.asyncio
-@patch("app.services.ingredient_service.database.fetch_one", new_callable=AsyncMock)
-async def test_fetch_ingredients_recipe_corrupt_ingredients_data(mock_fetch_one):
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_recipe_corrupt_ingredients_data(
+    mock_fetch_one, mock_fetch_all
+):
 
     mock_fetch_one.return_value = {
         "id": "r1",
         "name": "Test Recipe",
         "portions": 4,
-        "ingredients": '["""""{"name":"Sugar","quantity":100,"unit":"g"}"""""]',
     }
+    # "grams" is not a known unit code
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "grams", "quantity": 100},
+    ]
 
     req = IngredientsRequest(recipe_id="r1")
 
@@ -174,14 +245,23 @@ async def test_fetch_ingredients_recipe_corrupt_ingredients_data(mock_fetch_one)
 
 
 @pytest.mark.asyncio
-@patch("app.services.ingredient_service.database.fetch_one", new_callable=AsyncMock)
-async def test_fetch_ingredients_recipe_corrupt_recipe_data(mock_fetch_one):
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_recipe_corrupt_recipe_data(
+    mock_fetch_one, mock_fetch_all
+):
 
     # Missing the name and portions field
     mock_fetch_one.return_value = {
         "id": "r1",
-        "ingredients": '[{"name":"Sugar","quantity":100,"unit":"g"}]',
     }
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+    ]
 
     req = IngredientsRequest(recipe_id="r1")
 
@@ -192,15 +272,24 @@ async def test_fetch_ingredients_recipe_corrupt_recipe_data(mock_fetch_one):
 
 
 @pytest.mark.asyncio
-@patch("app.services.ingredient_service.database.fetch_one", new_callable=AsyncMock)
-async def test_fetch_ingredients_recipe_invalid_mass_unit(mock_fetch_one):
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_recipe_invalid_mass_unit(
+    mock_fetch_one, mock_fetch_all
+):
 
     mock_fetch_one.return_value = {
         "id": "r1",
         "name": "Test Recipe",
         "portions": 4,
-        "ingredients": '[{"name":"Sugar","quantity":100,"unit":"g"}]',
     }
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+    ]
 
     # Expect Pydantic ValidationError on invalid mass_unit at construction time
     with pytest.raises(ValidationError) as exc_info:
@@ -208,16 +297,170 @@ async def test_fetch_ingredients_recipe_invalid_mass_unit(mock_fetch_one):
 
 
 @pytest.mark.asyncio
-@patch("app.services.ingredient_service.database.fetch_one", new_callable=AsyncMock)
-async def test_fetch_ingredients_recipe_invalid_volume_unit(mock_fetch_one):
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_recipe_invalid_volume_unit(
+    mock_fetch_one, mock_fetch_all
+):
 
     mock_fetch_one.return_value = {
         "id": "r1",
         "name": "Test Recipe",
         "portions": 4,
-        "ingredients": '[{"name":"Sugar","quantity":100,"unit":"g"}]',
     }
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+    ]
 
     # Expect Pydantic ValidationError on invalid mass_unit at construction time
     with pytest.raises(ValidationError) as exc_info:
         IngredientsRequest(recipe_id="r1", volume_unit="kg")
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_serves_repeat_requests_from_cache(
+    mock_fetch_one, mock_fetch_all
+):
+    mock_fetch_one.return_value = {
+        "id": "r1",
+        "name": "Test Recipe",
+        "portions": 4,
+    }
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+    ]
+
+    doubled = await fetch_ingredients(
+        IngredientsRequest(recipe_id="r1", desired_portions=8, mass_unit="kg")
+    )
+    original = await fetch_ingredients(IngredientsRequest(recipe_id="r1"))
+
+    # The second request is served from the cache...
+    mock_fetch_one.assert_awaited_once()
+    mock_fetch_all.assert_awaited_once()
+
+    # ...and the cached recipe was not modified by the first request's transform
+    assert doubled[0].quantity == 0.2
+    assert doubled[0].unit == MassUnit.KILOGRAM
+    assert original[0].quantity == 100
+    assert original[0].unit == MassUnit.GRAM
+
+    invalidate_recipes(["r1"])
+    await fetch_ingredients(IngredientsRequest(recipe_id="r1"))
+    assert mock_fetch_one.await_count == 2
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_batch_returns_results_in_order(mock_fetch_all):
+    mock_fetch_all.side_effect = [
+        [
+            {"id": "r2", "name": "Lemonade", "portions": 2},
+            {"id": "r1", "name": "Test Recipe", "portions": 4},
+        ],
+        [
+            {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+            {"recipe_id": "r2", "name": "Lemon Juice", "unit": "ml", "quantity": 100},
+        ],
+    ]
+
+    results = await fetch_ingredients_batch(
+        [
+            IngredientsRequest(recipe_id="r1", desired_portions=8, mass_unit="kg"),
+            IngredientsRequest(recipe_id="missing"),
+            IngredientsRequest(recipe_id="r2", volume_unit="floz"),
+            IngredientsRequest(recipe_id="r1", desired_portions=-1),
+            IngredientsRequest(recipe_id="r1"),
+        ]
+    )
+
+    # One query for all recipe rows, one for all their ingredients
+    assert mock_fetch_all.await_count == 2
+    recipes_query = mock_fetch_all.await_args_list[0].args[0]
+    sql = str(recipes_query.compile(compile_kwargs={"literal_binds": True}))
+    assert "recipes.id IN ('r1', 'missing', 'r2')" in sql
+
+    assert [result.recipe_id for result in results] == [
+        "r1",
+        "missing",
+        "r2",
+        "r1",
+        "r1",
+    ]
+    assert [result.status_code for result in results] == [200, 404, 200, 400, 200]
+
+    assert results[0].ingredients[0].quantity == 0.2
+    assert results[0].ingredients[0].unit == MassUnit.KILOGRAM
+    assert results[1].error == "Recipe not found"
+    assert results[1].ingredients is None
+    assert results[2].ingredients[0].quantity == 3.38
+    assert results[3].error == "Target portions must be greater than zero."
+    # Items for the same recipe don't affect each other
+    assert results[4].ingredients[0].quantity == 100
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_batch_corrupt_recipe_fails_only_its_items(
+    mock_fetch_all,
+):
+    mock_fetch_all.side_effect = [
+        [
+            {"id": "r1", "name": "Test Recipe", "portions": 4},
+            {"id": "r2", "name": "Lemonade", "portions": 2},
+        ],
+        [
+            {"recipe_id": "r1", "name": "Sugar", "unit": "grams", "quantity": 100},
+            {"recipe_id": "r2", "name": "Lemon Juice", "unit": "ml", "quantity": 100},
+        ],
+    ]
+
+    results = await fetch_ingredients_batch(
+        [IngredientsRequest(recipe_id="r1"), IngredientsRequest(recipe_id="r2")]
+    )
+
+    assert results[0].status_code == 500
+    assert results[0].error == "Failed to parse ingredient data"
+    assert results[1].status_code == 200
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+async def test_fetch_ingredients_batch_uses_recipe_cache(mock_fetch_all):
+    mock_fetch_all.side_effect = [
+        [{"id": "r1", "name": "Test Recipe", "portions": 4}],
+        [{"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100}],
+    ]
+    await fetch_ingredients_batch([IngredientsRequest(recipe_id="r1")])
+
+    results = await fetch_ingredients_batch(
+        [IngredientsRequest(recipe_id="r1", desired_portions=8)]
+    )
+
+    assert mock_fetch_all.await_count == 2
+    assert results[0].ingredients[0].quantity == 200
+
+
+def test_ingredients_batch_request_is_bounded():
+    with pytest.raises(ValidationError):
+        IngredientsBatchRequest(items=[])
+    with pytest.raises(ValidationError):
+        IngredientsBatchRequest(
+            items=[IngredientsRequest(recipe_id="r1")] * (MAX_BATCH_SIZE + 1)
+        )
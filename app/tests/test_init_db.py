@@ -0,0 +1,138 @@
+import json
+from sqlalchemy import create_engine, inspect, text
+from app.database.init_db import migrate_schema
+from app.database.recipe_import import flatten_recipe
+from app.database.recipe_table import UNIT_FAMILY_BITS
+
+
+def test_flatten_recipe_splits_ingredients_by_position():
+    recipe_row, ingredient_rows = flatten_recipe(
+        {
+            "id": "r1",
+            "name": "Pancakes",
+            "portions": 4,
+            "ingredients": [
+                {"name": "Flour", "unit": "g", "quantity": 200},
+                {"name": "Milk", "unit": "ml", "quantity": 300},
+            ],
+        }
+    )
+
+    assert recipe_row == {
+        "id": "r1",
+        "name": "Pancakes",
+        "portions": 4,
+        "ingredient_count": 2,
+        "total_mass_g": 200,
+        "total_volume_ml": 300,
+        "unit_families": UNIT_FAMILY_BITS["mass"] | UNIT_FAMILY_BITS["volume"],
+    }
+    assert [row["position"] for row in ingredient_rows] == [0, 1]
+    assert ingredient_rows[1] == {
+        "recipe_id": "r1",
+        "position": 1,
+        "name": "Milk",
+        "unit": "ml",
+        "quantity": 300,
+        "name_key": "milk",
+    }
+
+
+def test_migrate_schema_moves_legacy_json_ingredients(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    ingredients = [
+        {"name": "Flour", "unit": "g", "quantity": 200},
+        {"name": "Butter", "unit": "tablespoon", "quantity": 3},
+    ]
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE recipes (id VARCHAR PRIMARY KEY, name VARCHAR NOT NULL, "
+                "portions FLOAT NOT NULL, ingredients VARCHAR NOT NULL)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO recipes VALUES ('r1', 'Pancakes', 4, :ingredients)"),
+            {"ingredients": json.dumps(ingredients)},
+        )
+
+    assert migrate_schema(engine) == 1
+
+    columns = {column["name"] for column in inspect(engine).get_columns("recipes")}
+    assert "ingredients" not in columns
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT name, unit, quantity FROM ingredients "
+                "WHERE recipe_id = 'r1' ORDER BY position"
+            )
+        ).fetchall()
+    assert [tuple(row) for row in rows] == [
+        ("Flour", "g", 200),
+        ("Butter", "tablespoon", 3),
+    ]
+
+    # The migrated recipes can be searched, by name and by ingredient
+    with engine.connect() as conn:
+        matches = conn.execute(
+            text(
+                "SELECT recipe_search.recipe_id FROM recipes_fts "
+                "JOIN recipe_search ON recipe_search.id = recipes_fts.rowid "
+                "WHERE recipes_fts MATCH 'pancakes AND butter'"
+            )
+        ).fetchall()
+    assert [row.recipe_id for row in matches] == ["r1"]
+
+    # The summary and sort columns are added and filled in, and indexed
+    with engine.connect() as conn:
+        recipe = conn.execute(
+            text(
+                "SELECT ingredient_count, total_mass_g, unit_families, created_at "
+                "FROM recipes"
+            )
+        ).one()
+    assert tuple(recipe[:3]) == (
+        2,
+        200,
+        UNIT_FAMILY_BITS["mass"] | UNIT_FAMILY_BITS["count"],
+    )
+    assert recipe.created_at > 0
+    indexes = {index["name"] for index in inspect(engine).get_indexes("recipes")}
+    assert {"ix_recipes_name", "ix_recipes_ingredient_count"} <= indexes
+
+    # Running the migration again is a no-op
+    assert migrate_schema(engine) == 0
+
+
+def test_migrate_schema_keys_existing_ingredients(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'unkeyed.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE recipes (id VARCHAR PRIMARY KEY, name VARCHAR NOT NULL, "
+                "portions FLOAT NOT NULL)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE ingredients (recipe_id VARCHAR NOT NULL, "
+                "position INTEGER NOT NULL, name VARCHAR NOT NULL, "
+                "unit VARCHAR NOT NULL, quantity FLOAT NOT NULL, "
+                "PRIMARY KEY (recipe_id, position))"
+            )
+        )
+        conn.execute(text("INSERT INTO recipes VALUES ('r1', 'Crème brûlée', 4)"))
+        conn.execute(
+            text(
+                "INSERT INTO ingredients VALUES ('r1', 0, ' Crème  FRAÎCHE', 'ml', 200)"
+            )
+        )
+
+    migrate_schema(engine)
+
+    with engine.connect() as conn:
+        keys = conn.execute(text("SELECT name_key FROM ingredients")).scalars().all()
+    assert keys == ["crème fraîche"]
+    indexes = {index["name"] for index in inspect(engine).get_indexes("ingredients")}
+    assert "ix_ingredients_name_key" in indexes
@@ -0,0 +1,107 @@
+import re
+from unittest.mock import patch, AsyncMock
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.utils.metrics import Counter, Histogram, Registry
+
+client = TestClient(app)
+
+
+def sample(text: str, line: str) -> float:
+    match = re.search(rf"^{re.escape(line)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_counter_and_histogram_render_prometheus_text():
+    registry = Registry()
+    rows = registry.register(Counter("rows_total", "Rows read.", ("table",)))
+    latency = registry.register(
+        Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    )
+
+    rows.labels("recipes").inc(3)
+    rows.labels("recipes").inc()
+    latency.labels("/recipes").observe(0.05)
+    latency.labels("/recipes").observe(0.1)
+    latency.labels("/recipes").observe(5)
+
+    assert registry.render() == (
+        "# HELP rows_total Rows read.\n"
+        "# TYPE rows_total counter\n"
+        'rows_total{table="recipes"} 4\n'
+        "# HELP latency_seconds Latency.\n"
+        "# TYPE latency_seconds histogram\n"
+        'latency_seconds_bucket{route="/recipes",le="0.1"} 2\n'
+        'latency_seconds_bucket{route="/recipes",le="1"} 2\n'
+        'latency_seconds_bucket{route="/recipes",le="+Inf"} 3\n'
+        'latency_seconds_sum{route="/recipes"} 5.15\n'
+        'latency_seconds_count{route="/recipes"} 3\n'
+    )
+
+
+def test_labels_are_validated_and_escaped():
+    registry = Registry()
+    counter = registry.register(Counter("errors_total", "Errors.", ("message",)))
+    counter.labels('say "hi"\n').inc()
+
+    assert 'errors_total{message="say \\"hi\\"\\n"} 1' in registry.render()
+    with pytest.raises(ValueError):
+        counter.labels()
+    with pytest.raises(ValueError):
+        registry.register(Counter("errors_total", "Again."))
+
+
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+def test_metrics_endpoint_records_routes_stages_rows_and_caches(
+    mock_fetch_one, mock_fetch_all
+):
+    mock_fetch_one.return_value = {"id": "r1", "name": "Test Recipe", "portions": 4}
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+        {"recipe_id": "r1", "name": "Milk", "unit": "ml", "quantity": 200},
+    ]
+    before = client.get("/metrics").text
+
+    assert client.get("/ingredients?recipe_id=r1").status_code == 200
+    assert client.get("/ingredients?recipe_id=r1&desired_portions=2").status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = response.text
+
+    def delta(line: str) -> float:
+        return sample(after, line) - sample(before, line)
+
+    # Routes are labelled with their template, not the requested URL
+    route = 'recipe_api_request_seconds_count{method="GET",route="/ingredients",status="200"}'
+    assert delta(route) == 2
+
+    # The recipe is read once, then served from the recipe cache
+    stage = 'recipe_api_stage_seconds_count{operation="fetch_ingredients",stage="%s"}'
+    assert delta(stage % "query") == 1
+    assert delta(stage % "parse") == 1
+    assert delta(stage % "transform") == 2
+    assert delta(stage % "build") == 2
+    assert delta(stage % "serialize") == 2
+    rows = 'recipe_api_rows_read_total{operation="fetch_ingredients",table="%s"}'
+    assert delta(rows % "recipes") == 1
+    assert delta(rows % "ingredients") == 2
+
+    assert delta('recipe_api_cache_hits_total{cache="recipes"}') == 1
+    assert delta('recipe_api_cache_misses_total{cache="responses"}') == 2
+    assert 'recipe_api_cache_hit_ratio{cache="recipes"}' in after
+
+
+def test_unmatched_routes_share_one_label():
+    assert client.get("/no/such/route").status_code == 404
+    assert (
+        'recipe_api_request_seconds_count{method="GET",route="<unmatched>",status="404"}'
+        in client.get("/metrics").text
+    )
@@ -0,0 +1,71 @@
+import threading
+import pytest
+from unittest.mock import patch, AsyncMock
+from app.model.params import PaginationParams, RecipesRequest
+from app.services import recipe_service
+from app.services.cache_service import recipe_cache
+from app.services.recipe_service import fetch_recipes
+from app.utils.offload import Offloader
+
+
+def current_thread_name():
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_offloads_work_from_the_threshold():
+    offloader = Offloader("thread", workers=1, threshold=10)
+    try:
+        assert await offloader.run(9, current_thread_name) == "MainThread"
+        assert (await offloader.run(10, current_thread_name)).startswith("offload")
+        assert offloader.offloaded == 1
+    finally:
+        offloader.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_inline_mode_never_offloads():
+    offloader = Offloader("inline", threshold=0)
+    assert await offloader.run(10**6, current_thread_name) == "MainThread"
+
+
+def test_invalid_offloader_settings():
+    with pytest.raises(ValueError):
+        Offloader("process")
+    with pytest.raises(ValueError):
+        Offloader("thread", workers=0)
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_large_pages_are_processed_off_the_event_loop(
+    mock_fetch_all, monkeypatch
+):
+    offloader = Offloader("thread", workers=1, threshold=2)
+    monkeypatch.setattr(recipe_service, "offloader", offloader)
+    mock_fetch_all.side_effect = [
+        [
+            {"id": "r1", "name": "Pancakes", "portions": 4},
+            {"id": "r2", "name": "Waffles", "portions": 2},
+        ],
+        [
+            {"recipe_id": "r1", "name": "Flour", "unit": "g", "quantity": 200},
+            {"recipe_id": "r2", "name": "Milk", "unit": "ml", "quantity": 500},
+        ],
+    ]
+
+    try:
+        response = await fetch_recipes(
+            PaginationParams(size=5),
+            req=RecipesRequest(desired_portions=8, mass_unit="kg"),
+        )
+    finally:
+        offloader.shutdown()
+
+    # Parsed, transformed and built in the pool
+    assert offloader.offloaded == 3
+    assert [
+        (recipe.id, recipe.ingredients[0].quantity) for recipe in response.items
+    ] == [("r1", 0.4), ("r2", 2000)]
+    # The parsed records are still cached, untransformed
+    assert recipe_cache.get("r1").ingredients[0].quantity == 200
@@ -0,0 +1,87 @@
+import pytest
+import pytest_asyncio
+
+from app.database.database import create_database, create_sync_engine, metadata
+from app.database.recipe_import import import_recipes
+from app.model.params import FilterOptions, IngredientsRequest, PaginationParams
+from app.services import ingredient_service, recipe_service
+from app.services.ingredient_service import fetch_ingredients
+from app.services.recipe_service import fetch_recipes
+
+
+def make_recipe(recipe_id, name, ingredient="Flour"):
+    return {
+        "id": recipe_id,
+        "name": name,
+        "portions": 2,
+        "ingredients": [{"name": ingredient, "unit": "g", "quantity": 100}],
+    }
+
+
+@pytest_asyncio.fixture
+async def replica(tmp_path, monkeypatch):
+    """
+    Two SQLite files standing in for a primary and its replica. The services read from
+    the replica, which (as if replication lagged) only has some of the primary's data.
+    """
+    urls = {}
+    for name in ("primary", "replica"):
+        urls[name] = f"sqlite:///{tmp_path / name}.db"
+        engine = create_sync_engine(urls[name])
+        metadata.create_all(engine)
+        engine.dispose()
+
+    primary_engine = create_sync_engine(urls["primary"])
+    import_recipes(
+        [make_recipe("r1", "Pancakes"), make_recipe("r2", "Waffles")],
+        bind=primary_engine,
+    )
+    replica_engine = create_sync_engine(urls["replica"])
+    import_recipes([make_recipe("r1", "Pancakes")], bind=replica_engine)
+
+    read_database = create_database(urls["replica"])
+    await read_database.connect()
+    monkeypatch.setattr(recipe_service, "read_database", read_database)
+    monkeypatch.setattr(ingredient_service, "read_database", read_database)
+    yield replica_engine
+
+    await read_database.disconnect()
+    primary_engine.dispose()
+    replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_are_served_from_the_replica(replica):
+    response = await fetch_recipes(PaginationParams(size=10))
+    assert [recipe.id for recipe in response.items] == ["r1"]
+
+    ingredients = await fetch_ingredients(IngredientsRequest(recipe_id="r1"))
+    assert [ingredient.name for ingredient in ingredients] == ["Flour"]
+
+    # Once replicated, the primary's writes become visible
+    import_recipes([make_recipe("r2", "Waffles")], bind=replica)
+    response = await fetch_recipes(PaginationParams(size=10))
+    assert [recipe.id for recipe in response.items] == ["r1", "r2"]
+
+
+@pytest.mark.asyncio
+async def test_search_without_full_text_index(replica, monkeypatch):
+    monkeypatch.setattr(recipe_service, "full_text_search_enabled", lambda: False)
+    import_recipes(
+        [make_recipe("r2", "Blueberry Pancakes", "Blueberries")], bind=replica
+    )
+
+    async def search(query_string, search_ingredients=False):
+        response = await fetch_recipes(
+            PaginationParams(size=10),
+            FilterOptions(
+                queryString=query_string, search_ingredients=search_ingredients
+            ),
+        )
+        return [recipe.id for recipe in response.items]
+
+    assert await search("PANCAKE") == ["r1", "r2"]
+    assert await search("blue pan") == ["r2"]
+    assert await search("berries") == []
+    assert await search("berries", search_ingredients=True) == ["r2"]
+    assert await search("!!!") == []
@@ -0,0 +1,193 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from app.database.recipe_import import write_batch
+from app.model.params import CountMode, FilterOptions, PaginationParams
+from app.services.cache_service import (
+    count_cache,
+    invalidate_recipes,
+    recipes_count_key,
+)
+from app.services.recipe_service import count_recipes, fetch_recipes, get_total
+
+# Every other recipe has two ingredients
+RECIPES = [
+    {
+        "id": f"r{i}",
+        "name": f"Recipe {i}",
+        "portions": 2,
+        "ingredients": [
+            {"name": f"i{j}", "unit": "g", "quantity": 100}
+            for j in range(2 if i % 2 == 0 else 1)
+        ],
+    }
+    for i in range(10)
+]
+
+
+@pytest.fixture
+def engine(engine):
+    with engine.begin() as conn:
+        write_batch(conn, RECIPES)
+    return engine
+
+
+# Runs the reads of `count_recipes` on the test database
+def fetch_one_from(engine):
+    async def fetch_one(query):
+        with engine.connect() as conn:
+            return conn.execute(query).mappings().first()
+
+    return fetch_one
+
+
+def recipe_rows(count: int) -> list:
+    return [{"id": f"r{i}", "name": f"Recipe {i}", "portions": 2} for i in range(count)]
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_one", new_callable=AsyncMock)
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_full_page_has_next_and_counts_total(mock_fetch_all, mock_fetch_one):
+    mock_fetch_all.side_effect = [recipe_rows(3), []]
+    mock_fetch_one.return_value = {"total": 42}
+
+    response = await fetch_recipes(PaginationParams(size=2), None, None, None)
+
+    assert len(response.items) == 2
+    assert response.has_next
+    assert response.total == 42
+    assert not response.total_estimated
+    mock_fetch_one.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_one", new_callable=AsyncMock)
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_count_none_skips_the_total(mock_fetch_all, mock_fetch_one):
+    mock_fetch_all.side_effect = [recipe_rows(3), []]
+
+    pagination = PaginationParams(size=2, count=CountMode.NONE)
+    response = await fetch_recipes(pagination, None, None, None)
+
+    assert response.has_next
+    assert response.total is None
+    mock_fetch_one.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_one", new_callable=AsyncMock)
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_last_page_gives_the_total_without_counting(
+    mock_fetch_all, mock_fetch_one
+):
+    mock_fetch_all.side_effect = [recipe_rows(1), []]
+
+    response = await fetch_recipes(PaginationParams(page=3, size=2), None, None, None)
+
+    assert not response.has_next
+    assert response.total == 5
+    mock_fetch_one.assert_not_awaited()
+
+    # The first page then takes the total from the cache
+    mock_fetch_all.side_effect = [recipe_rows(3), []]
+    response = await fetch_recipes(PaginationParams(size=2), None, None, None)
+
+    assert response.total == 5
+    mock_fetch_one.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_one", new_callable=AsyncMock)
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_last_page_total_not_cached_across_invalidation(
+    mock_fetch_all, mock_fetch_one
+):
+    pages = iter([recipe_rows(1), []])
+
+    async def fetch_all(query):
+        # A write lands while the page is read
+        invalidate_recipes()
+        return next(pages)
+
+    mock_fetch_all.side_effect = fetch_all
+
+    response = await fetch_recipes(PaginationParams(page=3, size=2), None, None, None)
+
+    assert response.total == 5
+    assert count_cache.get(recipes_count_key(None)) is None
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_one", new_callable=AsyncMock)
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_totals_are_cached_until_invalidated(mock_fetch_all, mock_fetch_one):
+    mock_fetch_one.return_value = {"total": 42}
+    filter_opts = FilterOptions(min_ingredients=2)
+
+    for _ in range(2):
+        mock_fetch_all.side_effect = [recipe_rows(3), []]
+        response = await fetch_recipes(
+            PaginationParams(size=2), filter_opts, None, None
+        )
+        assert response.total == 42
+    mock_fetch_one.assert_awaited_once()
+
+    # An estimate takes the exact total as it is
+    mock_fetch_all.side_effect = [recipe_rows(3), []]
+    pagination = PaginationParams(size=2, count=CountMode.ESTIMATED)
+    response = await fetch_recipes(pagination, filter_opts, None, None)
+    assert (response.total, response.total_estimated) == (42, False)
+    mock_fetch_one.assert_awaited_once()
+
+    invalidate_recipes(["r1"])
+    mock_fetch_one.return_value = {"total": 41}
+    mock_fetch_all.side_effect = [recipe_rows(3), []]
+    response = await fetch_recipes(PaginationParams(size=2), filter_opts, None, None)
+    assert response.total == 41
+    assert mock_fetch_one.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_count_recipes(engine):
+    with patch(
+        "app.services.recipe_service.read_database.fetch_one",
+        new_callable=AsyncMock,
+        side_effect=fetch_one_from(engine),
+    ):
+        assert await count_recipes() == (10, False)
+        assert await count_recipes(FilterOptions(min_ingredients=2)) == (5, False)
+        # Fewer matches than the sample are counted exactly
+        assert await count_recipes(FilterOptions(min_ingredients=2), True) == (
+            5,
+            False,
+        )
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.COUNT_ESTIMATE_SAMPLE", 2)
+async def test_count_recipes_extrapolates_from_a_sample(engine):
+    with patch(
+        "app.services.recipe_service.read_database.fetch_one",
+        new_callable=AsyncMock,
+        side_effect=fetch_one_from(engine),
+    ) as mock_fetch_one:
+        # r0 and r2 match out of r0, r1 and r2, so two thirds of 10 recipes
+        assert await count_recipes(FilterOptions(min_ingredients=2), True) == (7, True)
+        # The sample, the recipes it spans and all recipes
+        assert mock_fetch_one.await_count == 3
+
+        # The number of recipes is counted once, then taken from the cache
+        await count_recipes(FilterOptions(max_ingredients=1), True)
+        assert mock_fetch_one.await_count == 5
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.COUNT_ESTIMATE_SAMPLE", 2)
+async def test_unfiltered_totals_are_exact(engine):
+    with patch(
+        "app.services.recipe_service.read_database.fetch_one",
+        new_callable=AsyncMock,
+        side_effect=fetch_one_from(engine),
+    ) as mock_fetch_one:
+        assert await get_total(None, CountMode.ESTIMATED) == (10, False)
+        mock_fetch_one.assert_awaited_once()
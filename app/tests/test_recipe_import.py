@@ -0,0 +1,163 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from app.database.recipe_import import (
+    import_recipes,
+    iter_json_objects,
+    summarize_ingredients,
+)
+from app.database.recipe_table import UNIT_FAMILY_BITS
+
+
+def make_recipe(recipe_id, name="Pancakes", portions=4, ingredients=None):
+    return {
+        "id": recipe_id,
+        "name": name,
+        "portions": portions,
+        "ingredients": (
+            ingredients
+            if ingredients is not None
+            else [
+                {"name": "Flour", "unit": "g", "quantity": 200},
+                {"name": "Milk", "unit": "ml", "quantity": 300},
+            ]
+        ),
+    }
+
+
+def read_ingredients(engine, recipe_id):
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT name, unit, quantity FROM ingredients "
+                "WHERE recipe_id = :id ORDER BY position"
+            ),
+            {"id": recipe_id},
+        ).fetchall()
+    return [tuple(row) for row in rows]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        json.dumps([make_recipe("r1"), make_recipe("r2"), make_recipe("r3")], indent=2),
+        "\n".join(json.dumps(make_recipe(f"r{i}")) for i in (1, 2, 3)) + "\n",
+    ],
+    ids=["json", "ndjson"],
+)
+def test_iter_json_objects_reads_incrementally(content):
+    # Small chunks so objects are split across reads
+    objects = list(iter_json_objects(io.StringIO(content), chunk_size=7))
+    assert [obj["id"] for obj in objects] == ["r1", "r2", "r3"]
+    assert objects[0] == make_recipe("r1")
+
+
+@pytest.mark.parametrize("content", ["", "[]", "  [ ]\n"])
+def test_iter_json_objects_empty(content):
+    assert list(iter_json_objects(io.StringIO(content))) == []
+
+
+@pytest.mark.parametrize("content", ['[{"id": "r1"}', '{"id": "r1"', "[1, 2]"])
+def test_iter_json_objects_invalid(content):
+    with pytest.raises(ValueError):
+        list(iter_json_objects(io.StringIO(content), chunk_size=4))
+
+
+def test_import_recipes_in_batches(engine):
+    recipes = [make_recipe(f"r{i}") for i in range(5)]
+
+    stats = import_recipes(recipes, bind=engine, batch_size=2)
+
+    assert (stats.recipes, stats.ingredients) == (5, 10)
+    assert stats.rows_per_second > 0
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM recipes")).scalar() == 5
+    assert read_ingredients(engine, "r4") == [("Flour", "g", 200), ("Milk", "ml", 300)]
+
+
+def test_import_recipes_upserts(engine):
+    import_recipes([make_recipe("r1"), make_recipe("r2")], bind=engine)
+
+    updated = make_recipe(
+        "r1",
+        name="Crepes",
+        portions=2,
+        ingredients=[{"name": "Eggs", "unit": "unit", "quantity": 3}],
+    )
+    import_recipes([updated, make_recipe("r3")], bind=engine)
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT id, name, portions FROM recipes ORDER BY id")
+        ).fetchall()
+        # The search index follows the updated names and ingredients
+        search = conn.execute(
+            text("SELECT name, ingredients FROM recipe_search WHERE recipe_id = 'r1'")
+        ).one()
+    assert [tuple(row) for row in rows] == [
+        ("r1", "Crepes", 2),
+        ("r2", "Pancakes", 4),
+        ("r3", "Pancakes", 4),
+    ]
+    assert read_ingredients(engine, "r1") == [("Eggs", "unit", 3)]
+    assert tuple(search) == ("Crepes", "Eggs")
+
+
+def test_summarize_ingredients_converts_to_base_units():
+    summary = summarize_ingredients(
+        [
+            {"name": "Flour", "unit": "kg", "quantity": 0.5},
+            {"name": "Butter", "unit": "oz", "quantity": 2},
+            {"name": "Milk", "unit": "l", "quantity": 0.25},
+            {"name": "Eggs", "unit": "unit", "quantity": 3},
+        ]
+    )
+
+    assert summary == {
+        "ingredient_count": 4,
+        "total_mass_g": 556.7,
+        "total_volume_ml": 250,
+        "unit_families": 7,
+    }
+    assert summarize_ingredients([])["unit_families"] == 0
+
+
+def test_import_recipes_updates_summaries_and_keeps_creation_time(engine):
+    import_recipes([make_recipe("r1")], bind=engine)
+    with engine.connect() as conn:
+        created_at = conn.execute(text("SELECT created_at FROM recipes")).scalar()
+
+    updated = make_recipe(
+        "r1", ingredients=[{"name": "Eggs", "unit": "unit", "quantity": 3}]
+    )
+    import_recipes([updated], bind=engine)
+
+    with engine.connect() as conn:
+        row = conn.execute(
+            text(
+                "SELECT ingredient_count, total_mass_g, total_volume_ml, "
+                "unit_families, created_at FROM recipes"
+            )
+        ).one()
+    assert tuple(row) == (1, 0, 0, UNIT_FAMILY_BITS["count"], created_at)
+
+
+def test_import_recipes_without_upsert_rejects_existing(engine):
+    import_recipes([make_recipe("r1")], bind=engine)
+    with pytest.raises(IntegrityError):
+        import_recipes([make_recipe("r1")], bind=engine, upsert=False)
+
+
+def test_import_recipes_invalid_recipe_keeps_earlier_batches(engine):
+    recipes = [make_recipe("r1"), make_recipe("r2"), make_recipe("r3", portions="x")]
+
+    with pytest.raises(ValueError, match="position 2"):
+        import_recipes(recipes, bind=engine, batch_size=2)
+
+    with engine.connect() as conn:
+        ids = conn.execute(text("SELECT id FROM recipes ORDER BY id")).scalars().all()
+    assert ids == ["r1", "r2"]
@@ -0,0 +1,111 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from sqlalchemy import select
+from app.database.ingredient_table import ingredient_table
+from app.database.recipe_search_table import build_match_query
+from app.database.recipe_table import recipe_table
+from app.model.params import FilterOptions, PaginationParams
+from app.services.recipe_service import fetch_recipes, search_matches
+
+
+@pytest.fixture
+def engine(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            recipe_table.insert(),
+            [
+                {"id": "r1", "name": "Grilled Chicken", "portions": 2},
+                {"id": "r2", "name": "Chocolate Cake", "portions": 8},
+            ],
+        )
+        conn.execute(
+            ingredient_table.insert(),
+            [
+                {
+                    "recipe_id": "r1",
+                    "position": 0,
+                    "name": "Chicken Breast",
+                    "unit": "g",
+                    "quantity": 300,
+                },
+                {
+                    "recipe_id": "r2",
+                    "position": 0,
+                    "name": "Cocoa Powder",
+                    "unit": "g",
+                    "quantity": 50,
+                },
+            ],
+        )
+    return engine
+
+
+def search(engine, query_string, include_ingredients=False):
+    query = select(search_matches.c.recipe_id).params(
+        fts_query=build_match_query(query_string, include_ingredients)
+    )
+    with engine.connect() as conn:
+        return sorted(row.recipe_id for row in conn.execute(query))
+
+
+def test_build_match_query():
+    assert build_match_query("Grill chick") == 'name : ("grill"* "chick"*)'
+    assert (
+        build_match_query("cocoa", include_ingredients=True)
+        == '{name ingredients} : ("cocoa"*)'
+    )
+    # FTS5 syntax typed by users is treated as plain words
+    assert build_match_query('cake" OR NOT') == 'name : ("cake"* "or"* "not"*)'
+    assert build_match_query("!!!") is None
+
+
+def test_search_matches_prefixes_of_every_word(engine):
+    assert search(engine, "chick") == ["r1"]
+    assert search(engine, "gri chi") == ["r1"]
+    assert search(engine, "chocolate chicken") == []
+
+
+def test_search_ingredients_only_when_requested(engine):
+    assert search(engine, "cocoa") == []
+    assert search(engine, "cocoa", include_ingredients=True) == ["r2"]
+
+
+def test_search_index_follows_writes(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            recipe_table.update()
+            .where(recipe_table.c.id == "r2")
+            .values(name="Mud Pie")
+        )
+        conn.execute(
+            ingredient_table.update()
+            .where(ingredient_table.c.recipe_id == "r1")
+            .values(name="Tofu")
+        )
+
+    assert search(engine, "chocolate") == []
+    assert search(engine, "mud") == ["r2"]
+    assert search(engine, "tofu", include_ingredients=True) == ["r1"]
+
+    with engine.begin() as conn:
+        conn.execute(ingredient_table.delete())
+        conn.execute(recipe_table.delete().where(recipe_table.c.id == "r1"))
+
+    assert search(engine, "grilled") == []
+    assert search(engine, "tofu", include_ingredients=True) == []
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_fetch_recipes_search_uses_full_text_index(mock_fetch_all):
+    mock_fetch_all.side_effect = [[], []]
+
+    await fetch_recipes(
+        PaginationParams(), FilterOptions(queryString="chick"), None, None
+    )
+
+    query = mock_fetch_all.await_args_list[0].args[0]
+    sql = str(query.compile(compile_kwargs={"literal_binds": True}))
+    assert "recipes_fts MATCH 'name : (\"chick\"*)'" in sql
+    assert "LIKE" not in sql
+    assert "ORDER BY matches.rank ASC, recipes.id ASC" in sql
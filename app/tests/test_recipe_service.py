@@ -1,7 +1,9 @@
 from pydantic import ValidationError
 import pytest
 from unittest.mock import patch, AsyncMock
+from fastapi import HTTPException
 from app.model.params import (
+    CountMode,
     PaginationParams,
     FilterOptions,
     SortOptions,
@@ -9,21 +11,24 @@ from app.model.params import (
     RecipesRequest,
 )
 from app.model.unit.unit import MassUnit, VolumeUnit
-from app.services.recipe_service import fetch_recipes
+from app.services.recipe_service import fetch_recipes, make_cursor, read_cursor
 
 
 @pytest.mark.asyncio
-@patch("app.services.recipe_service.database.fetch_all", new_callable=AsyncMock)
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
 async def test_fetch_recipes_returns_recipes(mock_fetch_all):
 
-    mock_fetch_all.return_value = [
+    recipe_rows = [
         {
             "id": "r1",
             "name": "Test Recipe",
             "portions": 4,
-            "ingredients": '[{"name": "Sugar", "quantity": 100, "unit": "g"}]',
         }
     ]
+    ingredient_rows = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+    ]
+    mock_fetch_all.side_effect = [recipe_rows, ingredient_rows]
 
     pagination = PaginationParams(page=1, size=5)
     filter_opts = FilterOptions(queryString=None)
@@ -32,7 +37,7 @@ async def test_fetch_recipes_returns_recipes(mock_fetch_all):
 
     response = await fetch_recipes(pagination, filter_opts, sort_opts, req)
 
-    mock_fetch_all.assert_awaited_once()
+    assert mock_fetch_all.await_count == 2
 
     assert response.page == 1
     assert response.size == 5
@@ -51,18 +56,21 @@ async def test_fetch_recipes_returns_recipes(mock_fetch_all):
 
 
 @pytest.mark.asyncio
-@patch("app.services.recipe_service.database.fetch_all", new_callable=AsyncMock)
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
 async def test_fetch_recipes_with_double_portion_and_mass_unit_conversion(
     mock_fetch_all,
 ):
-    mock_fetch_all.return_value = [
+    recipe_rows = [
         {
             "id": "r1",
             "name": "Test Recipe",
             "portions": 4,
-            "ingredients": '[{"name": "Sugar", "quantity": 100, "unit": "g"}]',
         }
     ]
+    ingredient_rows = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+    ]
+    mock_fetch_all.side_effect = [recipe_rows, ingredient_rows]
 
     pagination = PaginationParams()
     filter_opts = None
@@ -73,7 +81,7 @@ async def test_fetch_recipes_with_double_portion_and_mass_unit_conversion(
 
     response = await fetch_recipes(pagination, filter_opts, sort_opts, req)
 
-    mock_fetch_all.assert_awaited_once()
+    assert mock_fetch_all.await_count == 2
 
     recipe = response.items[0]
     assert recipe.portions == 8
@@ -85,18 +93,21 @@ async def test_fetch_recipes_with_double_portion_and_mass_unit_conversion(
 
 
 @pytest.mark.asyncio
-@patch("app.services.recipe_service.database.fetch_all", new_callable=AsyncMock)
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
 async def test_fetch_recipes_with_double_portion_and_volume_unit_conversion(
     mock_fetch_all,
 ):
-    mock_fetch_all.return_value = [
+    recipe_rows = [
         {
             "id": "r1",
             "name": "Test Recipe",
             "portions": 4,
-            "ingredients": '[{"name": "Sugar", "quantity": 100, "unit": "ml"}]',
         }
     ]
+    ingredient_rows = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "ml", "quantity": 100},
+    ]
+    mock_fetch_all.side_effect = [recipe_rows, ingredient_rows]
 
     pagination = PaginationParams()
     filter_opts = None
@@ -107,7 +118,7 @@ async def test_fetch_recipes_with_double_portion_and_volume_unit_conversion(
 
     response = await fetch_recipes(pagination, filter_opts, sort_opts, req)
 
-    mock_fetch_all.assert_awaited_once()
+    assert mock_fetch_all.await_count == 2
 
     recipe = response.items[0]
     assert recipe.portions == 8
@@ -119,17 +130,117 @@ async def test_fetch_recipes_with_double_portion_and_volume_unit_conversion(
 
 
 @pytest.mark.asyncio
-@patch("app.services.recipe_service.database.fetch_all", new_callable=AsyncMock)
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
 async def test_fetch_recipes_invalid_mass_unit(mock_fetch_all):
-    mock_fetch_all.return_value = [
+    recipe_rows = [
         {
             "id": "r1",
             "name": "Test Recipe",
             "portions": 4,
-            "ingredients": '[{"name": "Sugar", "quantity": 100, "unit": "g"}]',
         }
     ]
+    ingredient_rows = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+    ]
+    mock_fetch_all.side_effect = [recipe_rows, ingredient_rows]
 
     # Expect Pydantic ValidationError on invalid mass_unit at construction time
     with pytest.raises(ValidationError) as exc_info:
         RecipesRequest(mass_unit=VolumeUnit.MILLILITER)
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_fetch_recipes_full_page_returns_next_cursor(mock_fetch_all):
+    recipe_rows = [
+        {"id": "r1", "name": "Pancakes", "portions": 4},
+        {"id": "r2", "name": "Grilled Chicken", "portions": 6},
+        {"id": "r3", "name": "Omelette", "portions": 1},
+    ]
+    mock_fetch_all.side_effect = [recipe_rows, []]
+
+    pagination = PaginationParams(size=2, count=CountMode.NONE)
+    sort_opts = SortOptions(field="portions", order=SortOrder.DESC)
+
+    response = await fetch_recipes(pagination, None, sort_opts, None)
+
+    assert [recipe.id for recipe in response.items] == ["r1", "r2"]
+    assert response.has_next
+    assert response.next_cursor is not None
+    assert read_cursor(response.next_cursor, sort_opts) == [6, "r2"]
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_fetch_recipes_partial_page_has_no_next_cursor(mock_fetch_all):
+    recipe_rows = [{"id": "r1", "name": "Pancakes", "portions": 4}]
+    mock_fetch_all.side_effect = [recipe_rows, []]
+
+    response = await fetch_recipes(PaginationParams(size=2), None, None, None)
+
+    assert response.next_cursor is None
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_fetch_recipes_with_cursor_seeks_instead_of_offset(mock_fetch_all):
+    mock_fetch_all.side_effect = [[], []]
+    sort_opts = SortOptions(field="portions", order=SortOrder.ASC)
+    cursor = make_cursor({"id": "r2", "portions": 6}, sort_opts)
+
+    pagination = PaginationParams(page=3, size=2, cursor=cursor, count=CountMode.NONE)
+    await fetch_recipes(pagination, None, sort_opts, None)
+
+    query = mock_fetch_all.await_args_list[0].args[0]
+    sql = str(query.compile(compile_kwargs={"literal_binds": True}))
+    assert "OFFSET" not in sql
+    assert "LIMIT 3" in sql
+    assert "(recipes.portions, recipes.id) > (6, 'r2')" in sql
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_fetch_recipes_cursor_for_other_sort_rejected(mock_fetch_all):
+    cursor = make_cursor({"id": "r2", "portions": 6}, None)
+    sort_opts = SortOptions(field="portions", order=SortOrder.ASC)
+
+    with pytest.raises(HTTPException) as exc:
+        await fetch_recipes(PaginationParams(cursor=cursor), None, sort_opts, None)
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc:
+        await fetch_recipes(PaginationParams(cursor="not-a-cursor"), None, None, None)
+    assert exc.value.status_code == 400
+    mock_fetch_all.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_fetch_recipes_only_fetches_ingredients_of_uncached_recipes(
+    mock_fetch_all,
+):
+    recipe_rows = [
+        {"id": "r1", "name": "Pancakes", "portions": 4},
+        {"id": "r2", "name": "Grilled Chicken", "portions": 2},
+    ]
+    mock_fetch_all.side_effect = [
+        [recipe_rows[0]],
+        [{"recipe_id": "r1", "name": "Flour", "unit": "g", "quantity": 200}],
+        recipe_rows,
+        [{"recipe_id": "r2", "name": "Garlic", "unit": "g", "quantity": 15}],
+    ]
+
+    await fetch_recipes(
+        PaginationParams(), None, None, RecipesRequest(desired_portions=8)
+    )
+    response = await fetch_recipes(PaginationParams(), None, None, None)
+
+    assert mock_fetch_all.await_count == 4
+    ingredients_query = mock_fetch_all.await_args_list[3].args[0]
+    sql = str(ingredients_query.compile(compile_kwargs={"literal_binds": True}))
+    assert "IN ('r2')" in sql
+
+    # The cached recipe was not modified by the first request's reportion
+    assert response.items[0].portions == 4
+    assert response.items[0].ingredients[0].quantity == 200
+    assert response.items[1].ingredients[0].name == "Garlic"
@@ -0,0 +1,159 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from sqlalchemy import text
+from app.database.recipe_import import write_batch
+from app.model.params import FilterOptions, PaginationParams, SortOptions, SortOrder
+from app.services.recipe_service import SORT_FIELDS, get_recipes
+
+RECIPES = [
+    {"id": "r1", "name": "Waffles", "portions": 4, "ingredients": ["g"] * 3},
+    {"id": "r2", "name": "Apple Pie", "portions": 8, "ingredients": ["ml"] * 6},
+    {"id": "r3", "name": "Omelette", "portions": 1, "ingredients": ["unit"] * 2},
+    {"id": "r4", "name": "Apple Pie", "portions": 4, "ingredients": ["g", "ml", "kg"]},
+]
+
+
+@pytest.fixture
+def engine(engine):
+    with engine.begin() as conn:
+        recipes = [
+            {
+                **recipe,
+                "ingredients": [
+                    {"name": f"i{i}", "unit": unit, "quantity": 100}
+                    for i, unit in enumerate(recipe["ingredients"])
+                ],
+            }
+            for recipe in RECIPES
+        ]
+        for recipe in recipes:
+            write_batch(conn, [recipe])
+    return engine
+
+
+# Compiles the query `get_recipes` would run, without running it
+async def recipes_query(engine, *args) -> str:
+    with patch(
+        "app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock
+    ) as mock_fetch_all:
+        await get_recipes(*args)
+    query = mock_fetch_all.await_args.args[0]
+    return str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+
+
+def run(engine, sql: str) -> list:
+    with engine.connect() as conn:
+        return [row.id for row in conn.execute(text(sql))]
+
+
+def query_plan(engine, sql: str) -> str:
+    with engine.connect() as conn:
+        return " ".join(
+            row.detail for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "field, expected",
+    [
+        ("name", ["r2", "r4", "r3", "r1"]),
+        ("portions", ["r3", "r1", "r4", "r2"]),
+        ("ingredient_count", ["r3", "r1", "r4", "r2"]),
+        ("created_at", ["r1", "r2", "r3", "r4"]),
+    ],
+)
+async def test_sorts_break_ties_by_id(engine, field, expected):
+    pagination = PaginationParams(size=10)
+    ascending = SortOptions(field=field, order=SortOrder.ASC)
+    descending = SortOptions(field=field, order=SortOrder.DESC)
+
+    assert run(engine, await recipes_query(engine, pagination, None, ascending)) == (
+        expected
+    )
+    assert run(engine, await recipes_query(engine, pagination, None, descending)) == (
+        expected[::-1]
+    )
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_follow_the_sort(engine):
+    sort_opts = SortOptions(field="name", order=SortOrder.ASC)
+    sql = await recipes_query(
+        engine, PaginationParams(size=10), None, sort_opts, ["Apple Pie", "r2"]
+    )
+    assert run(engine, sql) == ["r4", "r3", "r1"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("field", SORT_FIELDS)
+@pytest.mark.parametrize("order", [SortOrder.ASC, SortOrder.DESC])
+@pytest.mark.parametrize("paging", ["offset", "cursor"])
+async def test_sorts_are_read_off_an_index(engine, field, order, paging):
+    after = [1, "r1"] if paging == "cursor" else None
+    sql = await recipes_query(
+        engine,
+        PaginationParams(page=2, size=2),
+        None,
+        SortOptions(field=field, order=order),
+        after,
+    )
+
+    plan = query_plan(engine, sql)
+    assert f"USING INDEX ix_recipes_{field}" in plan
+    assert "TEMP B-TREE" not in plan
+    if paging == "cursor":
+        # Seeks into the index past the cursor, on both columns
+        operator = ">" if order == SortOrder.ASC else "<"
+        assert (
+            f"SEARCH recipes USING INDEX ix_recipes_{field} "
+            f"(({field},id){operator}(?,?))"
+        ) in plan
+
+
+@pytest.mark.asyncio
+async def test_ingredient_filters_keep_the_sort_index(engine):
+    sql = await recipes_query(
+        engine,
+        PaginationParams(size=2),
+        FilterOptions(exclude_ingredients="i5"),
+        SortOptions(field="portions", order=SortOrder.DESC),
+    )
+
+    plan = query_plan(engine, sql)
+    assert "USING INDEX ix_recipes_portions" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "filter_opts, expected",
+    [
+        # r1: 300g, r2: 600ml, r3: 2 units, r4: 100.1kg and 100ml
+        (FilterOptions(max_total_mass_g=500), ["r1", "r2", "r3"]),
+        (FilterOptions(min_total_mass_g=1, max_total_mass_g=500), ["r1"]),
+        (FilterOptions(min_total_volume_ml=100), ["r2", "r4"]),
+        (FilterOptions(min_ingredients=3, max_ingredients=3), ["r1", "r4"]),
+        (FilterOptions(unit_family="count"), ["r3"]),
+        (FilterOptions(unit_family="volume", max_ingredients=3), ["r4"]),
+    ],
+)
+async def test_summary_filters(engine, filter_opts, expected):
+    sql = await recipes_query(engine, PaginationParams(size=10), filter_opts)
+    assert run(engine, sql) == expected
+
+
+@pytest.mark.asyncio
+async def test_summary_filters_and_sorts_never_read_the_ingredients(engine):
+    sql = await recipes_query(
+        engine,
+        PaginationParams(size=2),
+        FilterOptions(max_total_mass_g=500, unit_family="mass"),
+        SortOptions(field="total_mass_g", order=SortOrder.DESC),
+    )
+
+    plan = query_plan(engine, sql)
+    assert "SEARCH recipes USING INDEX ix_recipes_total_mass_g (total_mass_g<?)" in plan
+    assert "ingredients" not in plan
+    assert "TEMP B-TREE" not in plan
+    assert run(engine, sql) == ["r1"]
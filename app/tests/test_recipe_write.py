@@ -0,0 +1,182 @@
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.main import app
+from app.model.recipe.recipe import Recipe
+from app.model.record.record import RecipeRecord
+from app.services.cache_service import count_cache, recipe_cache, recipes_count_key
+from app.services.recipe_write_service import (
+    RecipeWrite,
+    merge_writes,
+    recipe_writer,
+    save_recipes,
+)
+from app.utils.group_commit import WriteQueueFull
+
+
+def make_recipe(recipe_id, name="Pancakes", ingredients=None) -> dict:
+    return {
+        "id": recipe_id,
+        "name": name,
+        "portions": 4,
+        "ingredients": (
+            ingredients
+            if ingredients is not None
+            else [
+                {"name": "Flour", "unit": "g", "quantity": 200},
+                {"name": "Milk", "unit": "ml", "quantity": 300},
+            ]
+        ),
+    }
+
+
+@pytest.fixture
+def engine(engine):
+    with patch("app.services.recipe_write_service.engine", engine):
+        yield engine
+
+
+def read_recipes(engine) -> list:
+    with engine.connect() as conn:
+        return [
+            tuple(row)
+            for row in conn.execute(
+                text("SELECT id, name, ingredient_count FROM recipes ORDER BY id")
+            )
+        ]
+
+
+def search(engine, word) -> list:
+    with engine.connect() as conn:
+        return [
+            row.recipe_id
+            for row in conn.execute(
+                text(
+                    "SELECT recipe_search.recipe_id FROM recipes_fts "
+                    "JOIN recipe_search ON recipe_search.id = recipes_fts.rowid "
+                    "WHERE recipes_fts MATCH :word"
+                ),
+                {"word": word},
+            )
+        ]
+
+
+def test_merge_writes():
+    r1, r2, r3 = ({"id": recipe_id} for recipe_id in ("r1", "r2", "r3"))
+    writes = [
+        RecipeWrite([r1], True),
+        RecipeWrite([r1, r2], True),
+        RecipeWrite([r3], False),
+        RecipeWrite([r2], False),
+        RecipeWrite([r2], False),
+        RecipeWrite([r3], True),
+    ]
+
+    assert merge_writes(writes) == [
+        ([r1, r1, r2], True),
+        ([r3, r2], False),
+        # Creating r2 twice must still fail, so it isn't merged away
+        ([r2], False),
+        ([r3], True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_save_recipes_creates_and_replaces(engine):
+    recipes = [Recipe(**make_recipe("r1")), Recipe(**make_recipe("r2", "Waffles"))]
+    assert await save_recipes(recipes, upsert=False) == 2
+    assert read_recipes(engine) == [("r1", "Pancakes", 2), ("r2", "Waffles", 2)]
+
+    updated = make_recipe(
+        "r1", "Crepes", [{"name": "Buckwheat", "unit": "kg", "quantity": 1}]
+    )
+    assert await save_recipes([Recipe(**updated)]) == 1
+    assert read_recipes(engine) == [("r1", "Crepes", 1), ("r2", "Waffles", 2)]
+
+    # The search index follows the writes
+    assert search(engine, "crepes") == ["r1"]
+    assert search(engine, "buckwheat") == ["r1"]
+    assert search(engine, "pancakes") == []
+    await recipe_writer.close()
+
+
+@pytest.mark.asyncio
+async def test_creating_an_existing_recipe_conflicts(engine):
+    await save_recipes([Recipe(**make_recipe("r1"))], upsert=False)
+
+    # Queued together, the conflicting write fails on its own
+    results = await asyncio.gather(
+        save_recipes([Recipe(**make_recipe("r1", "Crepes"))], upsert=False),
+        save_recipes([Recipe(**make_recipe("r2", "Waffles"))], upsert=False),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], HTTPException)
+    assert results[0].status_code == 409
+    assert results[1] == 1
+    assert read_recipes(engine) == [("r1", "Pancakes", 2), ("r2", "Waffles", 2)]
+    await recipe_writer.close()
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_the_caches(engine):
+    recipe_cache.set("r1", RecipeRecord("r1", "Stale", 1.0, ()))
+    recipe_cache.set("r2", RecipeRecord("r2", "Kept", 1.0, ()))
+    count_cache.set(recipes_count_key(), (0, False))
+
+    await save_recipes([Recipe(**make_recipe("r1"))])
+
+    assert recipe_cache.get("r1") is None
+    assert recipe_cache.get("r2") is not None
+    assert count_cache.get(recipes_count_key()) is None
+    await recipe_writer.close()
+
+
+@pytest.mark.asyncio
+async def test_full_write_queue_is_503():
+    with patch.object(
+        recipe_writer, "submit", new_callable=AsyncMock, side_effect=WriteQueueFull()
+    ):
+        with pytest.raises(HTTPException) as exc:
+            await save_recipes([Recipe(**make_recipe("r1"))])
+
+    assert exc.value.status_code == 503
+    assert exc.value.headers == {"Retry-After": "1"}
+
+
+@patch("app.main.disconnect_databases", new_callable=AsyncMock)
+@patch("app.main.connect_databases", new_callable=AsyncMock)
+@patch("app.main.create_schema")
+def test_write_endpoints(mock_create_schema, mock_connect, mock_disconnect, engine):
+    with TestClient(app) as client:
+        response = client.post("/recipes", json=make_recipe("r1"))
+        assert response.status_code == 201
+        assert response.json()["ingredients"][0] == {
+            "name": "Flour",
+            "unit": "g",
+            "quantity": 200,
+        }
+        assert client.post("/recipes", json=make_recipe("r1")).status_code == 409
+
+        response = client.put("/recipes", json=make_recipe("r1", "Crepes"))
+        assert response.status_code == 200
+
+        batch = {"items": [make_recipe("r2"), make_recipe("r3")]}
+        response = client.post("/recipes/batch", json=batch)
+        assert response.status_code == 201
+        assert response.json() == {"written": 2}
+        response = client.put("/recipes/batch", json=batch)
+        assert response.json() == {"written": 2}
+
+        invalid = make_recipe("r4", ingredients=[{"name": "Salt", "unit": "pinch"}])
+        assert client.post("/recipes", json=invalid).status_code == 422
+        assert client.put("/recipes/batch", json={"items": []}).status_code == 422
+
+    assert read_recipes(engine) == [
+        ("r1", "Crepes", 2),
+        ("r2", "Pancakes", 2),
+        ("r3", "Pancakes", 2),
+    ]
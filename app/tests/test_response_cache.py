@@ -0,0 +1,134 @@
+from unittest.mock import patch, AsyncMock
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from app.main import app
+from app.model.ingredient.ingredient import Ingredient
+from app.model.recipe.recipe import Recipe
+from app.model.shopping_list.shopping_list import ShoppingList
+from app.model.unit.unit import CountUnit, MassUnit, VolumeUnit
+from app.services.cache_service import invalidate_recipes
+from app.utils.pagination import PaginatedResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.utils.response import etag_matches, render_json
+
+client = TestClient(app)
+
+
+def test_etag_matches():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"xyz", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"xyz"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_render_json_matches_fastapi_serialization():
+    page = PaginatedResponse[Recipe](
+        page=1,
+        size=2,
+        items=[
+            Recipe(
+                id="r1",
+                name="Crème brûlée",
+                portions=4,
+                ingredients=[
+                    Ingredient(name="Sugar", unit=MassUnit.GRAM, quantity=100),
+                    Ingredient(name="Cream", unit=VolumeUnit.LITER, quantity=0.5),
+                    Ingredient(name="Eggs", unit=CountUnit.UNIT, quantity=4),
+                ],
+            )
+        ],
+        next_cursor="abc",
+    )
+    for content in (page, page.items, {"message": "Hello World"}):
+        assert render_json(content) == JSONResponse(jsonable_encoder(content)).body
+
+
+@patch("app.main.fetch_shopping_list", new_callable=AsyncMock)
+def test_models_returned_directly_are_serialized(mock_fetch_shopping_list):
+    mock_fetch_shopping_list.return_value = ShoppingList(
+        items=[Ingredient(name="Milk", unit=VolumeUnit.MILLILITER, quantity=250)]
+    )
+
+    response = client.post("/shopping-list", json={"items": [{"recipe_id": "r1"}]})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {
+        "items": [{"name": "Milk", "unit": "ml", "quantity": 250.0}]
+    }
+
+
+@patch("app.main.fetch_ingredients", new_callable=AsyncMock)
+def test_ingredients_responses_are_cached_with_etag(mock_fetch_ingredients):
+    mock_fetch_ingredients.return_value = [
+        Ingredient(name="Sugar", unit=MassUnit.KILOGRAM, quantity=0.2)
+    ]
+
+    first = client.get("/ingredients?recipe_id=r1&desired_portions=8&mass_unit=kg")
+    assert first.status_code == 200
+    assert first.json() == [{"name": "Sugar", "unit": "kg", "quantity": 0.2}]
+    etag = first.headers["etag"]
+
+    # Same parameters: served from the cache
+    second = client.get("/ingredients?recipe_id=r1&mass_unit=kg&desired_portions=8.0")
+    assert second.content == first.content
+    assert second.headers["etag"] == etag
+
+    # Repeat clients get a 304 without a body
+    not_modified = client.get(
+        "/ingredients?recipe_id=r1&desired_portions=8&mass_unit=kg",
+        headers={"If-None-Match": etag},
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    mock_fetch_ingredients.assert_awaited_once()
+
+    # Different parameters are cached separately
+    client.get("/ingredients?recipe_id=r1")
+    assert mock_fetch_ingredients.await_count == 2
+
+
+@patch("app.main.fetch_ingredients", new_callable=AsyncMock)
+def test_ingredients_responses_invalidated_when_recipe_changes(
+    mock_fetch_ingredients,
+):
+    mock_fetch_ingredients.return_value = [
+        Ingredient(name="Sugar", unit=MassUnit.GRAM, quantity=100)
+    ]
+    client.get("/ingredients?recipe_id=r1")
+    client.get("/ingredients?recipe_id=r2")
+
+    invalidate_recipes(["r2"])
+    mock_fetch_ingredients.return_value = [
+        Ingredient(name="Sugar", unit=MassUnit.GRAM, quantity=150)
+    ]
+
+    assert client.get("/ingredients?recipe_id=r1").json()[0]["quantity"] == 100
+    assert client.get("/ingredients?recipe_id=r2").json()[0]["quantity"] == 150
+    assert mock_fetch_ingredients.await_count == 3
+
+
+@patch("app.main.fetch_ingredients", new_callable=AsyncMock)
+def test_ingredients_errors_are_not_cached(mock_fetch_ingredients):
+    mock_fetch_ingredients.side_effect = HTTPException(
+        status_code=404, detail="Recipe not found"
+    )
+
+    assert client.get("/ingredients?recipe_id=missing").status_code == 404
+    assert client.get("/ingredients?recipe_id=missing").status_code == 404
+    assert mock_fetch_ingredients.await_count == 2
+
+
+@patch("app.main.fetch_recipes", new_callable=AsyncMock)
+def test_recipes_responses_invalidated_by_any_recipe_change(mock_fetch_recipes):
+    mock_fetch_recipes.return_value = PaginatedResponse[Recipe](
+        page=1, size=5, items=[]
+    )
+    client.get("/recipes?queryString=cake")
+    client.get("/recipes?queryString=cake")
+    assert mock_fetch_recipes.await_count == 1
+
+    invalidate_recipes(["r9"])
+    client.get("/recipes?queryString=cake")
+    assert mock_fetch_recipes.await_count == 2
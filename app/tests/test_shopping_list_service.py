@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi import HTTPException
+from app.model.params import ShoppingListItem, ShoppingListRequest
+from app.model.unit.unit import CountUnit, MassUnit
+from app.services.shopping_list_service import fetch_shopping_list
+
+recipe_rows = [
+    {"id": "r1", "name": "Pancakes", "portions": 4},
+    {"id": "r2", "name": "Crepes", "portions": 2},
+]
+ingredient_rows = [
+    {"recipe_id": "r1", "name": "Flour", "unit": "g", "quantity": 200},
+    {"recipe_id": "r1", "name": "Eggs", "unit": "unit", "quantity": 2},
+    {"recipe_id": "r2", "name": "Flour", "unit": "kg", "quantity": 0.1},
+]
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+async def test_fetch_shopping_list_sums_ingredients(mock_fetch_all):
+    mock_fetch_all.side_effect = [recipe_rows, ingredient_rows]
+
+    req = ShoppingListRequest(
+        items=[
+            ShoppingListItem(recipe_id="r1", desired_portions=8),
+            ShoppingListItem(recipe_id="r2"),
+            ShoppingListItem(recipe_id="r1"),
+        ],
+        mass_unit="kg",
+    )
+    shopping_list = await fetch_shopping_list(req)
+
+    assert mock_fetch_all.await_count == 2
+    flour, eggs = shopping_list.items
+    # 400g + 100g + 200g
+    assert (flour.name, flour.quantity, flour.unit) == ("Flour", 0.7, MassUnit.KILOGRAM)
+    assert (eggs.name, eggs.quantity, eggs.unit) == ("Eggs", 6, CountUnit.UNIT)
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+async def test_fetch_shopping_list_missing_recipe(mock_fetch_all):
+    mock_fetch_all.side_effect = [recipe_rows[:1], ingredient_rows[:2]]
+
+    req = ShoppingListRequest(
+        items=[ShoppingListItem(recipe_id="r1"), ShoppingListItem(recipe_id="r9")]
+    )
+    with pytest.raises(HTTPException) as exc:
+        await fetch_shopping_list(req)
+    assert exc.value.status_code == 404
+    assert exc.value.detail == "Recipe not found: r9"
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+async def test_fetch_shopping_list_invalid_portions(mock_fetch_all):
+    mock_fetch_all.side_effect = [recipe_rows[:1], ingredient_rows[:2]]
+
+    req = ShoppingListRequest(
+        items=[ShoppingListItem(recipe_id="r1", desired_portions=0)]
+    )
+    with pytest.raises(HTTPException) as exc:
+        await fetch_shopping_list(req)
+    assert exc.value.status_code == 400
@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi import HTTPException
+from app.model.params import IngredientsRequest, PaginationParams, RecipesRequest
+from app.services.cache_service import invalidate_recipes, recipe_flight
+from app.services.ingredient_service import fetch_ingredients
+from app.services.recipe_service import fetch_recipes
+from app.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def produce(value):
+        calls.append(value)
+        await release.wait()
+        return value
+
+    callers = [
+        asyncio.ensure_future(flight.do("a", lambda: produce(1))),
+        asyncio.ensure_future(flight.do("a", lambda: produce(2))),
+        asyncio.ensure_future(flight.do("b", lambda: produce(3))),
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*callers) == [1, 1, 3]
+    assert calls == [1, 3]
+    assert flight.stats() == {"calls": 2, "shared": 1, "in_flight": 0}
+
+    # Completed calls are forgotten, not cached
+    assert await flight.do("a", lambda: produce(4)) == 4
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_remembered():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise HTTPException(status_code=404, detail="Recipe not found")
+
+    results = await asyncio.gather(
+        flight.do("a", fail), flight.do("a", fail), return_exceptions=True
+    )
+    assert [result.status_code for result in results] == [404, 404]
+    assert flight.calls == 1
+
+    async def succeed():
+        return "ok"
+
+    assert await flight.do("a", succeed) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def produce():
+        await release.wait()
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("a", produce))
+    second = asyncio.ensure_future(flight.do("a", produce))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_concurrent_ingredient_requests_read_the_recipe_once(
+    mock_fetch_one, mock_fetch_all
+):
+    mock_fetch_one.return_value = {"id": "r1", "name": "Test Recipe", "portions": 4}
+    mock_fetch_all.return_value = [
+        {"recipe_id": "r1", "name": "Sugar", "unit": "g", "quantity": 100},
+    ]
+
+    results = await asyncio.gather(
+        fetch_ingredients(IngredientsRequest(recipe_id="r1")),
+        fetch_ingredients(IngredientsRequest(recipe_id="r1", desired_portions=8)),
+        fetch_ingredients(IngredientsRequest(recipe_id="r1", mass_unit="kg")),
+    )
+
+    mock_fetch_one.assert_awaited_once()
+    mock_fetch_all.assert_awaited_once()
+    # Each caller applied its own adjustments to the shared recipe
+    assert [(i[0].quantity, i[0].unit.value[0]) for i in results] == [
+        (100, "g"),
+        (200, "g"),
+        (0.1, "kg"),
+    ]
+
+
+@pytest.mark.asyncio
+@patch("app.services.recipe_service.read_database.fetch_all", new_callable=AsyncMock)
+async def test_concurrent_recipes_requests_read_the_page_once(mock_fetch_all):
+    mock_fetch_all.side_effect = [
+        [{"id": "r1", "name": "Pancakes", "portions": 4}],
+        [{"recipe_id": "r1", "name": "Flour", "unit": "g", "quantity": 200}],
+    ]
+
+    pages = await asyncio.gather(
+        fetch_recipes(PaginationParams(size=5)),
+        fetch_recipes(PaginationParams(size=5), req=RecipesRequest(desired_portions=2)),
+    )
+
+    assert mock_fetch_all.await_count == 2
+    assert [page.items[0].ingredients[0].quantity for page in pages] == [200, 100]
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ingredient_service.read_database.fetch_all", new_callable=AsyncMock
+)
+@patch(
+    "app.services.ingredient_service.read_database.fetch_one", new_callable=AsyncMock
+)
+async def test_reads_started_before_an_invalidation_are_not_joined(
+    mock_fetch_one, mock_fetch_all
+):
+    mock_fetch_one.return_value = {"id": "r1", "name": "Test Recipe", "portions": 4}
+    mock_fetch_all.return_value = []
+    shared = recipe_flight.shared
+
+    before = asyncio.ensure_future(
+        fetch_ingredients(IngredientsRequest(recipe_id="r1"))
+    )
+    await asyncio.sleep(0)
+    invalidate_recipes(["r1"])
+    after = asyncio.ensure_future(fetch_ingredients(IngredientsRequest(recipe_id="r1")))
+    await asyncio.gather(before, after)
+
+    assert mock_fetch_one.await_count == 2
+    assert recipe_flight.shared == shared
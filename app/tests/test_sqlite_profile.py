@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.database.database import create_database, create_sync_engine
+from app.database.sqlite_profile import PROFILES, SQLiteProfile, get_profile
+
+
+def test_profile_statements_skip_unset_pragmas():
+    profile = SQLiteProfile(journal_mode="WAL", busy_timeout=100)
+    assert profile.statements() == [
+        "PRAGMA busy_timeout = 100",
+        "PRAGMA journal_mode = WAL",
+    ]
+    assert PROFILES["default"].statements() == []
+
+
+def test_get_profile_env_overrides(monkeypatch):
+    monkeypatch.setenv("SQLITE_MMAP_SIZE", "0")
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "FULL")
+
+    profile = get_profile("performance")
+
+    assert profile.mmap_size == 0
+    assert profile.synchronous == "FULL"
+    assert profile.journal_mode == "WAL"
+    assert PROFILES["performance"].mmap_size > 0
+
+    with pytest.raises(ValueError, match="Unknown SQLite profile"):
+        get_profile("fastest")
+
+
+@pytest.mark.asyncio
+async def test_pooled_connections_are_tuned_and_reused(tmp_path):
+    database = create_database(
+        f"sqlite:///{tmp_path / 'pool.db'}", PROFILES["performance"], pool_size=2
+    )
+    await database.connect()
+    try:
+        assert await database.fetch_val("PRAGMA journal_mode") == "wal"
+        assert await database.fetch_val("PRAGMA synchronous") == 1  # NORMAL
+        assert await database.fetch_val("PRAGMA busy_timeout") == 5000
+        assert await database.fetch_val("PRAGMA temp_store") == 2  # MEMORY
+
+        pool = database._backend._pool
+        assert len(pool._idle) == 1
+        await database.fetch_val("SELECT 1")
+        assert len(pool._idle) == 1
+    finally:
+        await database.disconnect()
+    assert pool._idle == []
+
+
+@pytest.mark.asyncio
+async def test_pool_size_bounds_open_connections(tmp_path):
+    database = create_database(
+        f"sqlite:///{tmp_path / 'pool.db'}", PROFILES["performance"], pool_size=2
+    )
+    await database.connect()
+    try:
+        pool = database._backend._pool
+        first, second = await pool.acquire(), await pool.acquire()
+
+        third = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0.05)
+        assert not third.done()
+
+        await pool.release(first)
+        assert await asyncio.wait_for(third, 1) is first
+        await pool.release(second)
+        await pool.release(first)
+    finally:
+        await database.disconnect()
+
+
+def test_sync_engine_applies_profile(tmp_path):
+    engine = create_sync_engine(
+        f"sqlite:///{tmp_path / 'sync.db'}", PROFILES["performance"], pool_size=2
+    )
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -64 * 1024
+    engine.dispose()
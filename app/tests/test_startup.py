@@ -0,0 +1,52 @@
+import subprocess
+import sys
+import threading
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from app import config
+from app.main import app
+
+
+def test_importing_the_app_does_not_load_numpy():
+    # NumPy is only needed to transform recipes, so it is imported on first use
+    output = subprocess.run(
+        [sys.executable, "-c", "import sys, app.main; print('numpy' in sys.modules)"],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    assert output.strip() == "False"
+
+
+@patch("app.main.disconnect_databases", new_callable=AsyncMock)
+@patch("app.main.connect_databases", new_callable=AsyncMock)
+def test_schema_check_runs_off_the_event_loop(mock_connect, mock_disconnect):
+    threads = []
+    with patch(
+        "app.main.create_schema",
+        side_effect=lambda: threads.append(threading.current_thread()),
+    ):
+        with TestClient(app) as client:
+            loop_thread = client.portal.call(threading.current_thread)
+
+    assert len(threads) == 1
+    assert threads[0] is not loop_thread
+    mock_connect.assert_awaited_once()
+    mock_disconnect.assert_awaited_once()
+
+
+@patch("app.main.disconnect_databases", new_callable=AsyncMock)
+@patch("app.main.connect_databases", new_callable=AsyncMock)
+@patch("app.main.create_schema")
+def test_schema_check_can_be_skipped(
+    mock_create_schema, mock_connect, mock_disconnect, monkeypatch
+):
+    monkeypatch.setattr(config, "SKIP_SCHEMA_CHECK", True)
+
+    with TestClient(app):
+        pass
+
+    mock_create_schema.assert_not_called()
+    mock_connect.assert_awaited_once()
@@ -0,0 +1,93 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+"""
+A bounded, in-process cache with least-recently-used eviction and an optional time-to-live.
+
+Attributes:
+    maxsize (int): The maximum number of entries. The least recently used entry is evicted
+        when a new entry would exceed it.
+    ttl (Optional[float]): Seconds an entry stays valid after it is set. None means entries
+        only leave the cache through eviction or invalidation.
+    hits (int): The number of `get` calls that found a valid entry.
+    misses (int): The number of `get` calls that did not.
+    generation (int): Incremented by every invalidation. A value computed from data read
+        before an invalidation should only be cached if the generation is unchanged.
+
+Methods:
+    get(key): Returns the cached value, or None if it is missing or has expired.
+    set(key, value): Caches a value, evicting the least recently used entry if full.
+    invalidate(keys): Removes the given keys.
+    invalidate_where(predicate): Removes every key the predicate returns True for.
+    clear(): Removes every entry.
+    stats(): Returns the hit/miss counters and current size.
+
+Not thread-safe; it is meant to be used from the event loop.
+"""
+
+
+class LRUCache(Generic[K, V]):
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be greater than zero.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._timer = timer
+        self._entries: "OrderedDict[K, Tuple[Optional[float], V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > self._timer():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: K, value: V) -> None:
+        expires_at = None if self.ttl is None else self._timer() + self.ttl
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, keys: Iterable[K]) -> None:
+        self.generation += 1
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> None:
+        self.invalidate([key for key in self._entries if predicate(key)])
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
@@ -0,0 +1,193 @@
+import asyncio
+from collections import deque
+from typing import Callable, Deque, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class WriteQueueFull(Exception):
+    pass
+
+
+"""
+Applies writes submitted concurrently in batches ("group commit"), so many small writes
+share one transaction, and one sync to disk, instead of each paying for its own.
+
+Writes are queued with a weight (e.g. their number of rows). A single flusher task hands
+everything pending, up to `max_batch` of weight, to `flush` in a thread, which applies
+the whole batch at once and returns one result per write. Writes submitted while a
+flush runs wait for the next one, so batches grow with the load without adding any
+delay when it is light.
+
+If a batch fails, each of its writes is flushed again on its own, so a bad write only
+fails its own caller. `on_flush` is then called on the event loop with the writes that
+were applied, before their callers get their results (e.g. to invalidate caches).
+
+The queue is bounded: writes wait up to `timeout` seconds for room once `capacity` of
+weight is pending (queued or being flushed), then fail with WriteQueueFull, so callers
+can push back on their clients instead of buffering without limit.
+
+Attributes:
+    capacity (int): The weight of writes that can be pending at once.
+    max_batch (int): The weight of writes flushed together at most. A heavier write is
+        flushed on its own.
+    timeout (float): How long a write waits for room in a full queue.
+    flushes (int): The number of batches flushed.
+    writes (int): The number of writes applied.
+    rejected (int): The number of writes that found the queue full.
+
+Methods:
+    submit(write, weight): Queues the write and returns its result once it is flushed,
+        or raises the exception it failed with. A caller cancelled meanwhile doesn't
+        cancel its write.
+    close(): Flushes the pending writes and stops the flusher. A later `submit` starts
+        a new one.
+    stats(): Returns the counters and the weight of the pending writes.
+
+Raises:
+    ValueError: If the capacity or the batch size is less than 1.
+"""
+
+
+class GroupCommitter(Generic[T, R]):
+    def __init__(
+        self,
+        flush: Callable[[List[T]], List[R]],
+        capacity: int = 10000,
+        max_batch: int = 1000,
+        timeout: float = 1.0,
+        on_flush: Optional[Callable[[List[T]], None]] = None,
+    ):
+        if capacity < 1 or max_batch < 1:
+            raise ValueError("Write queue capacity and batch size must be at least 1.")
+        self.capacity = capacity
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.flushes = 0
+        self.writes = 0
+        self.rejected = 0
+        self._flush = flush
+        self._on_flush = on_flush
+        self._queue: Deque[Tuple[T, int, "asyncio.Future[R]"]] = deque()
+        self._pending = 0
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._room: Optional[asyncio.Condition] = None
+
+    async def submit(self, write: T, weight: int = 1) -> R:
+        if not self._running():
+            self._start()
+        # A write heavier than the queue only has to wait for it to be empty
+        weight = min(weight, self.capacity)
+        if self._pending + weight > self.capacity:
+            try:
+                async with self._room:
+                    await asyncio.wait_for(
+                        self._room.wait_for(
+                            lambda: self._pending + weight <= self.capacity
+                        ),
+                        self.timeout,
+                    )
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise WriteQueueFull(
+                    f"The write queue is full ({self._pending} pending)."
+                ) from None
+
+        future = asyncio.get_running_loop().create_future()
+        # Marks the exception as retrieved, in case the caller was cancelled
+        future.add_done_callback(lambda future: future.exception())
+        self._queue.append((write, weight, future))
+        self._pending += weight
+        self._wakeup.set()
+        return await asyncio.shield(future)
+
+    def _running(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self._task.get_loop() is asyncio.get_running_loop()
+        )
+
+    def _start(self) -> None:
+        # Started on first use, on the running loop. Writes queued on another loop
+        # (which has stopped) can never be flushed, and are dropped.
+        self._queue.clear()
+        self._pending = 0
+        self._wakeup = asyncio.Event()
+        self._room = asyncio.Condition()
+        self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._queue:
+                batch = [self._queue.popleft()]
+                weight = batch[0][1]
+                while self._queue and weight + self._queue[0][1] <= self.max_batch:
+                    batch.append(self._queue.popleft())
+                    weight += batch[-1][1]
+                await self._flush_batch(batch)
+
+                self._pending -= weight
+                async with self._room:
+                    self._room.notify_all()
+
+    async def _flush_batch(self, batch: List[Tuple[T, int, "asyncio.Future[R]"]]):
+        writes = [write for write, _, _ in batch]
+        try:
+            outcomes = [
+                (result, None)
+                for result in await asyncio.to_thread(self._flush, writes)
+            ]
+        except Exception as e:
+            if len(writes) == 1:
+                outcomes = [(None, e)]
+            else:
+                outcomes = []
+                for write in writes:
+                    try:
+                        [result] = await asyncio.to_thread(self._flush, [write])
+                        outcomes.append((result, None))
+                    except Exception as error:
+                        outcomes.append((None, error))
+
+        applied = [
+            write for write, (_, error) in zip(writes, outcomes) if error is None
+        ]
+        self.flushes += 1
+        self.writes += len(applied)
+        if applied and self._on_flush is not None:
+            self._on_flush(applied)
+
+        for (_, _, future), (result, error) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    async def close(self) -> None:
+        if not self._running():
+            self._task = None
+            return
+        task = self._task
+        async with self._room:
+            await self._room.wait_for(lambda: not self._pending)
+        self._task = None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "flushes": self.flushes,
+            "writes": self.writes,
+            "rejected": self.rejected,
+            "pending": self._pending,
+        }
@@ -0,0 +1,332 @@
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# File containing a minimal, in-process metrics library rendering the Prometheus text
+# exposition format (served by `/metrics`), and the metrics recorded by the API
+#   -> Counter / Histogram: label values are resolved to a child once per label set,
+#      so recording a value is a dict lookup and an addition.
+#   -> CallbackMetric: values computed only when the metrics are scraped, e.g. the
+#      cache counters that are already kept by LRUCache.
+#   -> MetricsMiddleware: records the latency of every request by route.
+#
+# Like the caches, metrics are not thread-safe; they are meant to be updated from the
+# event loop.
+
+# Histogram buckets (in seconds) suited to request latencies
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Histogram buckets (in seconds) suited to the stages of a request, which mostly take
+# well under a millisecond
+STAGE_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+"""
+The base of every metric: its name, help text and label names, and the children
+holding the values of each set of label values.
+
+Methods:
+    labels(*values): Returns the child for the given label values, creating it on
+        first use. Callers on hot paths should keep the child rather than looking it
+        up on every call.
+    render(): Returns the metric in the Prometheus text exposition format.
+"""
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        if len(values) != len(self.labelnames):
+            raise ValueError(
+                f"Expected {len(self.labelnames)} label values for {self.name}, "
+                f"got {len(values)}"
+            )
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[Tuple[str, Sequence[str], Sequence[str], float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for suffix, names, values, value in self._samples():
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(names, values)} "
+                f"{_format_value(value)}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+"""
+A value that only goes up, e.g. the number of rows read.
+"""
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def _samples(self):
+        for values, child in self._children.items():
+            yield "", self.labelnames, values, child.value
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: "_HistogramChild"):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # One count per bucket, plus one for values above the largest bound. They are
+        # made cumulative when rendered.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+
+"""
+Counts observed values (e.g. durations in seconds) into buckets, and keeps their sum.
+
+Methods:
+    labels(*values).observe(value): Records a value.
+    labels(*values).time(): A context manager recording the seconds spent inside it.
+"""
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def _samples(self):
+        names = self.labelnames + ("le",)
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                yield "_bucket", names, values + (_format_value(bound),), cumulative
+            yield "_sum", self.labelnames, values, child.sum
+            yield "_count", self.labelnames, values, cumulative
+
+
+"""
+A metric whose values are read from `callback` when the metrics are rendered, instead
+of being recorded as they change. The callback returns (label values, value) pairs.
+"""
+
+
+class CallbackMetric(Metric):
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Iterable[Tuple[Sequence[str], float]]],
+        metric_type: str = "gauge",
+    ):
+        super().__init__(name, help, labelnames)
+        self.type = metric_type
+        self._callback = callback
+
+    def labels(self, *values: str):
+        raise TypeError(f"{self.name} is computed when rendered")
+
+    def _samples(self):
+        for values, value in self._callback():
+            yield "", self.labelnames, tuple(values), value
+
+
+"""
+The collection of metrics served by `/metrics`.
+
+Methods:
+    register(metric): Adds a metric and returns it.
+    render(): Returns every metric in the Prometheus text exposition format.
+"""
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        if any(existing.name == metric.name for existing in self._metrics):
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "".join(metric.render() for metric in self._metrics)
+
+
+"""
+ASGI middleware recording the latency of every HTTP request in `histogram`, labelled
+with the method, the route template (e.g. "/recipes", rather than the requested path,
+so the number of label sets stays bounded) and the response status.
+
+The latency runs until the response is fully sent, so streamed responses (e.g. the
+export) are timed to their last chunk. Requests that fail with an exception are recorded
+with status 500.
+"""
+
+
+class MetricsMiddleware:
+    def __init__(self, app, histogram: Histogram):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            self.histogram.labels(
+                scope["method"],
+                getattr(route, "path", "<unmatched>"),
+                str(status),
+            ).observe(time.perf_counter() - start)
+
+
+# The metrics recorded by the API
+
+registry = Registry()
+
+request_seconds: Histogram = registry.register(
+    Histogram(
+        "recipe_api_request_seconds",
+        "Latency of HTTP requests, by route.",
+        ("method", "route", "status"),
+        LATENCY_BUCKETS,
+    )
+)
+
+stage_seconds: Histogram = registry.register(
+    Histogram(
+        "recipe_api_stage_seconds",
+        "Time spent in each stage of a service call: query, parse, transform, serialize.",
+        ("operation", "stage"),
+        STAGE_BUCKETS,
+    )
+)
+
+rows_read: Counter = registry.register(
+    Counter(
+        "recipe_api_rows_read_total",
+        "Rows read from the database by service calls, by table.",
+        ("operation", "table"),
+    )
+)
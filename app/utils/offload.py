@@ -0,0 +1,70 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+OFFLOAD_MODES = ("inline", "thread")
+
+"""
+Runs CPU-bound functions (e.g. parsing and transforming a large page of recipes) in a
+thread pool instead of on the event loop, when the work is large enough to be worth it.
+
+Python threads share the GIL, so this doesn't make a large page any faster. It keeps
+the event loop responsive while the page is processed: the loop gets the GIL back at
+every switch interval (5ms by default) and serves other requests in between, instead of
+waiting for the whole page. Small work runs inline, where handing it to a thread would
+cost more than it saves.
+
+Attributes:
+    mode (str): "thread" to offload work of at least `threshold`, or "inline" to never
+        offload.
+    workers (int): The number of threads in the pool.
+    threshold (int): The weight (e.g. number of ingredients) from which work is offloaded.
+
+Methods:
+    run(weight, func, *args): Calls func(*args), in the pool if `weight` reaches the
+        threshold. Offloaded functions must not touch the caches or the metrics, which are
+        not thread-safe.
+    shutdown(): Stops the pool's threads. A later `run` starts a new pool.
+
+Raises:
+    ValueError: If the mode is unknown or the number of workers is less than 1.
+"""
+
+
+class Offloader:
+    def __init__(self, mode: str = "thread", workers: int = 2, threshold: int = 2000):
+        if mode not in OFFLOAD_MODES:
+            raise ValueError(
+                f"Unknown offload mode {mode!r}, expected one of: "
+                f"{', '.join(OFFLOAD_MODES)}"
+            )
+        if workers < 1:
+            raise ValueError("Offload workers must be at least 1.")
+        self.mode = mode
+        self.workers = workers
+        self.threshold = threshold
+        self.offloaded = 0
+        self._executor: Optional[Executor] = None
+
+    async def run(self, weight: int, func: Callable[..., T], *args) -> T:
+        if self.mode == "inline" or weight < self.threshold:
+            return func(*args)
+
+        # The pool is started on first use, so importing or starting the API doesn't
+        # spawn threads
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="offload"
+            )
+        self.offloaded += 1
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args)
+        )
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
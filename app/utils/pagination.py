@@ -1,4 +1,6 @@
-from typing import Generic, TypeVar, List
+import base64
+import json
+from typing import Generic, Optional, TypeVar, List
 from pydantic.generics import GenericModel
 
 T = TypeVar("T")
@@ -8,3 +10,38 @@ class PaginatedResponse(GenericModel, Generic[T]):
     page: int
     size: int
     items: List[T]
+    next_cursor: Optional[str] = None
+    has_next: bool = False
+    # The number of items matching the request across all pages, None if not counted
+    total: Optional[int] = None
+    # Whether `total` was estimated rather than counted
+    total_estimated: bool = False
+
+
+"""
+Encodes a cursor payload into an opaque, URL-safe string.
+"""
+
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+"""
+Decodes a cursor created by `encode_cursor`.
+
+Raises:
+    ValueError: If the cursor is not a valid encoded payload.
+"""
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+    return payload
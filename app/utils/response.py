@@ -0,0 +1,101 @@
+import hashlib
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+import pydantic_core
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.utils.cache import LRUCache
+
+"""
+Serializes a response body to JSON bytes in one call into pydantic-core.
+
+Pydantic models (and lists/dicts of them) are serialized by their compiled serializers,
+including the `json_encoders` that write units as their codes, instead of being walked
+in Python by `jsonable_encoder` and then dumped again by `json.dumps`. The output is the
+same compact JSON FastAPI produces. Values pydantic-core doesn't know are passed through
+`jsonable_encoder`.
+"""
+
+
+def render_json(content: Any) -> bytes:
+    return pydantic_core.to_json(content, fallback=jsonable_encoder)
+
+
+"""
+A JSONResponse rendered with `render_json`.
+
+Returning one from an endpoint also skips FastAPI's response_model validation and
+re-serialization, so only do so for content built from already validated models.
+"""
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
+
+
+"""
+Computes a strong ETag for a response body.
+"""
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+"""
+Checks an If-None-Match header against an ETag. Weak comparison is used, as allowed
+for If-None-Match (RFC 9110), so W/"..." validators also match.
+"""
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+"""
+Serves a JSON response from a cache of pre-serialized bodies.
+
+On a cache miss, `produce` is awaited and its result serialized (see `render_json`),
+then cached together with its ETag. Requests whose If-None-Match header
+matches the ETag get a 304 Not Modified with no body.
+
+The serialization is timed by `serialize_seconds` (a histogram child, see
+app/utils/metrics.py), if given.
+
+Errors raised by `produce` (e.g. HTTPException) are not cached.
+"""
+
+
+async def cached_json_response(
+    request: Request,
+    cache: LRUCache[Any, Tuple[str, bytes]],
+    key: Any,
+    produce: Callable[[], Awaitable[Any]],
+    serialize_seconds: Optional[Any] = None,
+) -> Response:
+    entry = cache.get(key)
+    if entry is None:
+        generation = cache.generation
+        content = await produce()
+        if serialize_seconds is None:
+            body = render_json(content)
+        else:
+            with serialize_seconds.time():
+                body = render_json(content)
+        entry = (make_etag(body), body)
+        # Don't cache a response computed from data invalidated in the meantime
+        if cache.generation == generation:
+            cache.set(key, entry)
+
+    etag, body = entry
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
@@ -0,0 +1,63 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+"""
+Coalesces concurrent calls for the same key into a single call (request coalescing,
+or "single-flight").
+
+The first caller for a key starts `produce` in its own task. Callers arriving while it
+is in flight await that same task instead of starting another, and all of them get its
+result, or its exception. Once it completes the key is forgotten, so later callers start
+a new call: nothing is cached.
+
+The call runs in a separate task so that a caller being cancelled (e.g. its client
+disconnected) doesn't cancel it for the others.
+
+Attributes:
+    calls (int): The number of calls actually started.
+    shared (int): The number of callers that joined a call already in flight.
+
+Methods:
+    do(key, produce): Returns the result of the call in flight for `key`, starting it
+        with `produce` if there is none.
+    stats(): Returns the counters and the number of calls in flight.
+
+Values are shared between the callers, so they must not be modified in place. Like the
+caches, it is meant to be used from the event loop.
+"""
+
+
+class SingleFlight(Generic[K, V]):
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._in_flight: Dict[K, "asyncio.Task[V]"] = {}
+
+    async def do(self, key: K, produce: Callable[[], Awaitable[V]]) -> V:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(produce())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda task: self._forget(key, task))
+            self.calls += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: K, task: "asyncio.Task[V]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved, in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,85 @@
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from app.main import app
+from app.services.cache_service import invalidate_recipes
+
+# Requests sent concurrently in each round
+REQUESTS = 100
+
+ROUNDS = 20
+
+
+@pytest.fixture(scope="module")
+def client(run):
+    # Requests go straight to the ASGI app, so no server or sockets are involved. The
+    # lifespan doesn't run: the catalogue fixture connects the database instead.
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+    )
+    yield client
+    run(client.aclose())
+
+
+def measure_requests(benchmark, run, client, urls, cold: bool):
+    async def send_all():
+        responses = await asyncio.gather(*[client.get(url) for url in urls])
+        assert all(response.status_code == 200 for response in responses)
+
+    benchmark.pedantic(
+        lambda: run(send_all()),
+        setup=invalidate_recipes if cold else None,
+        rounds=ROUNDS,
+        warmup_rounds=1,
+    )
+    benchmark.extra_info["requests_per_round"] = len(urls)
+    if benchmark.stats:
+        mean = benchmark.stats["mean"]
+        benchmark.extra_info["requests_per_second"] = len(urls) / mean
+
+
+def ingredient_urls(catalogue: int, query: str = "") -> list:
+    rng = random.Random(0)
+    return [
+        f"/ingredients?recipe_id=recipe-{rng.randrange(catalogue):07d}{query}"
+        for _ in range(REQUESTS)
+    ]
+
+
+# Cold rounds clear the recipe and response caches first, so every request reads its
+# recipe from the catalogue. Warm rounds are served from the response cache.
+
+
+@pytest.mark.parametrize("cache", ["cold", "warm"])
+def bench_ingredients_throughput(benchmark, run, client, catalogue, cache):
+    measure_requests(
+        benchmark, run, client, ingredient_urls(catalogue), cache == "cold"
+    )
+
+
+def bench_ingredients_transform_throughput(benchmark, run, client, catalogue):
+    urls = ingredient_urls(catalogue, "&desired_portions=10&mass_unit=kg&volume_unit=l")
+    measure_requests(benchmark, run, client, urls, cold=True)
+
+
+@pytest.mark.parametrize("cache", ["cold", "warm"])
+def bench_recipes_throughput(benchmark, run, client, catalogue, cache):
+    rng = random.Random(0)
+    pages = max(catalogue // 20, 1)
+    urls = [
+        f"/recipes?page={rng.randrange(pages) + 1}&size=20" for _ in range(REQUESTS)
+    ]
+    measure_requests(benchmark, run, client, urls, cache == "cold")
+
+
+# A burst of requests for one recipe that isn't cached yet, with varying portions so
+# they miss the response cache too
+def bench_ingredients_thundering_herd(benchmark, run, client, catalogue):
+    urls = [
+        f"/ingredients?recipe_id=recipe-0000000&desired_portions={portions}"
+        for portions in range(1, REQUESTS + 1)
+    ]
+    measure_requests(benchmark, run, client, urls, cold=True)
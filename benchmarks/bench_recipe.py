@@ -0,0 +1,53 @@
+import pytest
+
+from app.model.recipe.recipe import Recipe
+from app.model.record.record import IngredientRecord, RecipeRecord, transform_records
+from app.model.unit.unit import MassUnit, VolumeUnit
+from benchmarks.catalogue import generate_recipes
+
+
+def make_records(count: int):
+    return [
+        RecipeRecord.from_row(
+            recipe, map(IngredientRecord.from_row, recipe["ingredients"])
+        )
+        for recipe in generate_recipes(count)
+    ]
+
+
+# Recipe.reportion and Recipe.reunit modify the recipe, so each round works on a fresh
+# copy (made outside of the timing)
+
+
+def bench_recipe_reportion(benchmark):
+    recipe = Recipe.model_validate(next(generate_recipes(1)))
+    benchmark.pedantic(
+        lambda recipe: recipe.reportion(10),
+        setup=lambda: ((recipe.model_copy(deep=True),), {}),
+        rounds=2000,
+    )
+
+
+@pytest.mark.parametrize("unit", [MassUnit.KILOGRAM, VolumeUnit.LITER])
+def bench_recipe_reunit(benchmark, unit):
+    recipe = Recipe.model_validate(next(generate_recipes(1)))
+    benchmark.pedantic(
+        lambda recipe: recipe.reunit(unit),
+        setup=lambda: ((recipe.model_copy(deep=True),), {}),
+        rounds=2000,
+    )
+
+
+@pytest.mark.parametrize("count", [10, 100, 1000])
+def bench_transform_records(benchmark, count):
+    records = make_records(count)
+    transformed = benchmark(
+        transform_records, records, 10, MassUnit.KILOGRAM, VolumeUnit.LITER
+    )
+    assert len(transformed) == count
+
+
+@pytest.mark.parametrize("count", [10, 100])
+def bench_recipe_from_record(benchmark, count):
+    records = make_records(count)
+    benchmark(lambda: [Recipe.from_record(record) for record in records])
@@ -0,0 +1,176 @@
+import pytest
+
+from app.model.params import (
+    CountMode,
+    FilterOptions,
+    PaginationParams,
+    RecipesRequest,
+    SortOptions,
+    SortOrder,
+)
+from app.model.unit.unit import MassUnit, VolumeUnit
+from app.services.cache_service import invalidate_recipes
+from app.services.recipe_service import SORT_FIELDS, fetch_recipes
+
+# Unless stated otherwise, the recipe cache is cleared before every round, so each call
+# reads and parses its whole page from the catalogue
+
+ROUNDS = 20
+
+
+def measure_fetch(benchmark, run, *args, cold: bool = True, **kwargs):
+    response = benchmark.pedantic(
+        lambda: run(fetch_recipes(*args, **kwargs)),
+        setup=invalidate_recipes if cold else None,
+        rounds=ROUNDS,
+        warmup_rounds=1,
+    )
+    benchmark.extra_info["recipes"] = len(response.items)
+    return response
+
+
+@pytest.mark.parametrize("size", [5, 20, 100])
+def bench_fetch_recipes_page_size(benchmark, run, catalogue, size):
+    response = measure_fetch(benchmark, run, PaginationParams(size=size))
+    assert len(response.items) == min(size, catalogue)
+
+
+@pytest.mark.parametrize("cache", ["cold", "warm"])
+def bench_fetch_recipes_cache(benchmark, run, catalogue, cache):
+    measure_fetch(benchmark, run, PaginationParams(size=20), cold=cache == "cold")
+
+
+@pytest.mark.parametrize("depth", [0.1, 0.5, 0.9])
+def bench_fetch_recipes_offset(benchmark, run, catalogue, depth):
+    page = int(catalogue * depth) // 20 + 1
+    measure_fetch(benchmark, run, PaginationParams(page=page, size=20))
+
+
+@pytest.mark.parametrize("depth", [0.1, 0.5, 0.9])
+def bench_fetch_recipes_cursor(benchmark, run, catalogue, depth):
+    # The cursor of the page just before the one fetched by the offset benchmark
+    page = max(int(catalogue * depth) // 20, 1)
+    previous = run(fetch_recipes(PaginationParams(page=page, size=20)))
+    measure_fetch(
+        benchmark, run, PaginationParams(size=20, cursor=previous.next_cursor)
+    )
+
+
+@pytest.mark.parametrize(
+    "query, search_ingredients",
+    [
+        ("curry", False),
+        ("spicy curry", False),
+        ("lentils", True),
+        ("cr", True),
+    ],
+)
+def bench_fetch_recipes_search(benchmark, run, catalogue, query, search_ingredients):
+    measure_fetch(
+        benchmark,
+        run,
+        PaginationParams(size=20),
+        FilterOptions(queryString=query, search_ingredients=search_ingredients),
+    )
+
+
+@pytest.mark.parametrize(
+    "include, exclude, match",
+    [
+        ("lentils", None, "all"),
+        ("lentils,basil,cream", None, "all"),
+        ("lentils,basil", None, "any"),
+        ("truffle", None, "all"),
+        ("truffle,lentils", None, "all"),
+        (None, "flour,milk", "all"),
+        ("lentils", "flour,milk", "all"),
+    ],
+)
+def bench_fetch_recipes_ingredient_filter(
+    benchmark, run, catalogue, include, exclude, match
+):
+    measure_fetch(
+        benchmark,
+        run,
+        PaginationParams(size=20),
+        FilterOptions(
+            include_ingredients=include,
+            exclude_ingredients=exclude,
+            ingredient_match=match,
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "filter_opts",
+    [
+        FilterOptions(max_total_mass_g=500),
+        FilterOptions(min_total_volume_ml=5000),
+        FilterOptions(max_ingredients=3, unit_family="volume"),
+    ],
+    ids=["mass-under-500g", "volume-over-5l", "few-ingredients-with-volume"],
+)
+def bench_fetch_recipes_summary_filter(benchmark, run, catalogue, filter_opts):
+    measure_fetch(benchmark, run, PaginationParams(size=20), filter_opts)
+
+
+@pytest.mark.parametrize("count", list(CountMode))
+@pytest.mark.parametrize(
+    "filter_opts",
+    [
+        None,
+        FilterOptions(queryString="curry"),
+        FilterOptions(exclude_ingredients="flour,milk"),
+        FilterOptions(max_total_mass_g=500),
+    ],
+    ids=["all", "search", "ingredient-filter", "summary-filter"],
+)
+def bench_fetch_recipes_count(benchmark, run, catalogue, filter_opts, count):
+    # The totals are cleared with the recipe cache, so every round counts them again
+    response = measure_fetch(
+        benchmark, run, PaginationParams(size=20, count=count), filter_opts
+    )
+    benchmark.extra_info["total"] = response.total
+
+
+@pytest.mark.parametrize("field", SORT_FIELDS)
+@pytest.mark.parametrize("order", [SortOrder.ASC, SortOrder.DESC])
+def bench_fetch_recipes_sort(benchmark, run, catalogue, field, order):
+    measure_fetch(
+        benchmark,
+        run,
+        PaginationParams(size=20),
+        sort_opts=SortOptions(field=field, order=order),
+    )
+
+
+@pytest.mark.parametrize("field", SORT_FIELDS)
+def bench_fetch_recipes_sort_cursor(benchmark, run, catalogue, field):
+    # Half way through the catalogue
+    sort_opts = SortOptions(field=field)
+    previous = run(
+        fetch_recipes(PaginationParams(page=catalogue // 40, size=20), None, sort_opts)
+    )
+    measure_fetch(
+        benchmark,
+        run,
+        PaginationParams(size=20, cursor=previous.next_cursor),
+        sort_opts=sort_opts,
+    )
+
+
+@pytest.mark.parametrize(
+    "req",
+    [
+        RecipesRequest(desired_portions=10),
+        RecipesRequest(mass_unit=MassUnit.KILOGRAM, volume_unit=VolumeUnit.LITER),
+        RecipesRequest(
+            desired_portions=10,
+            mass_unit=MassUnit.KILOGRAM,
+            volume_unit=VolumeUnit.LITER,
+        ),
+    ],
+    ids=["reportion", "reunit", "both"],
+)
+def bench_fetch_recipes_transform(benchmark, run, catalogue, req):
+    measure_fetch(benchmark, run, PaginationParams(size=100), req=req)
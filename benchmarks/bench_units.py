@@ -0,0 +1,31 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.model.unit.unit import MassUnit, Unit, VolumeUnit, parse_unit
+from benchmarks.catalogue import UNIT_CODES
+
+
+def bench_convert(benchmark):
+    assert benchmark(MassUnit.POUND.convert, 2.5, MassUnit.GRAM) == pytest.approx(
+        1133.98, abs=0.01
+    )
+
+
+def bench_convert_volume(benchmark):
+    benchmark(VolumeUnit.FLUID_OUNCE.convert, 2, VolumeUnit.MILLILITER)
+
+
+def bench_parse_unit(benchmark):
+    benchmark(lambda: [parse_unit(code) for code in UNIT_CODES])
+
+
+@pytest.mark.parametrize("count", [100, 10_000])
+def bench_convert_many(benchmark, count):
+    rng = random.Random(0)
+    mass_units = list(MassUnit)
+    units = [rng.choice(mass_units) for _ in range(count)]
+    quantities = np.array([rng.uniform(1, 500) for _ in range(count)])
+    converted = benchmark(Unit.convert_many, quantities, units, MassUnit.KILOGRAM)
+    assert len(converted) == count
@@ -0,0 +1,119 @@
+"""
+Synthetic recipe catalogues for the benchmark suite.
+
+Recipes are generated deterministically from a seed, with a variable number of
+ingredients (1 to 20) spread over every unit family, and names drawn from a small
+vocabulary so that searches match a realistic share of the catalogue.
+
+Built catalogues are SQLite files kept in benchmarks/.catalogues and reused by later
+runs, as the larger ones take minutes to import. Delete the directory to rebuild them.
+CATALOGUE_VERSION is part of their names, and is bumped whenever the schema changes so
+that stale catalogues are not reused.
+
+Usage: python -m benchmarks.catalogue --recipes 100000
+"""
+
+import argparse
+import os
+import random
+from typing import Iterator
+
+from app.database.database import create_schema, create_sync_engine
+from app.database.recipe_import import import_recipes
+from app.model.unit.unit import UNITS_BY_CODE
+
+CATALOGUE_DIR = os.path.join(os.path.dirname(__file__), ".catalogues")
+CATALOGUE_VERSION = 4
+
+DISHES = ["Pancakes", "Curry", "Salad", "Soup", "Pie", "Stew", "Risotto", "Tart"]
+STYLES = ["Spicy", "Classic", "Vegan", "Smoky", "Creamy", "Quick", "Rustic", "Lemon"]
+INGREDIENTS = [
+    "Flour",
+    "Milk",
+    "Butter",
+    "Sugar",
+    "Eggs",
+    "Rice",
+    "Tomato",
+    "Onion",
+    "Garlic",
+    "Chicken",
+    "Lentils",
+    "Cream",
+    "Basil",
+    "Lemon",
+    "Olive Oil",
+    "Potato",
+]
+UNIT_CODES = list(UNITS_BY_CODE)
+
+
+def generate_recipes(count: int, seed: int = 0) -> Iterator[dict]:
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            "id": f"recipe-{i:07d}",
+            "name": f"{rng.choice(STYLES)} {rng.choice(DISHES)} {i}",
+            "portions": rng.randint(1, 12),
+            "ingredients": [
+                {
+                    "name": rng.choice(INGREDIENTS),
+                    "unit": rng.choice(UNIT_CODES),
+                    "quantity": round(rng.uniform(0.5, 500), 2),
+                }
+                for _ in range(rng.randint(1, 20))
+            ],
+        }
+
+
+def catalogue_path(count: int, seed: int = 0) -> str:
+    return os.path.join(
+        CATALOGUE_DIR, f"recipes-{count}-{seed}-v{CATALOGUE_VERSION}.db"
+    )
+
+
+"""
+Returns the path of the SQLite catalogue of `count` recipes, building it first if it
+doesn't exist yet.
+"""
+
+
+def build_catalogue(count: int, seed: int = 0) -> str:
+    path = catalogue_path(count, seed)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(CATALOGUE_DIR, exist_ok=True)
+    building = path + ".building"
+    if os.path.exists(building):
+        os.remove(building)
+    engine = create_sync_engine(f"sqlite:///{building}")
+    try:
+        create_schema(engine)
+        stats = import_recipes(
+            generate_recipes(count, seed), bind=engine, batch_size=2000, upsert=False
+        )
+        with engine.connect() as conn:
+            conn.exec_driver_sql("ANALYZE")
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        engine.dispose()
+    os.replace(building, path)
+    print(
+        f"Built {path}: {stats.recipes} recipes, {stats.ingredients} ingredients "
+        f"in {stats.seconds:.1f}s"
+    )
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipes", type=int, nargs="+", default=[1000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for count in args.recipes:
+        print(build_catalogue(count, args.seed))
+
+
+if __name__ == "__main__":
+    main()
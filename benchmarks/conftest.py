@@ -0,0 +1,44 @@
+import asyncio
+import os
+
+import pytest
+
+from app.database.database import create_database
+from app.services import ingredient_service, recipe_service
+from benchmarks.catalogue import build_catalogue
+
+# Sizes of the synthetic catalogues the service and endpoint benchmarks run against,
+# e.g. BENCH_CATALOGUES=1000,100000,1000000. Catalogues are built on first use (see
+# catalogue.py); the 1M recipe one takes several minutes.
+CATALOGUE_SIZES = [
+    int(size) for size in os.getenv("BENCH_CATALOGUES", "1000").split(",") if size
+]
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def run(loop):
+    """Runs a coroutine to completion on the benchmark event loop."""
+    return loop.run_until_complete
+
+
+@pytest.fixture(scope="session", params=CATALOGUE_SIZES, ids=lambda size: f"{size}")
+def catalogue(request, run):
+    """
+    The size of a synthetic catalogue, with the services reading from it for the
+    duration of the benchmarks that use it.
+    """
+    size = request.param
+    read_database = create_database(f"sqlite:///{build_catalogue(size)}")
+    run(read_database.connect())
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(recipe_service, "read_database", read_database)
+        monkeypatch.setattr(ingredient_service, "read_database", read_database)
+        yield size
+    run(read_database.disconnect())
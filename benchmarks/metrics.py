@@ -0,0 +1,83 @@
+"""
+Measures the overhead of the metrics: recording a value, timing a stage, and the
+latency middleware around a request to `/` (through the ASGI app, without a server).
+
+Usage: python -m benchmarks.metrics [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import time
+import timeit
+
+from app.main import app
+from app.utils.metrics import Counter, Histogram, MetricsMiddleware, STAGE_BUCKETS
+
+
+def measure(func, number: int = 100_000) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+
+
+async def call(asgi_app, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("test", 80),
+        "client": ("test", 1234),
+        "app": app,
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await asgi_app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    counter = Counter("bench_total", "Benchmark.", ("operation",)).labels("bench")
+    histogram = Histogram(
+        "bench_seconds", "Benchmark.", ("operation",), STAGE_BUCKETS
+    ).labels("bench")
+
+    def timed():
+        with histogram.time():
+            pass
+
+    print(f"counter inc:        {measure(counter.inc):>8.0f}ns")
+    print(f"histogram observe:  {measure(lambda: histogram.observe(0.0003)):>8.0f}ns")
+    print(f"stage timer:        {measure(timed):>8.0f}ns")
+
+    # The router alone, then the router wrapped in the latency middleware
+    router = app.router
+    wrapped = MetricsMiddleware(
+        router, Histogram("bench_request_seconds", "Benchmark.", ("m", "r", "s"))
+    )
+    for name, asgi_app in (
+        ("without middleware", router),
+        ("with middleware", wrapped),
+    ):
+        asyncio.run(call(asgi_app, 100))
+        per_request = min(asyncio.run(call(asgi_app, args.requests)) for _ in range(5))
+        print(f"GET / {name + ':':<20} {per_request:>8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Measures the latency of small requests while large pages are being served, with large
+pages processed on the event loop ("inline") and in the offload thread pool ("thread").
+
+Light clients request the ingredients of random recipes, heavy clients request random
+pages of `--heavy-size` recipes, reportioned and reunited. Requests go through the ASGI
+app with httpx, against a synthetic catalogue (see catalogue.py).
+
+Usage: python -m benchmarks.offload [--recipes 10000] [--seconds 5] [--heavy-size 500]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+from app.database.database import create_database
+from app.main import app
+from app.services import ingredient_service, recipe_service
+from app.services.cache_service import invalidate_recipes
+from app.utils.offload import Offloader
+from benchmarks.catalogue import build_catalogue
+
+
+def percentile(values: list, fraction: float) -> float:
+    return sorted(values)[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def light_client(client, args, deadline: float, latencies: list):
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        recipe_id = f"recipe-{rng.randrange(args.recipes):07d}"
+        start = time.perf_counter()
+        response = await client.get(
+            f"/ingredients?recipe_id={recipe_id}&desired_portions={rng.randint(1, 99)}"
+        )
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+
+
+async def heavy_client(client, args, deadline: float, counts: dict):
+    rng = random.Random()
+    pages = args.recipes // args.heavy_size
+    while time.perf_counter() < deadline:
+        response = await client.get(
+            f"/recipes?page={rng.randrange(pages) + 1}&size={args.heavy_size}"
+            f"&desired_portions={rng.randint(1, 99)}&mass_unit=kg&volume_unit=l"
+        )
+        assert response.status_code == 200
+        counts["heavy"] += 1
+
+
+async def run(mode: str, args) -> dict:
+    offloader = Offloader(mode, args.workers, args.threshold)
+    recipe_service.offloader = offloader
+    invalidate_recipes()
+
+    latencies, counts = [], {"heavy": 0}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        deadline = time.perf_counter() + args.seconds
+        await asyncio.gather(
+            *[heavy_client(client, args, deadline, counts) for _ in range(args.heavy)],
+            *[
+                light_client(client, args, deadline, latencies)
+                for _ in range(args.light)
+            ],
+        )
+    offloader.shutdown()
+    return {"latencies": latencies, **counts}
+
+
+async def main_async(args):
+    database = create_database(f"sqlite:///{build_catalogue(args.recipes)}")
+    await database.connect()
+    recipe_service.read_database = database
+    ingredient_service.read_database = database
+    try:
+        print(
+            f"{'mode':>7} {'light req':>9} {'p50':>8} {'p95':>8} {'p99':>8} "
+            f"{'max':>8} {'heavy req':>9}"
+        )
+        for mode in ("inline", "thread"):
+            result = await run(mode, args)
+            latencies = [latency * 1000 for latency in result["latencies"]]
+            print(
+                f"{mode:>7} {len(latencies):>9} "
+                f"{statistics.median(latencies):>6.1f}ms "
+                f"{percentile(latencies, 0.95):>6.1f}ms "
+                f"{percentile(latencies, 0.99):>6.1f}ms "
+                f"{max(latencies):>6.1f}ms {result['heavy']:>9}"
+            )
+    finally:
+        await database.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipes", type=int, default=10000)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--heavy-size", type=int, default=500)
+    parser.add_argument("--heavy", type=int, default=1)
+    parser.add_argument("--light", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threshold", type=int, default=2000)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
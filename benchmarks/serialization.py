@@ -0,0 +1,64 @@
+"""
+Compares serializing /recipes pages with FastAPI's default path (jsonable_encoder, then
+json.dumps via JSONResponse) against `render_json` (pydantic-core).
+
+Usage: python -m benchmarks.serialization [--recipes 100] [--ingredients 10]
+"""
+
+import argparse
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.model.recipe.recipe import Recipe
+from app.model.record.record import IngredientRecord, RecipeRecord
+from app.model.unit.unit import CountUnit, MassUnit, VolumeUnit
+from app.utils.pagination import PaginatedResponse
+from app.utils.response import render_json
+
+UNITS = [MassUnit.GRAM, VolumeUnit.MILLILITER, CountUnit.UNIT, MassUnit.KILOGRAM]
+
+
+def make_page(recipes: int, ingredients: int) -> PaginatedResponse[Recipe]:
+    items = [
+        Recipe.from_record(
+            RecipeRecord(
+                f"recipe-{i}",
+                f"Recipe {i}",
+                4.0,
+                tuple(
+                    IngredientRecord(f"ingredient-{j}", UNITS[j % len(UNITS)], j + 0.5)
+                    for j in range(ingredients)
+                ),
+            )
+        )
+        for i in range(recipes)
+    ]
+    return PaginatedResponse[Recipe](page=1, size=recipes, items=items)
+
+
+def measure(func, number: int = 20) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipes", type=int, nargs="+", default=[5, 100, 1000])
+    parser.add_argument("--ingredients", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'recipes':>8} {'jsonable_encoder':>17} {'render_json':>12} {'speedup':>8}")
+    for recipes in args.recipes:
+        page = make_page(recipes, args.ingredients)
+        assert render_json(page) == JSONResponse(jsonable_encoder(page)).body
+
+        default = measure(lambda: JSONResponse(jsonable_encoder(page)).body)
+        fast = measure(lambda: render_json(page))
+        print(
+            f"{recipes:>8} {default:>15.3f}ms {fast:>10.3f}ms {default / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
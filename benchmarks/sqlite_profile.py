@@ -0,0 +1,122 @@
+"""
+Compares read and write throughput of the stock `databases` SQLite setup (a new
+connection per query, SQLite's default pragmas) against the pooled "performance"
+profile, with concurrent readers running alongside a writer.
+
+Usage: python -m benchmarks.sqlite_profile [--recipes 5000] [--readers 8] [--seconds 5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from databases import Database
+from sqlalchemy import select
+
+from app.database.database import create_database, create_sync_engine, metadata
+from app.database.ingredient_table import ingredient_table
+from app.database.recipe_import import import_recipes
+from app.database.recipe_table import recipe_table
+from app.database.sqlite_profile import PROFILES
+
+
+def make_recipes(count: int):
+    for i in range(count):
+        yield {
+            "id": f"recipe-{i:07d}",
+            "name": f"Recipe {i}",
+            "portions": 4,
+            "ingredients": [
+                {"name": f"ingredient-{j}", "unit": "g", "quantity": j + 1}
+                for j in range(8)
+            ],
+        }
+
+
+async def reader(database: Database, recipes: int, deadline: float, counts: dict):
+    while time.perf_counter() < deadline:
+        offset = random.randrange(max(recipes - 20, 1))
+        try:
+            rows = await database.fetch_all(
+                select(recipe_table)
+                .order_by(recipe_table.c.id)
+                .limit(20)
+                .offset(offset)
+            )
+            await database.fetch_all(
+                select(ingredient_table).where(
+                    ingredient_table.c.recipe_id.in_([row["id"] for row in rows])
+                )
+            )
+            counts["reads"] += 1
+        except Exception:
+            counts["errors"] += 1
+
+
+async def writer(database: Database, recipes: int, deadline: float, counts: dict):
+    while time.perf_counter() < deadline:
+        recipe_id = f"recipe-{random.randrange(recipes):07d}"
+        try:
+            async with database.transaction():
+                await database.execute(
+                    recipe_table.update()
+                    .where(recipe_table.c.id == recipe_id)
+                    .values(portions=random.randint(1, 8))
+                )
+            counts["writes"] += 1
+        except Exception:
+            counts["errors"] += 1
+
+
+async def run(database: Database, args) -> dict:
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    await database.connect()
+    deadline = time.perf_counter() + args.seconds
+    await asyncio.gather(
+        writer(database, args.recipes, deadline, counts),
+        *[
+            reader(database, args.recipes, deadline, counts)
+            for _ in range(args.readers)
+        ],
+    )
+    await database.disconnect()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipes", type=int, default=5000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        engine = create_sync_engine(url, PROFILES["default"])
+        metadata.create_all(engine)
+        import_recipes(make_recipes(args.recipes), bind=engine)
+        engine.dispose()
+
+        setups = [
+            ("stock", lambda: Database(url)),
+            (
+                "performance",
+                lambda: create_database(
+                    url, PROFILES["performance"], pool_size=args.readers + 1
+                ),
+            ),
+        ]
+        print(f"{'setup':>12} {'reads/s':>9} {'writes/s':>9} {'errors':>7}")
+        for name, make_database in setups:
+            counts = asyncio.run(run(make_database(), args))
+            print(
+                f"{name:>12} {counts['reads'] / args.seconds:>9.0f} "
+                f"{counts['writes'] / args.seconds:>9.0f} {counts['errors']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measures how long a fresh API worker takes to start: importing `app.main`, then running
+the lifespan startup (connecting and, unless skipped, checking the schema). Each run is
+a new interpreter against a new SQLite database, like a cold worker boot.
+
+Usage: python -m benchmarks.startup [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+WORKER = """
+import asyncio, json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+started = asyncio.run(boot())
+print(json.dumps({"import": imported - start, "lifespan": started - imported}))
+"""
+
+
+def boot(skip_schema_check: bool, directory: str, run: int) -> dict:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(directory, f'startup-{run}.db')}",
+        SKIP_SCHEMA_CHECK="1" if skip_schema_check else "",
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER],
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'schema check':>13} {'import':>9} {'lifespan':>9} {'total':>9}  (median)")
+    with tempfile.TemporaryDirectory() as directory:
+        for skip in (False, True):
+            runs = [boot(skip, directory, run) for run in range(args.runs)]
+            imported = statistics.median(run["import"] for run in runs) * 1000
+            lifespan = statistics.median(run["lifespan"] for run in runs) * 1000
+            total = statistics.median((run["import"] + run["lifespan"]) for run in runs)
+            print(
+                f"{'skipped' if skip else 'run':>13} {imported:>7.1f}ms "
+                f"{lifespan:>7.1f}ms {total * 1000:>7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
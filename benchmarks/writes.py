@@ -0,0 +1,136 @@
+"""
+Measures the throughput of recipe writes (PUT /recipes, or PUT /recipes/batch with
+`--per-request` recipes each) from concurrent clients, with
+writes committed in groups (see group_commit.py) and one transaction per write, and the
+latency of reads (GET /ingredients) served meanwhile.
+
+Requests go through the ASGI app with httpx, against a fresh SQLite database with the
+performance profile, seeded with `--recipes` synthetic recipes (see catalogue.py).
+
+Usage: python -m benchmarks.writes [--recipes 1000] [--seconds 5] [--writers 32]
+    [--per-request 1]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import httpx
+
+from app.database.database import create_database, create_schema, create_sync_engine
+from app.database.recipe_import import import_recipes
+from app.main import app
+from app.services import ingredient_service, recipe_service, recipe_write_service
+from app.services.cache_service import invalidate_recipes
+from app.utils.group_commit import GroupCommitter
+from benchmarks.catalogue import generate_recipes
+
+
+def percentile(values: list, fraction: float) -> float:
+    return sorted(values)[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def writer(client, args, deadline: float, recipes: list, counts: dict):
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        items = [
+            {**recipe, "portions": rng.randint(1, 12)}
+            for recipe in rng.sample(recipes, args.per_request)
+        ]
+        if args.per_request == 1:
+            response = await client.put("/recipes", json=items[0])
+        else:
+            response = await client.put("/recipes/batch", json={"items": items})
+        assert response.status_code == 200, response.text
+        counts["writes"] += args.per_request
+
+
+async def reader(client, args, deadline: float, latencies: list):
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        recipe_id = f"recipe-{rng.randrange(args.recipes):07d}"
+        start = time.perf_counter()
+        response = await client.get(f"/ingredients?recipe_id={recipe_id}")
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+        # Readers pace themselves, so they measure latency rather than compete
+        await asyncio.sleep(0.001)
+
+
+async def run(mode: str, args, recipes: list) -> dict:
+    recipe_write_service.recipe_writer = GroupCommitter(
+        recipe_write_service.write_recipes,
+        capacity=args.queue,
+        max_batch=args.batch if mode == "group" else 1,
+        on_flush=recipe_write_service.invalidate_written,
+    )
+    invalidate_recipes()
+
+    latencies, counts = [], {"writes": 0}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        deadline = time.perf_counter() + args.seconds
+        await asyncio.gather(
+            *[
+                writer(client, args, deadline, recipes, counts)
+                for _ in range(args.writers)
+            ],
+            *[reader(client, args, deadline, latencies) for _ in range(args.readers)],
+        )
+    flushes = recipe_write_service.recipe_writer.flushes
+    await recipe_write_service.recipe_writer.close()
+    return {"latencies": latencies, "flushes": flushes, **counts}
+
+
+async def main_async(args):
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'writes.db')}"
+        engine = create_sync_engine(url)
+        create_schema(engine)
+        recipes = list(generate_recipes(args.recipes))
+        import_recipes(recipes, bind=engine)
+        recipe_write_service.engine = engine
+
+        database = create_database(url)
+        await database.connect()
+        recipe_service.read_database = database
+        ingredient_service.read_database = database
+        try:
+            print(
+                f"{'mode':>6} {'recipes/s':>9} {'per flush':>9} {'read p50':>9} "
+                f"{'read p99':>9}"
+            )
+            for mode in ("single", "group"):
+                result = await run(mode, args, recipes)
+                latencies = [latency * 1000 for latency in result["latencies"]]
+                print(
+                    f"{mode:>6} {result['writes'] / args.seconds:>9,.0f} "
+                    f"{result['writes'] / max(result['flushes'], 1):>9.1f} "
+                    f"{statistics.median(latencies):>7.2f}ms "
+                    f"{percentile(latencies, 0.99):>7.2f}ms"
+                )
+        finally:
+            await database.disconnect()
+            engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipes", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--queue", type=int, default=10000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--per-request", type=int, default=1)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()